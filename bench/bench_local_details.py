@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Compare the old per-click Local Repos details pipeline (about 15 git
+processes) with collect_local_details() (3 git processes)
+
+usage: bench_local_details.py [--runs N] [REPO ...]
+
+Without REPO arguments a throwaway repo with some history is created.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from githelper_core.details import collect_local_details, format_local_overview
+
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", str(repo), *args], capture_output=True, text=True)
+
+
+def old_pipeline(repo):
+    """The git calls refresh_local_repo_details used to make for one click"""
+    git(repo, "rev-parse", "--git-dir")
+    git(repo, "status", "-sb")
+    git(repo, "status", "--porcelain=v1")
+    git(repo, "symbolic-ref", "-q", "--short", "HEAD")
+    upstream = git(repo, "rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}")
+    if upstream.returncode == 0:
+        git(repo, "rev-list", "--left-right", "--count", f"HEAD...{upstream.stdout.strip()}")
+    git(repo, "log", "-1", "--format=%h %ci %an %s")
+    git(repo, "remote", "-v")
+    git(repo, "remote", "get-url", "origin")
+    git(repo, "for-each-ref", "refs/heads", "--format=%(refname:short)")
+    git(repo, "tag", "-l")
+    git(repo, "stash", "list")
+    git(repo, "count-objects", "-vH")
+    git(repo, "log", "--oneline", "--decorate", "-n", "100")
+
+
+def make_sample_repo(root):
+    repo = Path(root) / "sample"
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    for i in range(300):
+        (repo / f"file{i % 40}.txt").write_text(f"line {i}\n")
+        git(repo, "add", "-A")
+        git(repo, "-c", "user.name=bench", "-c", "user.email=bench@example.com",
+            "commit", "-q", "-m", f"commit {i}")
+    git(repo, "tag", "v1")
+    (repo / "untracked.txt").write_text("x\n")
+    return repo
+
+
+def timed(fn, repo, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(repo)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("repos", nargs="*", help="Repos to measure (default: a generated one)")
+    parser.add_argument("--runs", type=int, default=20, help="Runs per measurement (default: 20)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repos = args.repos or [make_sample_repo(tmp)]
+        print(f"{'repo':<40} {'old (ms)':>10} {'new (ms)':>10} {'speedup':>8}")
+        for repo in repos:
+            old = timed(old_pipeline, repo, args.runs)
+            new = timed(lambda r: format_local_overview(collect_local_details(r)),
+                        repo, args.runs)
+            print(f"{str(repo)[-40:]:<40} {old * 1000:>10.1f} {new * 1000:>10.1f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
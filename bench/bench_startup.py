@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+Measure what scripted CLI calls pay before doing any work: the import time
+of each githelper_core module and the wall time of short CLI commands
+
+usage: bench_startup.py [--runs N]
+
+Every measurement runs in a fresh interpreter. A throwaway directory with a
+few bare repos serves the --list commands.
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI_PATH = ROOT / "cli" / "githelper.py"
+CORE_MODULES = sorted(p.stem for p in (ROOT / "githelper_core").glob("*.py") if p.stem != "__init__")
+
+
+def import_time(module):
+    """Cumulative -X importtime of module in microseconds, and whether tkinter came along"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    total = 0
+    tkinter = False
+    for line in proc.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if not match:
+            continue
+        tkinter = tkinter or match[3] == "tkinter"
+        if match[3] == module:
+            total = int(match[1])
+    return total, tkinter
+
+
+def wall_time(cmd, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def make_repo_dir(root):
+    location = Path(root) / "srv"
+    for i in range(5):
+        subprocess.run(["git", "init", "-q", "--bare", str(location / f"repo{i}.git")], check=True)
+    return location
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Runs per measurement (default: 20)")
+    args = parser.parse_args()
+
+    print(f"{'module':<32} {'import (ms)':>12}  tkinter")
+    for name in ["githelper_core", *(f"githelper_core.{m}" for m in CORE_MODULES)]:
+        usec, tkinter = import_time(name)
+        print(f"{name:<32} {usec / 1000:>12.1f}  {'YES' if tkinter else 'no'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        location = str(make_repo_dir(tmp))
+        commands = [
+            ("python -c pass", [sys.executable, "-c", "pass"]),
+            ("githelper.py --help", [sys.executable, str(CLI_PATH), "--help"]),
+            ("githelper.py --list", [sys.executable, str(CLI_PATH), "--loc", location, "--list"]),
+            ("githelper.py --list --long",
+             [sys.executable, str(CLI_PATH), "--loc", location, "--list", "--long"]),
+        ]
+        print()
+        print(f"{'command':<32} {'wall (ms)':>12}")
+        for label, cmd in commands:
+            print(f"{label:<32} {wall_time(cmd, args.runs) * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
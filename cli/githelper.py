@@ -4,107 +4,249 @@ Create and admin Git repos locally or remotely without external tools
 """
 
 import argparse
+import os
+import signal
 import subprocess
 import sys
+import time
+import threading
+from collections import defaultdict
+from pathlib import Path
 
-def list_repos(location, ssh_server=None, ssh_user=None, ssh_port=None, remote=False):
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from githelper_core.backend import LocalBackend, SSHBackend, has_glob
+from githelper_core.details import human_size
+from githelper_core.discovery import DISCOVERY_DEPTH, discover_repos, distinct_repos
+from githelper_core.ssh import SSH_CONTROL_DIR, SSHConnectionPool
+from githelper_core.supervisor import OPERATION_TIMEOUTS, STALL_TIMEOUT, OperationAborted, Supervisor
+
+_verbose = False
+
+def _log(message):
+    """
+    Prints diagnostics to stderr when --verbose is set
+    """
+    if _verbose:
+        print(message, file=sys.stderr)
+
+def list_repos(backend):
     """
     Lists repos locally or via SSH
     """
-    if remote:
-        repo_list = f"ssh {ssh_user}@{ssh_server} -p {ssh_port} \
-        ls {location}/ | sed -e 's/\\.git//g'"
-    else:
-        repo_list = f"ls {location} | sed -e 's/\\.git//g'"
-    
-    list_result = subprocess.run(repo_list, shell=True, check=True, capture_output=True, text=True)
-    print(list_result.stdout.strip())
-    return list_result.stdout
+    names = backend.repo_names()
+    print("\n".join(names))
+    return names
 
-def rename_repo(location, new_repo, old_repo, ssh_server=None, ssh_user=None, ssh_port=None, remote=False):
+def list_repos_long(backend):
     """
-    Renames repos locally or via SSH
+    Lists repos with size, last commit, HEAD and ref counts, gathered in one
+    pass on the server and printed as each record arrives
     """
-    if remote:
-        rename_cmd = f"ssh {ssh_user}@{ssh_server} -p {ssh_port} \
-        mv -v {location}/{old_repo}.git {location}/{new_repo}.git"
-    else:
-        rename_cmd = f"mv -v {location}/{old_repo}.git {location}/{new_repo}.git"
-    
-    rename_result = subprocess.run(rename_cmd, shell=True, check=True, capture_output=True, text=True)
-    print(rename_result.stdout.strip())
-    return rename_result.stdout
+    row = "{:<30} {:>11} {:>7} {:<16} {:<15} {:>8} {:>5}"
+    print(row.format("NAME", "PACK", "LOOSE", "LAST COMMIT", "HEAD", "BRANCHES", "TAGS"))
+    repos = []
+    for repo in backend.inventory():
+        repos.append(repo)
+        last = (time.strftime("%Y-%m-%d %H:%M", time.localtime(repo["last_commit"]))
+                if repo["last_commit"] else "-")
+        print(row.format(repo["name"], human_size(repo["pack_kib"]), repo["loose"],
+                         last, repo["head"] or "-", repo["branches"], repo["tags"]),
+              flush=True)
+    return repos
 
-def fork_repo(location, new_repo, old_repo, ssh_server=None, ssh_user=None, ssh_port=None, remote=False):
+def clone_options(depth=None, filter_spec=None, single_branch=False, branch=None, sparse=False):
     """
-    Copies (forks) repos locally or via SSH
+    Returns the extra git clone arguments for a shallow/partial/sparse clone
     """
-    if remote:
-        fork_cmd = f"ssh {ssh_user}@{ssh_server} -p {ssh_port} \
-        cp -rv {location}/{old_repo}.git {location}/{new_repo}.git"
-    else:
-        fork_cmd = f"cp -rv {location}/{old_repo}.git {location}/{new_repo}.git"
-    
-    fork_result = subprocess.run(fork_cmd, shell=True, check=True, capture_output=True, text=True)
-    print(fork_result.stdout.strip())
-    return fork_result.stdout
+    options = []
+    if depth:
+        options += ["--depth", str(depth)]
+    if filter_spec:
+        options += [f"--filter={filter_spec}"]
+    if single_branch:
+        options += ["--single-branch"]
+    if branch:
+        options += ["--branch", branch]
+    if sparse:
+        options += ["--sparse"]
+    return options
 
-def clone_repo(clone_repo, location, ssh_server=None, ssh_user=None, ssh_port=None, remote=False):
+def cancel_on_sigint():
     """
-    Clones repo locally or from remote server
+    Turns the first Ctrl-C into a cancel event: supervised git processes
+    are stopped and partial clones/archives removed. A second Ctrl-C
+    interrupts right away
     """
-    if remote:
-        clone_cmd = f"git clone ssh://{ssh_user}@{ssh_server}:{ssh_port}/~/{location}/{clone_repo}.git"
-    else:
-        clone_cmd = f"git clone file:///{location}/{clone_repo}.git"
-    
-    clone_result = subprocess.run(clone_cmd, shell=True, check=True, capture_output=True, text=True)
-    print(clone_result.stdout.strip())
-    return clone_result.stdout
+    cancel = threading.Event()
+
+    def handler(_signum, _frame):
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        print("\nCancelling... (press Ctrl-C again to quit now)", file=sys.stderr, flush=True)
+        cancel.set()
+
+    signal.signal(signal.SIGINT, handler)
+    return cancel
 
-def create_repo(new_repo, location, ssh_server=None, ssh_user=None, ssh_port=None, remote=False):
+def supervisor_for(args, operation, cancel):
     """
-    Creates repos locally or via SSH
+    Returns the Supervisor for a clone/fetch/archive: --timeout (or the
+    operation's default), --stall-timeout and the Ctrl-C cancel event
     """
-    if remote:
-        create_cmd = f"ssh {ssh_user}@{ssh_server} -p {ssh_port} \
-        git init --bare {location}/{new_repo}.git"
-    else:
-        create_cmd = f"git init --bare {location}/{new_repo}.git"
-    
-    create_result = subprocess.run(create_cmd, shell=True, check=True, capture_output=True, text=True)
-    print(create_result.stdout.strip())
-    return create_result.stdout
+    timeout = OPERATION_TIMEOUTS[operation] if args.timeout is None else args.timeout
+    return Supervisor(timeout, args.stall_timeout, cancel)
 
-def archive_repo(archive_repo, location, ssh_server=None, ssh_user=None, ssh_port=None, remote=False):
+def clone_repo(backend, name, options=(), supervisor=None):
     """
-    Archives a repo locally or via SSH
+    Clones a repo into the current directory, showing git's progress with
+    throughput and ETA as it runs
     """
-    print(f"Archiving {archive_repo} to a tarball")
-    if remote:
-        archive_cmd = f"ssh {ssh_user}@{ssh_server} -p {ssh_port} \
-        tar cfvz {archive_repo}.tgz {location}/{archive_repo}.git/"
-    else:
-        archive_cmd = f"tar cfvz {location}/{archive_repo}.tgz {location}/{archive_repo}.git/"
-    
-    archive_result = subprocess.run(archive_cmd, shell=True, check=True, capture_output=True, text=True)
-    print(archive_result.stdout.strip())
-    return archive_result.stdout
+    width = [0]
+
+    def show(text, final):
+        # Overwrite the current line for in-place updates
+        print("\r" + text.ljust(width[0]), end="\n" if final else "", flush=True)
+        width[0] = 0 if final else len(text)
+
+    try:
+        backend.clone(name, options=options, on_progress=show, supervisor=supervisor)
+    except subprocess.CalledProcessError as e:
+        e.stderr = None  # git's messages were already shown above
+        raise
+    except OperationAborted:
+        if width[0]:
+            print()
+        raise
+    return name
 
-def remove_repo(rm_repo, location, ssh_server=None, ssh_user=None, ssh_port=None, remote=False):
+def download_archive(backend, name, output, supervisor=None):
     """
-    Deletes a repo locally or via SSH
+    Archives a repo into a local file: tar runs on the server uncompressed
+    and the stream is compressed on this machine. `output` may be a file or
+    a directory (then <repo>.tgz is written into it)
     """
-    print(f"Deleting {rm_repo}")
-    if remote:
-        del_cmd = f"ssh {ssh_user}@{ssh_server} -p {ssh_port} \
-        rm -rfv {location}/{rm_repo}.git"
+    dest = Path(output)
+    if dest.is_dir():
+        dest = dest / f"{name}.tgz"
+
+    def progress(done, elapsed):
+        print(f"\r{name}: {human_size(done / 1024)} read, "
+              f"{human_size(done / 1024 / max(elapsed, 1e-6))}/s   ",
+              end="", file=sys.stderr, flush=True)
+
+    print(f"Archiving {name} to {dest}")
+    try:
+        raw, written, elapsed, label = backend.download_archive(name, dest, progress, supervisor)
+    except OperationAborted:
+        print(file=sys.stderr)
+        raise
+    print(f"\r{name}: {human_size(raw / 1024)} -> {human_size(written / 1024)} "
+          f"in {elapsed:.1f}s ({human_size(raw / 1024 / max(elapsed, 1e-6))}/s, {label})",
+          file=sys.stderr)
+    return dest
+
+def download_archives(backend, names, output, supervisor=None):
+    """
+    Downloads the archive of each repo in turn (see download_archive),
+    printing one line per item and carrying on after a failed one. A cancel
+    stops at the current item. Returns {name: error or None}
+    """
+    results = {}
+    for name in names:
+        try:
+            download_archive(backend, name, output, supervisor)
+        except subprocess.CalledProcessError as e:
+            results[name] = " ".join((e.stderr or "").split()) or str(e)
+        except (OperationAborted, OSError, RuntimeError) as e:
+            results[name] = str(e)
+        else:
+            results[name] = None
+        if results[name] is None:
+            print(f"ok      {name}", flush=True)
+        else:
+            print(f"FAILED  {name}: {results[name]}", flush=True)
+        if supervisor is not None and supervisor.cancel is not None and supervisor.cancel.is_set():
+            break
+    return results
+
+def batch_repos(backend, action, names, jobs=4, options=(), supervisor=None):
+    """
+    Runs new/archive/remove/clone for many repos, `jobs` at a time, printing
+    one line per item as it finishes. Returns {name: error or None}
+    """
+    def report(name, error):
+        if error is None:
+            print(f"ok      {name}", flush=True)
+        else:
+            print(f"FAILED  {name}: {error}", flush=True)
+
+    return backend.batch(action, names, jobs, options, report, supervisor)
+
+def fetch_all(base, jobs=8, depth=DISCOVERY_DEPTH, supervisor=None):
+    """
+    Fetches every repo found in base in parallel (once per git dir, not per
+    worktree), printing each result as it finishes.
+    Returns {repo: (state, seconds, message)}
+    """
+    from githelper_core.fetch import fetch_repos_parallel
+
+    repos = [path for path, _kind in distinct_repos(discover_repos(base, depth=depth))]
+    print(f"Fetching {len(repos)} repos in {base}")
+    print_lock = threading.Lock()
+
+    def report(repo, state, info):
+        if state == "fetching":
+            return
+        with print_lock:
+            line = f"{state:<11} {repo}"
+            print(f"{line}: {info}" if info else line, flush=True)
+
+    return fetch_repos_parallel(repos, report, workers=jobs, supervisor=supervisor)
+
+def export_heatmap(base, fmt="json", output=None, svg=None, refs="HEAD",
+                   authors=None, depth=DISCOVERY_DEPTH, use_cache=True):
+    """
+    Runs the GUI's heatmap aggregation over the repos in base and writes a
+    JSON, CSV or SVG report to output (stdout by default), plus an SVG of
+    the grid to svg in the same pass. Reuses the GUI's heatmap cache
+    """
+    import json
+    from githelper_core.heatmap import (
+        author_matcher, collect_heatmap, heatmap_to_csv, heatmap_to_json,
+        heatmap_to_svg, heatmap_window,
+    )
+    from githelper_core.index import LocalRepoIndex
+
+    base = Path(os.path.expanduser(base))
+    started = time.monotonic()
+    repos = [Path(path) for path, _kind in distinct_repos(discover_repos(base, depth=depth))]
+    names = [repo.relative_to(base).as_posix() if repo != base else repo.name for repo in repos]
+    cache = LocalRepoIndex() if use_cache else None
+    data, job = collect_heatmap(repos, names, heatmap_window(), refs=refs,
+                                match=author_matcher(authors), cache=cache)
+    if fmt == "csv":
+        report = heatmap_to_csv(data)
+    elif fmt == "svg":
+        report = heatmap_to_svg(data)
     else:
-        del_cmd = f"rm -rfv {location}/{rm_repo}.git"
-    
-    del_result = subprocess.run(del_cmd, shell=True, check=True, capture_output=True, text=True)
-    print(del_result.stdout.strip())
-    return del_result.stdout
+        report = json.dumps(heatmap_to_json(data), indent=2) + "\n"
+    if output:
+        Path(output).write_text(report, encoding="utf-8")
+    else:
+        sys.stdout.write(report)
+    if svg:
+        Path(svg).write_text(heatmap_to_svg(data), encoding="utf-8")
+    stats = ", ".join(f"{n} {kind}" for kind, n in sorted(job.stats.items()))
+    print(f"Heatmap: {len(repos)} repos ({stats or 'none'}), {sum(data.totals)} commits "
+          f"in {time.monotonic() - started:.1f}s", file=sys.stderr)
+    return data
+
+def _no_match(pattern):
+    """
+    Reports a glob that matched no repos as a failed item; returns its error
+    """
+    error = "no repos match"
+    print(f"FAILED  {pattern}: {error}", flush=True)
+    return error
 
 def main():
     """
@@ -127,29 +269,103 @@ def main():
     parser.add_argument('--port', '-p',
         default="22",
         help='SSH port (default: 22)')
+    parser.add_argument('--persist',
+        type=int, default=0, metavar='SECONDS',
+        help='Keep the shared SSH connection open this long after exit so '
+             'later calls skip the handshake (default: close on exit)')
+    parser.add_argument('--verbose', '-v',
+        action='store_true',
+        help='Report SSH connection reuse and latency saved')
 
     # Operation flags
     parser.add_argument('--list', '-l',
         action='store_true',
         help='List existing repos')
+    parser.add_argument('--long',
+        action='store_true',
+        help='With --list, show size, last commit, HEAD and ref counts')
     parser.add_argument('--clone', '-c',
-        action='store',
-        help='Clone a repo locally')
+        nargs='+', metavar='REPO',
+        help='Clone repos locally (names or quoted globs)')
+    parser.add_argument('--depth',
+        type=int,
+        help='With --clone, only fetch the last DEPTH commits')
+    parser.add_argument('--filter',
+        metavar='SPEC',
+        help='With --clone, partial clone filter, e.g. blob:none or tree:0')
+    parser.add_argument('--single-branch',
+        action='store_true',
+        help='With --clone, only fetch one branch (HEAD or --branch)')
+    parser.add_argument('--branch', '-b',
+        help='With --clone, check out this branch')
+    parser.add_argument('--sparse',
+        action='store_true',
+        help='With --clone, start with a sparse checkout of top-level files')
     parser.add_argument('--new', '-n',
-        action='store',
-        help='Create a new repo')
+        nargs='+', metavar='REPO',
+        help='Create new repos')
     parser.add_argument('--archive', '-a',
-        action='store',
-        help='Compress a repo into a tarball file')
+        nargs='+', metavar='REPO',
+        help='Compress repos into tarball files (names or quoted globs)')
+    parser.add_argument('--output', '-o',
+        metavar='PATH',
+        help='With --archive, stream the repo here and compress it locally '
+             '(.tgz, .tar.zst or .tar; a directory gets <repo>.tgz). '
+             'With --heatmap, write the report here instead of stdout')
     parser.add_argument('--remove', '--rm',
-        action='store',
-        help='Delete a repo')
+        nargs='+', metavar='REPO',
+        help='Delete repos (names or quoted globs)')
+    parser.add_argument('--jobs', '-j',
+        type=int, default=4,
+        help='How many repos a batch works on at once (default: 4)')
+    parser.add_argument('--fetch-all',
+        metavar='DIR',
+        help='Fetch every local repo inside DIR in parallel (see --jobs)')
+    parser.add_argument('--scan-depth',
+        type=int, default=DISCOVERY_DEPTH,
+        help=f'How many directory levels --fetch-all and --heatmap search (default: {DISCOVERY_DEPTH})')
+    parser.add_argument('--heatmap',
+        metavar='DIR',
+        help='Report commit activity of the last year for the local repos in DIR')
+    parser.add_argument('--format',
+        choices=('json', 'csv', 'svg'),
+        help='--heatmap report format (default: from the --output suffix, else json)')
+    parser.add_argument('--svg',
+        metavar='PATH',
+        help='With --heatmap, also write the grid as an SVG image')
+    parser.add_argument('--refs',
+        choices=('HEAD', 'branches', 'all'), default='HEAD',
+        help='With --heatmap, count commits reachable from HEAD, all local '
+             'branches or all refs (default: HEAD)')
+    parser.add_argument('--authors',
+        metavar='PATTERNS',
+        help='With --heatmap, only count these author emails (comma-separated, '
+             'globs allowed, e.g. "me@example.com,*@work.example")')
+    parser.add_argument('--no-cache',
+        action='store_true',
+        help='With --heatmap, read all history instead of reusing the heatmap cache')
+    parser.add_argument('--timeout',
+        type=float, metavar='SECONDS',
+        help='Stop a clone, fetch or archive download that takes longer than this '
+             '(0: no limit; default: ' + ', '.join(
+                 f'{op} {secs}s' for op, secs in OPERATION_TIMEOUTS.items() if op != 'pull') + ')')
+    parser.add_argument('--stall-timeout',
+        type=float, default=STALL_TIMEOUT, metavar='SECONDS',
+        help='Stop a clone, fetch or archive download that shows no progress '
+             f'for this long (0: never; default: {STALL_TIMEOUT})')
     parser.add_argument('--rename', '-rn',
         action='store_true',
         help='Rename repo (requires --old-repo and --new-repo)')
     parser.add_argument('--fork', '-f',
         action='store_true',
         help='Copy/fork repo (requires --old-repo and --new-repo)')
+    parser.add_argument('--fork-mode',
+        choices=('link', 'shared', 'copy'), default='link',
+        help='link: hardlink objects (default); shared: borrow objects via '
+             'alternates; copy: full independent copy')
+    parser.add_argument('--dissociate',
+        metavar='REPO',
+        help='Make a fast fork standalone (own packs, no alternates)')
     
     # Rename/fork specific arguments
     parser.add_argument('--old-repo',
@@ -158,6 +374,9 @@ def main():
         help='New repo name (used with --rename or --fork)')
 
     args = parser.parse_args()
+
+    global _verbose
+    _verbose = args.verbose
     
     # Determine if we're operating remotely
     remote = bool(args.server)
@@ -173,26 +392,129 @@ def main():
         print("Error: --rename and --fork require both --old-repo and --new-repo")
         sys.exit(1)
 
+    batch_action = next(((action, getattr(args, action))
+                         for action in ("clone", "new", "archive", "remove")
+                         if getattr(args, action)), None)
+    if batch_action and batch_action[0] == "new" and any(has_glob(n) for n in batch_action[1]):
+        print("Error: --new does not accept glob patterns")
+        sys.exit(1)
+
+    # A typo in a scheduled --heatmap or --fetch-all run must not pass as
+    # an empty success
+    for scan_dir in (args.heatmap, args.fetch_all):
+        if scan_dir and not Path(os.path.expanduser(scan_dir)).is_dir():
+            print(f"Error: {scan_dir} is not a directory", file=sys.stderr)
+            sys.exit(1)
+
+    # Validate archive download arguments
+    if args.output and not (args.archive or args.heatmap):
+        print("Error: --output is only used with --archive or --heatmap")
+        sys.exit(1)
+    if args.output and args.archive and (len(args.archive) > 1 or any(has_glob(n) for n in args.archive)):
+        if not Path(args.output).is_dir():
+            print("Error: --output must be a directory when archiving several repos")
+            sys.exit(1)
+
+    options = clone_options(args.depth, args.filter, args.single_branch, args.branch, args.sparse)
+    # Masters live in a fixed directory so --persist can hand them to later
+    # calls; without it they still outlive a crash by a minute
+    ssh_pool = SSHConnectionPool(persist=args.persist or 60, control_dir=SSH_CONTROL_DIR,
+                                 keep_open=args.persist > 0)
+    # Only long transfers are supervised; everything else keeps plain Ctrl-C
+    cancel = None
+    if args.fetch_all or args.clone or (args.archive and args.output):
+        cancel = cancel_on_sigint()
+    if remote:
+        backend = SSHBackend(ssh_pool, args.user, args.server, args.port, location, on_note=_log)
+    else:
+        backend = LocalBackend(location)
+
     try:
-        if args.list:
-            list_repos(location, args.server, args.user, args.port, remote)
+        if args.heatmap:
+            fmt = args.format
+            if fmt is None:
+                suffix = Path(args.output or "").suffix.lower().lstrip(".")
+                fmt = suffix if suffix in ("json", "csv", "svg") else "json"
+            export_heatmap(args.heatmap, fmt, args.output, args.svg, args.refs,
+                           args.authors, args.scan_depth, not args.no_cache)
+        elif args.fetch_all:
+            results = fetch_all(args.fetch_all, args.jobs, args.scan_depth,
+                                supervisor_for(args, "fetch", cancel))
+            counts = defaultdict(int)
+            for state, _seconds, _message in results.values():
+                counts[state] += 1
+            summary = (f"{counts['updated']} updated, {counts['up to date']} up to date, "
+                       f"{counts['failed']} failed")
+            print(summary + (f", {counts['cancelled']} cancelled" if counts["cancelled"] else ""))
+            failed = counts["failed"]
+            if cancel.is_set():
+                sys.exit(130)
+            sys.exit(0 if not failed else 1 if failed == len(results) else 2)
+        elif (args.archive and args.output) or (
+                batch_action and (len(batch_action[1]) > 1 or any(has_glob(n) for n in batch_action[1]))):
+            # Downloads (--archive with --output) take precedence, as before
+            action, patterns = ("archive", args.archive) if args.archive and args.output else batch_action
+            # A pattern that matches nothing counts as a failed item
+            unmatched = {}
+            names = backend.expand(patterns, on_missing=lambda p: unmatched.update({p: _no_match(p)}))
+            results = dict(unmatched)
+            if names and args.output:
+                results.update(download_archives(backend, names, args.output,
+                                                 supervisor_for(args, "archive", cancel)))
+            elif names:
+                supervisor = supervisor_for(args, "clone", cancel) if action == "clone" else None
+                results.update(batch_repos(backend, action, names, args.jobs, options, supervisor))
+            failed = sum(1 for error in results.values() if error)
+            print(f"{len(results) - failed} succeeded, {failed} failed")
+            if cancel is not None and cancel.is_set():
+                sys.exit(130)
+            # 0: all succeeded, 1: all failed, 2: partial failure
+            sys.exit(0 if not failed else 1 if failed == len(results) else 2)
+        elif args.list and args.long:
+            list_repos_long(backend)
+        elif args.list:
+            list_repos(backend)
         elif args.clone:
-            clone_repo(args.clone, location, args.server, args.user, args.port, remote)
+            clone_repo(backend, args.clone[0], options, supervisor_for(args, "clone", cancel))
         elif args.new:
-            create_repo(args.new, location, args.server, args.user, args.port, remote)
+            backend.create(args.new[0])
+            print(f"Created {args.new[0]}.git")
         elif args.archive:
-            archive_repo(args.archive, location, args.server, args.user, args.port, remote)
+            print(f"Archiving {args.archive[0]} to a tarball")
+            backend.archive(args.archive[0])
+            print(f"Created {location.rstrip('/')}/{args.archive[0]}.tgz")
         elif args.remove:
-            remove_repo(args.remove, location, args.server, args.user, args.port, remote)
+            print(f"Deleting {args.remove[0]}")
+            backend.remove(args.remove[0])
         elif args.rename:
-            rename_repo(location, args.new_repo, args.old_repo, args.server, args.user, args.port, remote)
+            backend.rename(args.old_repo, args.new_repo)
+            print(f"{args.old_repo} -> {args.new_repo}")
         elif args.fork:
-            fork_repo(location, args.new_repo, args.old_repo, args.server, args.user, args.port, remote)
+            backend.fork(args.old_repo, args.new_repo, args.fork_mode)
+            print(f"{args.old_repo} -> {args.new_repo} ({args.fork_mode})")
+        elif args.dissociate:
+            backend.dissociate(args.dissociate)
+            print(f"{args.dissociate} is now standalone")
         else:
             parser.print_help()
     except subprocess.CalledProcessError as e:
-        print(f"Error executing command: {e}")
+        print(f"Error executing command (exit status {e.returncode})")
+        if e.stderr:
+            print(e.stderr.strip())
+        sys.exit(1)
+    except OperationAborted as e:
+        print("Cancelled" if e.reason == "cancelled" else f"Error: {e}")
+        sys.exit(130 if e.reason == "cancelled" else 1)
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}")
         sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nInterrupted", file=sys.stderr)
+        sys.exit(130)
+    finally:
+        if ssh_pool.saved_seconds():
+            _log(f"ssh: ~{ssh_pool.saved_seconds():.2f}s of handshakes saved")
+        ssh_pool.close_all()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
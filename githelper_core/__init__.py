@@ -0,0 +1,11 @@
+"""
+Shared, tkinter-free building blocks for the githelper CLI and GUI
+
+Scripted CLI calls pay for every import at startup, so the package imports
+none of its modules up front. The modules every CLI call loads (backend,
+ssh, discovery, details, supervisor and the helpers they use) keep heavy
+standard-library imports (concurrent.futures, gzip, hashlib, tempfile)
+inside the functions that need them. archive, fetch, heatmap and index
+import their dependencies at the top; the CLI imports those modules only
+inside the commands that use them. bench/bench_startup.py measures both.
+"""
@@ -0,0 +1,142 @@
+"""
+Streaming a tar into a locally compressed archive
+"""
+
+import gzip
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+class ParallelGzipWriter:
+    """
+    Gzip-compresses a stream on all cores without external tools.
+
+    Each chunk becomes an independent gzip member (zlib releases the GIL while
+    compressing); members are written in order, which gunzip reads as one stream.
+    """
+
+    def __init__(self, fileobj, workers=None, chunk_size=4 << 20, level=6):
+        self.fileobj = fileobj
+        self.workers = workers or os.cpu_count() or 2
+        self.chunk_size = chunk_size
+        self.level = level
+        self._buffer = bytearray()
+        self._pending = deque()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self.chunk_size:
+            self._submit(bytes(self._buffer[:self.chunk_size]))
+            del self._buffer[:self.chunk_size]
+
+    def _submit(self, chunk):
+        self._pending.append(self._pool.submit(gzip.compress, chunk, self.level, mtime=0))
+        # Bound memory: keep at most two chunks per worker in flight
+        while len(self._pending) > self.workers * 2:
+            self.fileobj.write(self._pending.popleft().result())
+
+    def abort(self):
+        """Drop what hasn't been written and stop the workers"""
+        self._buffer.clear()
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._pool.shutdown(cancel_futures=True)
+
+    def close(self):
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self.fileobj.write(self._pending.popleft().result())
+        self._pool.shutdown()
+
+
+def open_compressor(dest, out_file):
+    """
+    Return (writer, process, label) compressing into out_file by destination
+    suffix: zstd for .zst, pigz or ParallelGzipWriter for .tgz/.gz, none for .tar
+    """
+    name = str(dest)
+    if name.endswith(".tar"):
+        return out_file, None, "uncompressed"
+    if name.endswith(".zst"):
+        if not shutil.which("zstd"):
+            raise RuntimeError("zstd is not installed; save as .tgz instead")
+        proc = subprocess.Popen(["zstd", "-q", "-T0", "-c"], stdin=subprocess.PIPE, stdout=out_file)
+        return proc.stdin, proc, "zstd -T0"
+    if shutil.which("pigz"):
+        proc = subprocess.Popen(["pigz", "-c"], stdin=subprocess.PIPE, stdout=out_file)
+        return proc.stdin, proc, "pigz"
+    writer = ParallelGzipWriter(out_file)
+    return writer, None, f"python gzip x{writer.workers}"
+
+
+def stream_archive(source_cmd, dest, on_progress=None, env=None, supervisor=None):
+    """
+    Stream an uncompressed tar from source_cmd (argv) into a locally compressed
+    file at dest. on_progress(bytes_read, elapsed) is called about twice a
+    second. source_cmd runs under supervisor's limits (see Supervisor).
+    Returns (bytes_read, bytes_written, elapsed, label); a failed or stopped
+    transfer leaves no partial file behind.
+    """
+    from .supervisor import Supervisor
+    dest = Path(dest)
+    start = time.monotonic()
+    bytes_read = 0
+    writer = compressor = None
+    try:
+        with open(dest, "wb") as out_file:
+            writer, compressor, label = open_compressor(dest, out_file)
+            source = (supervisor or Supervisor()).popen(
+                source_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+            last_report = start
+            # Read stderr alongside, so a chatty source can't fill the pipe
+            # and block while stdout is being read
+            errors = []
+            stderr_reader = threading.Thread(target=source.drain, args=(source.stderr, errors), daemon=True)
+            stderr_reader.start()
+            with source:
+                while True:
+                    chunk = source.stdout.read1(1 << 20)
+                    if not chunk:
+                        break
+                    source.touch()
+                    writer.write(chunk)
+                    bytes_read += len(chunk)
+                    now = time.monotonic()
+                    if on_progress and now - last_report >= 0.5:
+                        on_progress(bytes_read, now - start)
+                        last_report = now
+                stderr_reader.join()
+                stderr = b"".join(errors).decode(errors="replace")
+            if writer is not out_file:
+                writer.close()
+            if compressor is not None and compressor.wait() != 0:
+                raise RuntimeError(f"{label} exited with status {compressor.returncode}")
+            source.check()
+            if source.returncode != 0:
+                raise subprocess.CalledProcessError(source.returncode, source_cmd, stderr=stderr)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+    finally:
+        # Reached early on an error: don't leave the compressor process or
+        # the gzip workers running behind a deleted file
+        if isinstance(writer, ParallelGzipWriter):
+            writer.abort()
+        if compressor is not None and compressor.poll() is None:
+            try:
+                compressor.stdin.close()
+            except OSError:
+                pass
+            compressor.terminate()
+            compressor.wait()
+    return bytes_read, dest.stat().st_size, time.monotonic() - start, label
@@ -0,0 +1,494 @@
+"""
+Operations on a directory of bare repos, on this machine or over SSH
+"""
+
+import fnmatch
+import shlex
+import subprocess
+from pathlib import Path, PurePosixPath
+
+from .history import HISTORY_PAGE, log_args, parse_log
+from .supervisor import OperationAborted
+
+FORK_MODES = ("link", "shared", "copy")
+
+# Cheap server-side change detector for a bare repo: a checksum over HEAD,
+# every ref tip and the pack directory listing. Shell function `fp DIR`.
+FINGERPRINT_FUNC = (
+    "fp() { { git --git-dir \"$1\" symbolic-ref -q HEAD; "
+    "git --git-dir \"$1\" for-each-ref --format='%(objectname) %(refname)'; "
+    "ls -ln \"$1/objects/pack\"; } 2>/dev/null | cksum | tr ' ' '-'; }"
+)
+
+# Walks every bare repo once and prints one tab-separated record per repo
+# as soon as it is gathered: name, loose objects, pack size (KiB), last
+# commit (epoch), HEAD, branches, tags, fingerprint.
+# Repos whose fingerprint the caller already knows print only
+# "name<TAB>=<TAB>fingerprint".
+INVENTORY_LOOP = r"""
+for d in *.git; do
+  [ -d "$d" ] || continue
+  f=$(fp "$d")
+  if known "${d%.git} $f"; then printf '%s\t=\t%s\n' "${d%.git}" "$f"; continue; fi
+  objs=$(git --git-dir "$d" count-objects -v 2>/dev/null |
+    awk '/^count:/{c=$2} /^size-pack:/{p=$2} END{printf "%d\t%d", c, p}')
+  ts=$(git --git-dir "$d" log -1 --format=%ct 2>/dev/null)
+  head=$(git --git-dir "$d" symbolic-ref -q --short HEAD 2>/dev/null)
+  refs=$(git --git-dir "$d" for-each-ref --format='%(refname)' refs/heads refs/tags 2>/dev/null |
+    awk '/^refs\/heads\//{h++} /^refs\/tags\//{t++} END{printf "%d\t%d", h, t}')
+  printf '%s\t%s\t%s\t%s\t%s\t%s\n' "${d%.git}" "$objs" "${ts:-0}" "$head" "$refs" "$f"
+done
+"""
+
+# Runs one batch item and reports "ok<TAB>name" or "fail<TAB>name<TAB>error".
+# `slots N` makes N job slots: a FIFO on fd 3 holding one token per free
+# slot (plain sh has no `wait -n`). `start` takes a token, or waits for a
+# running item to hand one back, so N items are always running.
+BATCH_RUNNER = r"""
+run() {
+  if out=$(eval "$2" 2>&1); then
+    printf 'ok\t%s\n' "$1"
+  else
+    printf 'fail\t%s\t%s\n' "$1" "$(printf %s "$out" | tr '\n\t' '  ')"
+  fi
+}
+slots() {
+  f=$(mktemp -u) && mkfifo "$f" && exec 3<>"$f" && rm -f "$f"
+  i=0; while [ "$i" -lt "$1" ]; do echo >&3; i=$((i + 1)); done
+}
+start() {
+  read -r token <&3
+  { run "$1" "$2"; echo >&3; } &
+}
+"""
+
+# Sections printed by RepoBackend.details(), in order, NUL-separated
+DETAIL_SECTIONS = ("fingerprint", "head", "last", "refs", "objects", "tip", "merges", "commits")
+
+
+def inventory_script(known=None):
+    """
+    Build the inventory script. `known` maps repo name -> fingerprint from a
+    cache; those repos are skipped in the script if still unchanged.
+    """
+    patterns = "|".join(shlex.quote(f"{name} {fp}") for name, fp in (known or {}).items())
+    if patterns:
+        known_func = f"known() {{ case \"$1\" in {patterns}) return 0;; esac; return 1; }}"
+    else:
+        known_func = "known() { return 1; }"
+    return f"{FINGERPRINT_FUNC}\n{known_func}\n{INVENTORY_LOOP}"
+
+
+def parse_inventory_line(line):
+    """Parse one inventory record into a dict (None if malformed)"""
+    fields = line.rstrip("\n").split("\t")
+    if len(fields) == 3 and fields[1] == "=":
+        return {"name": fields[0], "fingerprint": fields[2], "unchanged": True}
+    if len(fields) != 8:
+        return None
+    name, loose, pack_kib, last_ts, head, branches, tags, fingerprint = fields
+    try:
+        return {
+            "name": name,
+            "loose": int(loose),
+            "pack_kib": int(pack_kib),
+            "last_commit": int(last_ts or 0),
+            "head": head,
+            "branches": int(branches),
+            "tags": int(tags),
+            "fingerprint": fingerprint,
+        }
+    except ValueError:
+        return None
+
+
+def has_glob(name):
+    """True if a repo argument is a glob pattern"""
+    return any(ch in name for ch in "*?[")
+
+
+def repo_dirname(name):
+    """The repo's directory name: `name` with a single .git suffix"""
+    return (name or "").strip().removesuffix(".git") + ".git"
+
+
+def cd_command(directory):
+    """Shell `cd` into directory, with ~ and ~/... relative to $HOME"""
+    directory = (directory or "").strip()
+    if directory == "~":
+        return 'cd -- "$HOME"'
+    if directory.startswith("~/"):
+        return 'cd -- "$HOME"/' + shlex.quote(directory[2:].rstrip("/"))
+    if directory != "/":
+        directory = directory.rstrip("/")
+    return f"cd -- {shlex.quote(directory)}"
+
+
+def shared_guard(repo_git):
+    """
+    Shell snippet (run inside the repo directory) that fails if another
+    repo borrows objects from repo_git via objects/info/alternates, since
+    renaming or deleting it would corrupt that fork.
+    """
+    needle = shlex.quote(f"/{repo_git}/objects")
+    return (
+        "for a in *.git/objects/info/alternates; do "
+        f"if [ -f \"$a\" ] && grep -qF {needle} \"$a\"; then "
+        "echo \"Objects are shared with ${a%%/*}; dissociate it first\" >&2; exit 1; "
+        "fi; done"
+    )
+
+
+def _remove_partial_clone(dest, keep_dir):
+    """Remove what a failed clone left in dest (and dest itself unless keep_dir)"""
+    import shutil
+    shutil.rmtree(dest, ignore_errors=True)
+    if keep_dir:
+        dest.mkdir(exist_ok=True)
+
+
+class RepoBackend:
+    """
+    A directory of bare repos and the operations on it.
+
+    Every operation is a POSIX shell script run from inside that directory,
+    so LocalBackend and SSHBackend share the same quoting and path rules and
+    only differ in transport: argv() (how a script is started), clone_url()
+    and git_env(). Failures raise CalledProcessError carrying stderr.
+    """
+
+    def __init__(self, location):
+        self.location = (location or "").strip()
+
+    def argv(self, script):
+        """Command line that runs a shell script next to the repos"""
+        raise NotImplementedError
+
+    def clone_url(self, name):
+        """URL git clones the repo from"""
+        raise NotImplementedError
+
+    def git_env(self):
+        """Environment for git processes talking to the repos (None: inherit)"""
+        return None
+
+    def _script(self, body):
+        return f"{cd_command(self.location)} || exit 1\n{body}"
+
+    def run(self, body):
+        """Run a script in the repo directory; returns the CompletedProcess"""
+        return subprocess.run(self.argv(self._script(body)),
+                              check=True, capture_output=True, text=True)
+
+    def popen(self, body, **kwargs):
+        """Start a script in the repo directory; returns the Popen"""
+        return subprocess.Popen(self.argv(self._script(body)), **kwargs)
+
+    # == Listing ==
+    def repo_names(self):
+        """Sorted names (without .git) of the repos in the directory"""
+        result = self.run('for d in *.git; do if [ -d "$d" ]; then printf \'%s\\n\' "${d%.git}"; fi; done')
+        return sorted(result.stdout.splitlines())
+
+    def expand(self, patterns, on_missing=None):
+        """
+        Expand glob patterns against the repos that exist, keeping literal
+        names as given and dropping duplicates. on_missing(pattern) is
+        called for globs that match nothing.
+        """
+        names = [p.strip().removesuffix(".git") for p in patterns]
+        if any(has_glob(n) for n in names):
+            available = self.repo_names()
+            expanded = []
+            for name in names:
+                if not has_glob(name):
+                    expanded.append(name)
+                    continue
+                matches = fnmatch.filter(available, name)
+                if not matches and on_missing:
+                    on_missing(name)
+                expanded.extend(matches)
+            names = expanded
+        return list(dict.fromkeys(names))
+
+    def inventory(self, known=None):
+        """
+        Yield inventory records (see parse_inventory_line) as the script
+        prints them. Repos in `known` whose fingerprint still matches only
+        yield {"name", "fingerprint", "unchanged": True}.
+        """
+        with self.popen(inventory_script(known), stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE, text=True) as proc:
+            for line in proc.stdout:
+                record = parse_inventory_line(line)
+                if record is not None:
+                    yield record
+            stderr = proc.stderr.read()
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args, stderr=stderr)
+
+    def details(self, name, known_fp=None):
+        """
+        Everything the details pane shows, gathered by one script with a
+        single count-objects. Returns (fingerprint, details); details is
+        None if the repo still matches known_fp.
+        """
+        repo_git = repo_dirname(name)
+        stdout = self.run(
+            f"REPO={shlex.quote(repo_git)}; "
+            "[ -d \"$REPO\" ] || { echo \"No such repo: $REPO\" >&2; exit 1; }; "
+            f"{FINGERPRINT_FUNC}; "
+            "F=$(fp \"$REPO\"); printf '%s\\035' \"$F\"; "
+            f"[ \"$F\" = {shlex.quote(known_fp or '')} ] && {{ printf '='; exit 0; }}; "
+            "G() { git --git-dir \"$REPO\" \"$@\" 2>/dev/null; }; "
+            "G symbolic-ref -q --short HEAD; printf '\\035'; "
+            "G log -1 --format='%h %ci %an %s'; printf '\\035'; "
+            "G for-each-ref --format='%(refname)' refs/heads refs/tags; printf '\\035'; "
+            "G count-objects -vH; printf '\\035'; "
+            "G rev-parse -q --verify HEAD; printf '\\035'; "
+            f"G {shlex.join(log_args(merges=True))}; printf '\\035'; "
+            f"G {shlex.join(log_args())}; "
+            "exit 0"
+        ).stdout
+
+        parts = stdout.split("\x1d")
+        if len(parts) == 2 and parts[1] == "=":
+            return parts[0], None
+        parts += [""] * (len(DETAIL_SECTIONS) - len(parts))
+        sec = dict(zip(DETAIL_SECTIONS, parts))
+
+        refs = sec["refs"].split()
+        objects = {}
+        for line in sec["objects"].splitlines():
+            key, _, value = line.partition(":")
+            objects[key.strip()] = value.strip()
+
+        meta = {
+            "Repo": repo_git,
+            "HEAD": sec["head"].strip() or "(detached/unknown)",
+            "Last commit": sec["last"].strip() or "(no commits)",
+            "Branches": sum(1 for r in refs if r.startswith("refs/heads/")),
+            "Tags": sum(1 for r in refs if r.startswith("refs/tags/")),
+            "Object size": objects.get("size-pack", ""),
+            "Loose objects": objects.get("count", ""),
+            "Packed objects": objects.get("in-pack", ""),
+        }
+        return sec["fingerprint"], {
+            "meta": meta,
+            "tip": sec["tip"].strip(),
+            "merges": parse_log(sec["merges"]),
+            "commits": parse_log(sec["commits"]),
+        }
+
+    def log_page(self, name, tip=None, skip=0, count=HISTORY_PAGE, merges=False):
+        """One page of a repo's history below tip (see CommitPager)"""
+        repo_git = shlex.quote(repo_dirname(name))
+        return parse_log(self.run(
+            f"[ -d {repo_git} ] || {{ echo {shlex.quote(f'No such repo: {repo_dirname(name)}')} >&2; exit 1; }}; "
+            f"git --git-dir {repo_git} {shlex.join(log_args(tip, skip, count, merges))} 2>/dev/null; "
+            "exit 0"
+        ).stdout)
+
+    # == Single-repo operations ==
+    def create(self, name):
+        """git init --bare a new repo"""
+        return self.run(f"set -e; git init --bare -q {shlex.quote(repo_dirname(name))}")
+
+    def rename(self, old, new):
+        """Rename a repo, unless another repo borrows its objects"""
+        old_git, new_git = repo_dirname(old), repo_dirname(new)
+        return self.run(f"set -e; {shared_guard(old_git)}; "
+                        f"mv {shlex.quote(old_git)} {shlex.quote(new_git)}")
+
+    def fork(self, old, new, mode="link"):
+        """
+        Copy a repo. "link" hardlinks the object files and "shared" borrows
+        them through objects/info/alternates, so both are near-instant and
+        use almost no extra disk; "copy" duplicates everything.
+        """
+        if mode not in FORK_MODES:
+            raise ValueError(f"Unknown fork mode: {mode}")
+        old_git = shlex.quote(repo_dirname(old))
+        new_git = shlex.quote(repo_dirname(new))
+        if mode == "copy":
+            return self.run(f"set -e; cp -R {old_git} {new_git}")
+        # A local mirror clone hardlinks objects (git copies them if the
+        # filesystem can't link) and takes every ref, notes and pull refs
+        # included. Then, like a copy, take the source's config (which
+        # drops the origin the clone records), hooks and description.
+        flag = "--shared" if mode == "shared" else "--local"
+        return self.run(
+            f"set -e; git clone --mirror {flag} -q {old_git} {new_git}; "
+            f"cp {old_git}/config {new_git}/config; "
+            f"if [ -d {old_git}/hooks ]; then rm -rf {new_git}/hooks; cp -R {old_git}/hooks {new_git}/hooks; fi; "
+            f"if [ -f {old_git}/description ]; then cp {old_git}/description {new_git}/description; fi"
+        )
+
+    def dissociate(self, name):
+        """
+        Make a fast fork standalone: repack every reachable object into its
+        own pack (replacing hardlinked packs) and drop the alternates file
+        """
+        repo_git = shlex.quote(repo_dirname(name))
+        return self.run(f"set -e; git --git-dir {repo_git} repack -a -d -q; "
+                        f"rm -f {repo_git}/objects/info/alternates")
+
+    def archive(self, name):
+        """Write <name>.tgz next to the repo, in the repo directory"""
+        return self.run(f"set -e; tar -czf {shlex.quote(name + '.tgz')} "
+                        f"{shlex.quote(repo_dirname(name))}")
+
+    def remove(self, name):
+        """Delete a repo, unless another repo borrows its objects"""
+        repo_git = repo_dirname(name)
+        return self.run(f"set -e; {shared_guard(repo_git)}; "
+                        f"[ -d {shlex.quote(repo_git)} ] || {{ echo {shlex.quote(f'No such repo: {repo_git}')} >&2; exit 1; }}; "
+                        f"rm -rf {shlex.quote(repo_git)}")
+
+    def clone(self, name, dest=None, options=(), on_progress=None, supervisor=None):
+        """
+        git clone the repo into dest (default: ./<name>), reporting git's
+        progress as on_progress(text, final) (see run_with_progress). The
+        clone runs under supervisor's limits; if it fails or is stopped, a
+        destination directory the clone created is removed again.
+        """
+        from .progress import run_with_progress
+        dest = Path(dest if dest is not None else PurePosixPath(name).name)
+        existed = dest.exists()
+        # Only clean up after ourselves: git refuses a non-empty destination
+        fresh = not existed or (dest.is_dir() and not any(dest.iterdir()))
+        cmd = ["git", "clone", "--progress", *options, self.clone_url(name), str(dest)]
+        try:
+            return run_with_progress(cmd, on_progress, env=self.git_env(), supervisor=supervisor)
+        except BaseException:
+            if fresh:
+                _remove_partial_clone(dest, keep_dir=existed)
+            raise
+
+    def download_archive(self, name, dest, on_progress=None, supervisor=None):
+        """
+        Stream an uncompressed tar of the repo here and compress it locally
+        into dest (see stream_archive), under supervisor's limits. Returns
+        (bytes_read, bytes_written, elapsed, compressor label)
+        """
+        from .archive import stream_archive
+        source = self.argv(self._script(f"tar cf - {shlex.quote(repo_dirname(name))}"))
+        return stream_archive(source, dest, on_progress, supervisor=supervisor)
+
+    # == Batches ==
+    def _batch_item(self, action, name):
+        repo_git = shlex.quote(repo_dirname(name))
+        if action == "new":
+            return f"git init --bare -q {repo_git}"
+        missing = f"echo {shlex.quote(f'No such repo: {name}')} >&2; false"
+        if action == "archive":
+            tarball = shlex.quote(f"{name}.tgz")
+            return f"if [ -d {repo_git} ]; then tar czf {tarball} {repo_git}; else {missing}; fi"
+        if action == "remove":
+            return (f"{shared_guard(repo_dirname(name))}; "
+                    f"if [ -d {repo_git} ]; then rm -rf {repo_git}; else {missing}; fi")
+        raise ValueError(f"Unsupported batch action: {action}")
+
+    def batch(self, action, names, jobs=4, options=(), on_result=None, supervisor=None):
+        """
+        Run new/archive/remove for many repos as one script (one SSH session),
+        at most `jobs` at a time, or clone many repos with `jobs` parallel
+        clones into the current directory, each under supervisor's limits.
+        on_result(name, error or None) is called as each item finishes.
+        Returns {name: error or None}
+        """
+        results = {}
+
+        def report(name, error=None):
+            results[name] = error
+            if on_result:
+                on_result(name, error)
+
+        if action == "clone":
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+                futures = {pool.submit(self.clone, name, None, options, None, supervisor): name
+                           for name in names}
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except subprocess.CalledProcessError as e:
+                        report(futures[future], " ".join((e.stderr or "").split()) or str(e))
+                    except OperationAborted as e:
+                        report(futures[future], str(e))
+                    else:
+                        report(futures[future])
+            return results
+
+        lines = [BATCH_RUNNER, f"slots {max(1, jobs)}"]
+        for name in names:
+            item = self._batch_item(action, name)
+            lines.append(f"start {shlex.quote(name)} {shlex.quote(item)}")
+        lines.append("wait")
+
+        with self.popen("\n".join(lines), stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE, text=True) as proc:
+            for line in proc.stdout:
+                status, _, rest = line.rstrip("\n").partition("\t")
+                name, _, error = rest.partition("\t")
+                if status == "ok":
+                    report(name)
+                elif status == "fail":
+                    report(name, error.strip() or "failed")
+            stderr = proc.stderr.read()
+        for name in names:
+            if name not in results:
+                report(name, " ".join(stderr.split()) or "no result from batch")
+        return results
+
+
+class LocalBackend(RepoBackend):
+    """Repos in a directory on this machine"""
+
+    def argv(self, script):
+        return ["sh", "-c", script]
+
+    def clone_url(self, name):
+        return Path(self.location).expanduser().resolve().joinpath(repo_dirname(name)).as_uri()
+
+
+class SSHBackend(RepoBackend):
+    """
+    Repos in a directory on an SSH server. Commands and git's own transport
+    share the pool's master connection; on_note(text) receives its latency
+    notes for the log.
+    """
+
+    def __init__(self, pool, user, server, port, location, on_note=None):
+        super().__init__(location)
+        self.pool = pool
+        self.user, self.server, self.port = user, server, str(port)
+        self.on_note = on_note
+
+    def _note(self, note):
+        if note and self.on_note:
+            self.on_note(note)
+
+    def argv(self, script):
+        cmd, note = self.pool.ssh_argv(self.user, self.server, self.port, script)
+        self._note(note)
+        return cmd
+
+    def git_env(self):
+        env, note = self.pool.git_env(self.user, self.server, self.port)
+        self._note(note)
+        return env
+
+    def clone_url(self, name):
+        # Git's ssh URLs take /~/ to mean the home directory; other relative
+        # directories are relative to home too
+        location = self.location.rstrip("/")
+        if location == "~":
+            path = "/~"
+        elif location.startswith("~/"):
+            path = "/~/" + location[2:]
+        elif location.startswith("/"):
+            path = location
+        else:
+            path = "/~/" + location
+        return f"ssh://{self.user}@{self.server}:{self.port}{path}/{repo_dirname(name)}"
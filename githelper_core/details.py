@@ -0,0 +1,326 @@
+"""
+Local repo details read with as few git processes as possible
+"""
+
+import os
+import re
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+from .gitdir import resolve_git_dirs
+from .history import format_commit, log_args, parse_log
+
+
+def human_size(kib):
+    """Format a size in KiB for display"""
+    size = float(kib)
+    for unit in ("KiB", "MiB", "GiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def classify_remote(url):
+    u = (url or "").strip().lower()
+    if "github.com" in u:
+        return "GitHub"
+    if "gitlab.com" in u:
+        return "GitLab"
+    if "bitbucket.org" in u:
+        return "Bitbucket"
+    if u.startswith("file://") or u.startswith("/"):
+        return "Local"
+    return "Other"
+
+
+def read_remotes(common_dir):
+    """Parse [remote "name"] url/pushurl entries straight from the git config file"""
+    remotes = {}
+    section = None
+    try:
+        lines = (Path(common_dir) / "config").read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return remotes
+    for raw in lines:
+        line = raw.strip()
+        match = re.match(r'^\[remote\s+"(.*)"\]$', line)
+        if match:
+            section = remotes.setdefault(match.group(1), {})
+            continue
+        if line.startswith("["):
+            section = None
+            continue
+        if section is not None and "=" in line:
+            key, _, value = line.partition("=")
+            key = key.strip().lower()
+            if key in ("url", "pushurl"):
+                section[key] = value.strip().strip('"')
+    return {name: r for name, r in remotes.items() if r.get("url")}
+
+
+def pack_object_count(idx_path):
+    """Number of objects in a pack, read from its .idx fanout table"""
+    with open(idx_path, "rb") as f:
+        header = f.read(8)
+        # v2+ indexes start with "\377tOc" + version; v1 starts with the fanout
+        offset = 8 + 255 * 4 if header[:4] == b"\377tOc" else 255 * 4
+        f.seek(offset)
+        return int.from_bytes(f.read(4), "big")
+
+
+def object_stats(common_dir):
+    """The count-objects -v numbers, computed by scanning the objects dir"""
+    objects = Path(common_dir) / "objects"
+    count = size = in_pack = packs = size_pack = 0
+    try:
+        with os.scandir(objects) as it:
+            for entry in it:
+                if len(entry.name) == 2 and entry.is_dir():
+                    with os.scandir(entry.path) as loose:
+                        for obj in loose:
+                            count += 1
+                            size += obj.stat().st_size
+        with os.scandir(objects / "pack") as it:
+            for entry in it:
+                if entry.name.endswith(".pack"):
+                    packs += 1
+                    size_pack += entry.stat().st_size
+                    try:
+                        in_pack += pack_object_count(entry.path[:-5] + ".idx")
+                    except OSError:
+                        pass
+    except OSError:
+        return None
+    return {"count": count, "size": size, "in-pack": in_pack, "packs": packs, "size-pack": size_pack}
+
+
+def _human_bytes(n):
+    return "0 bytes" if not n else human_size(n / 1024)
+
+
+def parse_status_v2(data):
+    """
+    Parse `git status --porcelain=v2 --branch -z` output into branch info,
+    per-kind change counts and `status -sb`-style lines for display.
+    """
+    info = {"oid": "", "head": "", "upstream": "", "ahead": None, "behind": None}
+    counts = dict.fromkeys(("modified", "added", "deleted", "renamed", "untracked", "conflicted"), 0)
+    short = []
+    fields = data.split("\0")
+    i = 0
+    while i < len(fields):
+        entry = fields[i]
+        i += 1
+        if not entry:
+            continue
+        kind = entry[0]
+        if kind == "#":
+            key, _, value = entry[2:].partition(" ")
+            if key == "branch.oid":
+                info["oid"] = value
+            elif key == "branch.head":
+                info["head"] = value
+            elif key == "branch.upstream":
+                info["upstream"] = value
+            elif key == "branch.ab":
+                ahead, behind = value.split()
+                info["ahead"], info["behind"] = int(ahead), int(behind)
+        elif kind in "?!":
+            if kind == "?":
+                counts["untracked"] += 1
+            short.append(f"{kind}{kind} {entry[2:]}")
+        elif kind in "12u":
+            # 1: ordinary, 2: rename/copy (original path is the next field),
+            # u: unmerged. The path is the last space-separated column.
+            nparts = {"1": 9, "2": 10, "u": 11}[kind]
+            parts = entry.split(" ", nparts - 1)
+            xy = parts[1].replace(".", " ")
+            path = parts[-1]
+            if kind == "2":
+                path = f"{fields[i]} -> {path}"
+                i += 1
+            if kind == "u":
+                counts["conflicted"] += 1
+            for code, key in (("A", "added"), ("D", "deleted"), ("R", "renamed"), ("M", "modified")):
+                if code in xy:
+                    counts[key] += 1
+            short.append(f"{xy} {path}")
+    return info, counts, short
+
+
+def collect_local_details(repo, supervisor=None):
+    """
+    Gather everything the Local Repos overview shows with three git processes
+    (status v2, for-each-ref, log); the rest is read from the git dir directly.
+    With a supervisor (see githelper_core.supervisor) the processes run under
+    its limits, so a cancelled read stops early with OperationAborted.
+    """
+    repo = Path(repo)
+    git_dir, common_dir = resolve_git_dirs(repo)
+
+    def git(*args):
+        cmd = ["git", "-C", str(repo), *args]
+        if supervisor is not None:
+            return supervisor.run(cmd)
+        return subprocess.run(cmd, capture_output=True, text=True)
+
+    bare = git_dir is not None and git_dir == repo.resolve()
+    if bare:
+        # No work tree to report on; the branch comes straight from HEAD
+        head = ""
+        try:
+            head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        except OSError:
+            pass
+        status_p = subprocess.CompletedProcess([], 0, "", "")
+        if head.startswith("ref: refs/heads/"):
+            status_p.stdout = f"# branch.head {head[len('ref: refs/heads/'):]}\0"
+    else:
+        # Don't refresh the index: that would race the user's own git
+        # commands and, for a watched repo, report a change of its own
+        status_p = git("--no-optional-locks", "status", "--porcelain=v2", "--branch", "-z")
+    refs_p = git("for-each-ref", "--format=%(refname)", "refs/heads", "refs/tags")
+    log_p = git(*log_args())
+
+    info, counts, short = parse_status_v2(status_p.stdout if status_p.returncode == 0 else "")
+    refs = refs_p.stdout.split()
+    commits = parse_log(log_p.stdout)
+
+    stash_count = 0
+    fetch_head = ""
+    if common_dir is not None:
+        try:
+            with open(common_dir / "logs" / "refs" / "stash", "rb") as f:
+                stash_count = sum(1 for line in f if line.strip())
+        except OSError:
+            pass
+        try:
+            fetch_head = datetime.fromtimestamp(
+                (common_dir / "FETCH_HEAD").stat().st_mtime
+            ).strftime("%Y-%m-%d %H:%M:%S")
+        except OSError:
+            pass
+
+    return {
+        "path": str(repo),
+        "git_dir": str(git_dir) if git_dir else "",
+        "bare": bare,
+        "branch": info["head"] if info["head"] not in ("", "(detached)") else "(unborn/detached)",
+        "detached": info["head"] == "(detached)",
+        "unborn": info["oid"] == "(initial)",
+        "upstream": info["upstream"],
+        "ahead": info["ahead"],
+        "behind": info["behind"],
+        "counts": counts,
+        "short_status": short,
+        "status_error": "" if status_p.returncode == 0 else status_p.stderr.strip(),
+        "stashes": stash_count,
+        "branches": sum(1 for r in refs if r.startswith("refs/heads/")),
+        "tags": sum(1 for r in refs if r.startswith("refs/tags/")),
+        "remotes": read_remotes(common_dir) if common_dir else {},
+        "objects": object_stats(common_dir) if common_dir else None,
+        "fetch_head": fetch_head,
+        "commits": commits,
+    }
+
+
+def format_local_overview(d):
+    """Render collect_local_details() output as the Overview and Commits texts"""
+    lines = [
+        f"Path: {d['path']}",
+        f"Git dir: {d['git_dir'] or '(unknown)'}",
+        f"Branch: {d['branch']}",
+    ]
+    ahead_behind = ""
+    if d["ahead"] is not None:
+        ahead_behind = f"ahead {d['ahead']}, behind {d['behind']}"
+    if d["upstream"]:
+        lines.append(f"Upstream: {d['upstream']}" + (f" ({ahead_behind})" if ahead_behind else ""))
+    else:
+        lines.append("Upstream: (none)")
+    last = d["commits"][0] if d["commits"] else None
+    last_text = f"{last['hash']} {last['date']} {last['author']} {last['subject']}" if last else ""
+    lines.append(f"Last commit: {last_text or '(no commits)'}")
+    if d["fetch_head"]:
+        lines.append(f"Last fetch: {d['fetch_head']}")
+    c = d["counts"]
+    if d["bare"]:
+        lines += ["", "Working tree: (bare repository)", ""]
+    else:
+        lines += [
+            "",
+            "Working tree:",
+            f"- modified: {c['modified']}, added: {c['added']}, deleted: {c['deleted']}, "
+            f"renamed: {c['renamed']}, untracked: {c['untracked']}, conflicts: {c['conflicted']}",
+            f"- stashes: {d['stashes']}",
+            "",
+        ]
+    lines += [
+        f"Branches: {d['branches']} | Tags: {d['tags']}",
+    ]
+    origin_url = d["remotes"].get("origin", {}).get("url", "")
+    if origin_url:
+        lines.append(f"Origin: {classify_remote(origin_url)} ({origin_url})")
+    lines.append("")
+    if d["status_error"]:
+        lines.append(d["status_error"])
+    else:
+        if d["detached"]:
+            head = "## HEAD (no branch)"
+        elif d["unborn"]:
+            head = f"## No commits yet on {d['branch']}"
+        else:
+            head = f"## {d['branch']}"
+        if d["upstream"]:
+            head += f"...{d['upstream']}"
+            if d["ahead"] or d["behind"]:
+                parts = [f"ahead {d['ahead']}"] if d["ahead"] else []
+                parts += [f"behind {d['behind']}"] if d["behind"] else []
+                head += f" [{', '.join(parts)}]"
+        lines.append("\n".join([head, *d["short_status"]]))
+    lines += ["", "Remotes:"]
+    remote_lines = []
+    for name, r in d["remotes"].items():
+        remote_lines.append(f"{name}\t{r['url']} (fetch)")
+        remote_lines.append(f"{name}\t{r.get('pushurl', r['url'])} (push)")
+    lines.append("\n".join(remote_lines) if remote_lines else "(none)")
+    lines += ["", "Object stats:"]
+    o = d["objects"]
+    if o:
+        lines.append(
+            f"count: {o['count']}\nsize: {_human_bytes(o['size'])}\nin-pack: {o['in-pack']}\n"
+            f"packs: {o['packs']}\nsize-pack: {_human_bytes(o['size-pack'])}"
+        )
+    else:
+        lines.append("(unavailable)")
+    overview = "\n".join(lines).strip() + "\n"
+
+    commits = "\n".join(format_commit(c) for c in d["commits"])
+    return overview, commits
+
+
+def local_summary(d):
+    """(branch, status, last commit) values for a Local Repos list row"""
+    if d is None:
+        return ("", "…", "")
+    if d["bare"]:
+        status = "bare"
+    elif d["status_error"]:
+        status = "error"
+    else:
+        c = d["counts"]
+        changed = sum(n for kind, n in c.items() if kind != "untracked")
+        parts = []
+        if changed:
+            parts.append(f"{changed} changed")
+        if c["untracked"]:
+            parts.append(f"{c['untracked']} untracked")
+        status = ", ".join(parts) or "clean"
+    if d["ahead"]:
+        status += f" ↑{d['ahead']}"
+    if d["behind"]:
+        status += f" ↓{d['behind']}"
+    last = d["commits"][0]["date"][:10] if d["commits"] else ""
+    return d["branch"], status, last
@@ -0,0 +1,124 @@
+"""
+Find the git repos below a folder
+"""
+
+import fnmatch
+import os
+import threading
+
+from .gitdir import resolve_git_dirs
+
+# Local repo discovery defaults; both can be overridden in ~/.githelperrc
+# with "scan_depth" and "scan_ignore" (a list of fnmatch patterns).
+DISCOVERY_DEPTH = 3
+DISCOVERY_IGNORE = (
+    "node_modules", ".venv", "venv", "__pycache__", ".tox", ".mypy_cache",
+    ".cache", "build", "dist", "target", "vendor",
+)
+
+
+def scan_dir_for_repo(path, ignore=DISCOVERY_IGNORE):
+    """
+    One os.scandir() pass over path. Returns (kind, subdirs) where kind is
+    "repo" (.git directory), "worktree" (.git file), "bare" or None, and
+    subdirs are the child directories worth descending into.
+    """
+    kind = None
+    markers = set()
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                try:
+                    if name == ".git":
+                        kind = "repo" if entry.is_dir() else "worktree"
+                        continue
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if (name == "HEAD" and not is_dir) or (name in ("objects", "refs") and is_dir):
+                    markers.add(name)
+                if is_dir and not any(fnmatch.fnmatch(name, pat) for pat in ignore):
+                    subdirs.append(entry.path)
+    except OSError:
+        return None, []
+    if kind is None and len(markers) == 3:
+        kind = "bare"
+    return kind, subdirs
+
+
+def discover_repos(base, on_found=None, depth=DISCOVERY_DEPTH, ignore=DISCOVERY_IGNORE,
+                   workers=8, cancel=None):
+    """
+    Walk base up to `depth` levels on a thread pool and return a sorted list
+    of (path, kind) for every repo found. Found repos are not descended into
+    (except base itself); on_found(path, kind) is called from worker threads
+    as each one turns up. Setting the `cancel` Event stops the walk early.
+    """
+    base = os.path.expanduser(str(base))
+    ignore = tuple(ignore)
+    found = []
+    pending = [0]
+    idle = threading.Condition()
+    from concurrent.futures import ThreadPoolExecutor
+    pool = ThreadPoolExecutor(max_workers=workers)
+
+    def submit(path, level):
+        with idle:
+            pending[0] += 1
+        pool.submit(visit, path, level)
+
+    def visit(path, level):
+        # Walk depth-first locally and only hand subdirectories to the pool
+        # while workers are idle; a task per directory costs more than the
+        # scandir itself on a warm cache.
+        stack = [(path, level)]
+        try:
+            while stack and not (cancel is not None and cancel.is_set()):
+                path, level = stack.pop()
+                kind, subdirs = scan_dir_for_repo(path, ignore)
+                if kind is not None:
+                    with idle:
+                        found.append((path, kind))
+                    if on_found is not None:
+                        on_found(path, kind)
+                if (kind is not None and level > 0) or level >= depth:
+                    continue
+                for sub in subdirs:
+                    if pending[0] < workers:
+                        submit(sub, level + 1)
+                    else:
+                        stack.append((sub, level + 1))
+        finally:
+            with idle:
+                pending[0] -= 1
+                if not pending[0]:
+                    idle.notify_all()
+
+    submit(base, 0)
+    with idle:
+        while pending[0]:
+            idle.wait()
+    pool.shutdown()
+    found.sort(key=lambda item: item[0].lower())
+    return found
+
+
+def distinct_repos(repos):
+    """
+    Keep one (path, kind) of discover_repos() output per git dir. Linked
+    worktrees share their main repo's refs and objects, so fetching or
+    counting history once per worktree repeats the same work. The main
+    working copy or bare repo is kept if it was found, otherwise the first
+    worktree.
+    """
+    repos = list(repos)
+    chosen = {}
+    for path, kind in repos:
+        common_dir = resolve_git_dirs(path)[1] or path
+        current = chosen.get(common_dir)
+        if current is None or (current[1] == "worktree" and kind != "worktree"):
+            chosen[common_dir] = (path, kind)
+    kept = set(chosen.values())
+    return [item for item in repos if item in kept]
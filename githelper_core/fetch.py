@@ -0,0 +1,106 @@
+"""
+Parallel `git fetch` over a repo collection with per-host and per-repo limits
+"""
+
+import collections
+import os
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .gitdir import resolve_git_dirs
+from .progress import PROGRESS_RE
+from .supervisor import OperationAborted, Supervisor
+
+
+def remote_host(url):
+    """Host part of a git remote URL ("local" for paths and file:// URLs)"""
+    url = (url or "").strip()
+    if not url or url.startswith(("/", ".", "file:")):
+        return "local"
+    match = re.match(r"^[a-z][a-z0-9+.-]*://(?:[^@/]+@)?(\[[^\]]+\]|[^/:]+)", url, re.I)
+    if match is None:
+        match = re.match(r"^(?:[^@/]+@)?([^/:]+):", url)  # scp-like user@host:path
+    return match.group(1).lower() if match else "local"
+
+
+def fetch_outcome(proc):
+    """(state, message) of a finished `git fetch --progress` CompletedProcess"""
+    lines = [ln for ln in re.split(r"[\r\n]", proc.stderr)
+             if ln.strip() and not PROGRESS_RE.match(ln.strip())]
+    if proc.returncode != 0:
+        return "failed", " ".join(" ".join(lines).split()[-30:]) or f"exit status {proc.returncode}"
+    # Remotes without a fetch refspec (e.g. bare clones) print
+    # "* branch HEAD -> FETCH_HEAD" on every fetch; that updates no ref
+    changed = sum(1 for ln in lines if "->" in ln and ln.rsplit("->", 1)[1].split() != ["FETCH_HEAD"])
+    if changed:
+        return "updated", f"{changed} ref(s) changed"
+    return "up to date", ""
+
+
+def fetch_repos_parallel(repos, on_update=None, workers=8, per_host=4, supervisor=None):
+    """
+    Run `git fetch --all --prune` for every repo on a bounded thread pool,
+    with at most `per_host` fetches talking to the same remote host at once
+    (remotes that are local paths count as one host, "local"). Repos that
+    share a git dir, like linked worktrees, are fetched one at a time, as
+    concurrent fetches would race for the same ref locks.
+    Each fetch runs under supervisor's limits (see Supervisor); once its
+    cancel event is set, repos that haven't started are skipped.
+    on_update(repo, state, info) reports "fetching" and the final state
+    ("updated", "up to date", "failed" or "cancelled") as each repo progresses.
+    Returns {repo: (state, seconds, message)}.
+    """
+    supervisor = supervisor or Supervisor()
+    host_limits = collections.defaultdict(lambda: threading.Semaphore(per_host))
+    git_dir_locks = collections.defaultdict(threading.Lock)
+    limits_lock = threading.Lock()
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0")  # nobody can answer a prompt
+    results = {}
+
+    def fetch_one(repo):
+        urls = subprocess.run(
+            ["git", "-C", str(repo), "config", "--get-regexp", r"^remote\..*\.url$"],
+            capture_output=True, text=True,
+        ).stdout.split()[1::2]
+        hosts = sorted({remote_host(u) for u in urls})
+        # Resolved, so a worktree and its main repo share a lock however
+        # their paths were given
+        common_dir = resolve_git_dirs(repo)[1] or Path(repo).resolve()
+        with limits_lock:
+            git_dir_lock = git_dir_locks[common_dir]
+            semaphores = [host_limits[h] for h in hosts]
+        # Take the git dir first, then hosts in sorted order, so neither a
+        # shared git dir nor a multi-remote repo can deadlock
+        git_dir_lock.acquire()
+        for sem in semaphores:
+            sem.acquire()
+        start = time.monotonic()
+        try:
+            if supervisor.cancel is not None and supervisor.cancel.is_set():
+                raise OperationAborted("cancelled", "cancelled")
+            if on_update:
+                on_update(repo, "fetching", ", ".join(hosts) or "local")
+            # --progress keeps output flowing, which the stall detector needs
+            proc = supervisor.run(
+                ["git", "-C", str(repo), "fetch", "--progress", "--all", "--prune"], env=env,
+            )
+            state, message = fetch_outcome(proc)
+        except OperationAborted as e:
+            state, message = ("cancelled", "") if e.reason == "cancelled" else ("failed", str(e))
+        finally:
+            for sem in reversed(semaphores):
+                sem.release()
+            git_dir_lock.release()
+        elapsed = time.monotonic() - start
+        results[repo] = (state, elapsed, message)
+        if on_update:
+            on_update(repo, state, message)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for future in [pool.submit(fetch_one, repo) for repo in repos]:
+            future.result()
+    return results
@@ -0,0 +1,129 @@
+"""
+Read repo state straight from the git directory, without spawning git
+"""
+
+import os
+from pathlib import Path
+
+
+def resolve_git_dirs(repo):
+    """
+    Return (git_dir, common_dir) for a working copy or bare repo without
+    spawning git. Worktrees and submodules have a `.git` file pointing at
+    their git dir, whose `commondir` file points at the shared refs/objects.
+    Both are absolute and resolved, so they can be compared and used as keys.
+    """
+    repo = Path(repo)
+    dot_git = repo / ".git"
+    if dot_git.is_dir():
+        git_dir = dot_git
+    elif dot_git.is_file():
+        text = dot_git.read_text(encoding="utf-8", errors="replace").strip()
+        git_dir = Path(text.removeprefix("gitdir:").strip())
+        if not git_dir.is_absolute():
+            git_dir = (repo / git_dir).resolve()
+    elif (repo / "HEAD").is_file() and (repo / "objects").is_dir():
+        git_dir = repo  # bare repo
+    else:
+        return None, None
+    git_dir = git_dir.resolve()
+    common_dir = git_dir
+    try:
+        common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+        common_dir = (git_dir / common).resolve()
+    except OSError:
+        pass
+    return git_dir, common_dir
+
+
+def read_head_oid(repo):
+    """Commit id HEAD points at, read from the git dir (None if unborn)"""
+    git_dir, common_dir = resolve_git_dirs(repo)
+    if git_dir is None:
+        return None
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not head.startswith("ref: "):
+        return head or None  # detached
+    ref = head[len("ref: "):]
+    try:
+        return (common_dir / ref).read_text(encoding="utf-8").strip() or None
+    except OSError:
+        pass
+    try:
+        with open(common_dir / "packed-refs", "r", encoding="utf-8") as f:
+            for line in f:
+                oid, _, name = line.rstrip("\n").partition(" ")
+                if name == ref:
+                    return oid
+    except OSError:
+        pass
+    return None
+
+
+def read_ref_tips(repo, refs="HEAD"):
+    """
+    Sorted object ids `git log` starts from for refs "HEAD", "branches"
+    (like --branches) or "all" (like --all, without the stash), read from
+    the git dir without spawning git
+    """
+    if refs == "HEAD":
+        head = read_head_oid(repo)
+        return [head] if head else []
+    _git_dir, common_dir = resolve_git_dirs(repo)
+    if common_dir is None:
+        return []
+    prefix = "refs/heads/" if refs == "branches" else "refs/"
+    tips = {}
+    try:
+        with open(common_dir / "packed-refs", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(("#", "^")):
+                    continue
+                oid, _, name = line.rstrip("\n").partition(" ")
+                if name.startswith(prefix):
+                    tips[name] = oid
+    except OSError:
+        pass
+    for dirpath, _dirs, files in os.walk(common_dir / prefix):
+        for name in files:
+            path = Path(dirpath) / name
+            try:
+                oid = path.read_text(encoding="utf-8").strip()
+            except OSError:
+                continue
+            if not oid.startswith("ref:"):
+                tips[path.relative_to(common_dir).as_posix()] = oid
+    tips.pop("refs/stash", None)
+    oids = set(tips.values())
+    if refs == "all":
+        head = read_head_oid(repo)
+        if head:
+            oids.add(head)
+    return sorted(oids)
+
+
+def local_fingerprint(repo):
+    """
+    Cheap change detector for a local repo: the mtimes of the files git
+    rewrites on commit, checkout, fetch, stage and ref updates. Ref updates
+    rename a lock file into refs/heads etc., which bumps the directory mtime.
+    Returns None if repo is not a git repo.
+    """
+    git_dir, common_dir = resolve_git_dirs(repo)
+    if git_dir is None:
+        return None
+    paths = (
+        git_dir / "HEAD", git_dir / "index", git_dir / "logs" / "HEAD",
+        common_dir / "packed-refs", common_dir / "refs", common_dir / "refs" / "heads",
+        common_dir / "refs" / "tags", common_dir / "FETCH_HEAD",
+    )
+    stamps = []
+    for path in paths:
+        try:
+            stamps.append(str(path.stat().st_mtime_ns))
+        except OSError:
+            stamps.append("-")
+    return ":".join(stamps)
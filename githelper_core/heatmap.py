@@ -0,0 +1,385 @@
+"""
+Commit activity heatmap: aggregation over a repo collection and exports
+"""
+
+import bisect
+import collections
+import csv
+import fnmatch
+import io
+import os
+import subprocess
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from html import escape
+
+from .gitdir import read_ref_tips
+
+HEATMAP_DAYS = 365
+HEATMAP_REFS = (("HEAD", "HEAD"), ("branches", "Local branches"), ("all", "All refs"))
+# Cell colors by activity level, and the upper commit count of each level
+HEATMAP_COLORS = ("#ebedf0", "#c6e48b", "#7bc96f", "#239a3b", "#196127")
+HEATMAP_LEVELS = (0, 5, 10, 15)
+
+
+def heatmap_level(count):
+    """Index into HEATMAP_COLORS for a day with `count` commits"""
+    return bisect.bisect_left(HEATMAP_LEVELS, count)
+
+
+def heatmap_window(days=HEATMAP_DAYS, today=None):
+    """
+    The heatmap grid's days: (first day, number of days, boundaries) where
+    the grid starts on the Sunday on or before `days` ago and boundaries
+    holds the local-midnight epoch of every day plus the day after today,
+    so bisect maps a timestamp straight to a day offset.
+    """
+    today = today or datetime.now().date()
+    start = today - timedelta(days=days - 1)
+    start -= timedelta(days=(start.weekday() + 1) % 7)
+    count = (today - start).days + 1
+    bounds = [
+        int(datetime.combine(start + timedelta(days=i), datetime.min.time()).timestamp())
+        for i in range(count + 1)
+    ]
+    return start, count, bounds
+
+
+class HeatmapJob:
+    """
+    Runs `git log` for many repos on a bounded thread pool. Every log is its
+    own process, so this scales with cores. Per-repo day counts are reported
+    as each repo finishes. cancel() (from any thread) skips queued repos and
+    kills the logs still running.
+
+    Only the window from heatmap_window() is read: git stops at `--since`,
+    prints epoch author times with the (mailmapped) author email, and
+    commits are bucketed per author into day ordinals by bisecting the day
+    boundaries. `refs` picks the starting points
+    ("HEAD", "branches" or "all").
+
+    With a LocalRepoIndex as `cache`, each repo's counts are stored with the
+    ref tips they were counted up to. Unchanged tips cost no git process at
+    all; tips that only moved forward walk just the new commits, and
+    anything else (force push, rewrite, pruned tip) falls back to a full
+    walk of the window.
+    """
+
+    def __init__(self, window, refs="HEAD", workers=None, cache=None):
+        self.start, self.days, self.bounds = window
+        self.since = self.bounds[0]
+        self.refs = refs
+        self.workers = workers or min(32, (os.cpu_count() or 4) * 2)
+        self.cache = cache
+        self.cancel_event = threading.Event()
+        self.stats = collections.Counter()  # cached / incremental / full / failed
+        self._procs = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+        with self._lock:
+            procs = list(self._procs)
+        for proc in procs:
+            proc.kill()
+
+    def _git(self, repo, *args, stdin=None):
+        """Run git in repo as a killable process; returns (returncode, stdout)"""
+        if self.cancelled:
+            return None, ""
+        try:
+            proc = subprocess.Popen(
+                ["git", "-C", str(repo), *args],
+                stdin=subprocess.PIPE if stdin is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+            )
+        except OSError:
+            return None, ""
+        with self._lock:
+            self._procs.add(proc)
+        if self.cancelled:
+            proc.kill()  # cancel() may have run before the process was registered
+        try:
+            out, _ = proc.communicate(stdin)
+        finally:
+            with self._lock:
+                self._procs.discard(proc)
+        return proc.returncode, out
+
+    def _repo_counts(self, repo):
+        """
+        {email: {day ordinal: commits}} for one repo, or None if it failed
+        or was cancelled
+        """
+        tips = read_ref_tips(repo, self.refs)
+        if not tips:
+            return {}
+        first = self.start.toordinal()
+        counts = collections.defaultdict(collections.Counter)
+        revs, kind = tips, "full"
+        cached = self.cache.heatmap_counts(repo, self.refs) if self.cache is not None else None
+        if cached is not None and cached[0] <= self.since:
+            _since, old_tips, old_counts = cached
+            old_counts = {
+                email: {day: n for day, n in days.items() if day >= first}
+                for email, days in old_counts.items()
+            }
+            if old_tips == tips:
+                self._tally("cached")
+                return old_counts
+            # Incremental only if every old tip is still reachable
+            returncode, out = self._git(
+                repo, "rev-list", "--count", "--stdin",
+                stdin="".join(f"{oid}\n" for oid in old_tips) + "".join(f"^{oid}\n" for oid in tips),
+            )
+            if returncode == 0 and out.strip() == "0":
+                for email, days in old_counts.items():
+                    counts[email].update(days)
+                revs, kind = tips + [f"^{oid}" for oid in old_tips], "incremental"
+
+        returncode, out = self._git(
+            repo, "log", f"--since=@{self.since}", "--format=%at %aE", "--stdin",
+            stdin="".join(f"{rev}\n" for rev in revs),
+        )
+        if returncode != 0 or self.cancelled:
+            if not self.cancelled:
+                self._tally("failed")
+            return None
+        bounds, days = self.bounds, self.days
+        for line in out.splitlines():
+            stamp, _, email = line.partition(" ")
+            offset = bisect.bisect_right(bounds, int(stamp)) - 1
+            if 0 <= offset < days:
+                counts[email.strip().lower()][first + offset] += 1
+        counts = {email: dict(days) for email, days in counts.items()}
+        if self.cache is not None:
+            self.cache.store_heatmap_counts(repo, self.refs, self.since, tips, counts)
+        self._tally(kind)
+        return counts
+
+    def _tally(self, kind):
+        with self._lock:
+            self.stats[kind] += 1
+
+    def run(self, repos, on_result):
+        """
+        Call on_result(repo, counts) as each repo finishes (counts is None for
+        failed repos). Returns how many repos finished before a cancel.
+        """
+        finished = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._repo_counts, repo): repo for repo in repos}
+            for future in as_completed(futures):
+                if self.cancelled:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                finished += 1
+                on_result(futures[future], future.result())
+        return finished
+
+
+def author_matcher(patterns=None):
+    """
+    email -> bool for comma-separated emails or fnmatch patterns (matched
+    case-insensitively); everything matches when patterns is empty
+    """
+    if isinstance(patterns, str):
+        patterns = patterns.split(",")
+    pats = [p.strip().lower() for p in patterns or () if p.strip()]
+    if not pats:
+        return lambda _email: True
+    return lambda email: any(fnmatch.fnmatchcase(email, pat) for pat in pats)
+
+
+class HeatmapData:
+    """
+    Commit counts of one heatmap run, indexed by day, repo and author.
+
+    `grid[offset * len(repos) + repo_id]` and `totals[offset]` (offsets are
+    days since `start`) only sum the authors that `match` selects. The
+    per-author cells behind them keep everything, so select() can switch
+    the author filter without reading history again.
+    """
+
+    def __init__(self, repos, window, match=None):
+        self.repos = list(repos)  # display names, indexed by repo id
+        self.start, self.days, _bounds = window
+        self.match = match or (lambda _email: True)
+        self.grid = array("I", [0]) * (self.days * len(self.repos))
+        self.totals = array("I", [0]) * self.days
+        self.authors = []  # emails, indexed by author id
+        self.author_totals = []
+        self.selected = set()  # author ids the grid currently sums
+        self._author_ids = {}
+        self._cells = []  # per author: {grid index: commits}
+
+    def date(self, offset):
+        return self.start + timedelta(days=offset)
+
+    def _author_id(self, email):
+        author = self._author_ids.get(email)
+        if author is None:
+            author = len(self.authors)
+            self._author_ids[email] = author
+            self.authors.append(email)
+            self.author_totals.append(0)
+            self._cells.append({})
+            if self.match(email):
+                self.selected.add(author)
+        return author
+
+    def merge(self, repo_id, counts):
+        """Fold one repo's {email: {day ordinal: commits}} from HeatmapJob in"""
+        first = self.start.toordinal()
+        stride = len(self.repos)
+        for email, days in (counts or {}).items():
+            author = self._author_id(email)
+            cells = self._cells[author]
+            selected = author in self.selected
+            for day, count in days.items():
+                offset = day - first
+                if not 0 <= offset < self.days:
+                    continue
+                idx = offset * stride + repo_id
+                cells[idx] = cells.get(idx, 0) + count
+                self.author_totals[author] += count
+                if selected:
+                    self.grid[idx] += count
+                    self.totals[offset] += count
+
+    def select(self, match):
+        """Switch the author filter and rebuild grid/totals from memory"""
+        self.match = match
+        self.selected = {a for a, email in enumerate(self.authors) if match(email)}
+        stride = len(self.repos)
+        grid = array("I", [0]) * len(self.grid)
+        totals = array("I", [0]) * self.days
+        for author in self.selected:
+            for idx, count in self._cells[author].items():
+                grid[idx] += count
+                totals[idx // stride] += count
+        self.grid, self.totals = grid, totals
+
+    def day_repos(self, offset):
+        """{repo name: commits} on one day"""
+        stride = len(self.repos)
+        row = self.grid[offset * stride:(offset + 1) * stride]
+        return {self.repos[i]: count for i, count in enumerate(row) if count}
+
+    def day_authors(self, offset):
+        """Counter of selected author emails on one day"""
+        stride = len(self.repos)
+        by_author = collections.Counter()
+        for author in self.selected:
+            for idx, count in self._cells[author].items():
+                if idx // stride == offset:
+                    by_author[self.authors[author]] += count
+        return by_author
+
+    def repo_totals(self):
+        """{repo name: commits} over the whole window"""
+        stride = len(self.repos)
+        totals = [0] * stride
+        for idx, count in enumerate(self.grid):
+            if count:
+                totals[idx % stride] += count
+        return {self.repos[i]: n for i, n in enumerate(totals) if n}
+
+    def top_authors(self, limit=50):
+        """[(email, commits)] of the most active authors, selected or not"""
+        ranked = sorted(range(len(self.authors)), key=lambda a: self.author_totals[a], reverse=True)
+        return [(self.authors[a], self.author_totals[a]) for a in ranked[:limit]]
+
+
+def collect_heatmap(repos, names, window, refs="HEAD", match=None, cache=None,
+                    on_progress=None, workers=None):
+    """
+    One pass over `repos` (display `names`) into a HeatmapData, reusing
+    cached counts from `cache` (a LocalRepoIndex). Returns (data, job).
+    """
+    data = HeatmapData(names, window, match)
+    job = HeatmapJob(window, refs=refs, workers=workers, cache=cache)
+    repo_ids = {repo: i for i, repo in enumerate(repos)}
+    lock = threading.Lock()
+
+    def merge(repo, counts):
+        with lock:
+            data.merge(repo_ids[repo], counts)
+        if on_progress is not None:
+            on_progress(repo, counts)
+
+    job.run(repos, merge)
+    return data, job
+
+
+def heatmap_to_json(data):
+    """Report dict: window, per-day totals with repo breakdowns, repo and author totals"""
+    days = []
+    for offset in range(data.days):
+        if data.totals[offset]:
+            days.append({
+                "date": data.date(offset).isoformat(),
+                "commits": data.totals[offset],
+                "repos": data.day_repos(offset),
+            })
+    return {
+        "start": data.start.isoformat(),
+        "end": data.date(data.days - 1).isoformat(),
+        "commits": sum(data.totals),
+        "days": days,
+        "repos": data.repo_totals(),
+        "authors": {
+            data.authors[a]: data.author_totals[a]
+            for a in sorted(data.selected, key=lambda a: data.author_totals[a], reverse=True)
+        },
+    }
+
+
+def heatmap_to_csv(data):
+    """date,repo,commits rows for every non-empty day x repo cell"""
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(("date", "repo", "commits"))
+    for offset in range(data.days):
+        if not data.totals[offset]:
+            continue
+        day = data.date(offset).isoformat()
+        for repo, count in sorted(data.day_repos(offset).items()):
+            writer.writerow((day, repo, count))
+    return out.getvalue()
+
+
+def heatmap_to_svg(data, cell=11, gap=2):
+    """The heatmap grid as a standalone SVG, one column per week"""
+    left, top = 30, 16
+    step = cell + gap
+    weeks = (data.days + 6) // 7
+    width, height = left + weeks * step, top + 7 * step
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="sans-serif" font-size="9" fill="#196127">'
+    ]
+    for row, label in ((1, "Mon"), (3, "Wed"), (5, "Fri")):
+        parts.append(f'<text x="{left - 4}" y="{top + row * step + cell - 2}" text-anchor="end">{label}</text>')
+    last_month = None
+    for offset in range(data.days):
+        col, row = divmod(offset, 7)
+        day = data.date(offset)
+        if row == 0 and day.month != last_month:
+            parts.append(f'<text x="{left + col * step}" y="{top - 5}">{day.strftime("%b")}</text>')
+            last_month = day.month
+        count = data.totals[offset]
+        parts.append(
+            f'<rect x="{left + col * step}" y="{top + row * step}" width="{cell}" height="{cell}" '
+            f'fill="{HEATMAP_COLORS[heatmap_level(count)]}">'
+            f'<title>{escape(day.isoformat())}: {count} commits</title></rect>'
+        )
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
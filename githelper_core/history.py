@@ -0,0 +1,101 @@
+"""
+Commit history read a page at a time
+"""
+
+import subprocess
+import threading
+
+HISTORY_PAGE = 100  # commits per page; details views come with the first one
+
+# Full hash (the tip the pages are pinned to), short hash, date, author,
+# subject and decorations, NUL-separated, one record per commit
+LOG_FORMAT = "%H%x00%h%x00%ci%x00%an%x00%s%x00%D%x1e"
+LOG_FIELDS = ("oid", "hash", "date", "author", "subject", "refs")
+
+
+def log_args(tip=None, skip=0, count=HISTORY_PAGE, merges=False):
+    """`git log` arguments for `count` commits below tip (default HEAD) after `skip`"""
+    args = ["log", f"--format={LOG_FORMAT}", f"--max-count={count}"]
+    if skip:
+        args.append(f"--skip={skip}")
+    if merges:
+        args.append("--merges")
+    return [*args, tip or "HEAD", "--"]
+
+
+def parse_log(stdout):
+    """Commits (dicts with LOG_FIELDS) from `git log --format=LOG_FORMAT` output"""
+    commits = []
+    for record in stdout.split("\x1e"):
+        parts = record.strip("\n").split("\0")
+        if len(parts) == len(LOG_FIELDS):
+            commits.append(dict(zip(LOG_FIELDS, parts)))
+    return commits
+
+
+def format_commit(c):
+    """One history line, like `git log --oneline --decorate`"""
+    return f"{c['hash']} ({c['refs']}) {c['subject']}" if c["refs"] else f"{c['hash']} {c['subject']}"
+
+
+def local_log_page(repo, tip=None, skip=0, count=HISTORY_PAGE, merges=False):
+    """One page of a local repo's history ([] for a repo without commits)"""
+    proc = subprocess.run(["git", "-C", str(repo), *log_args(tip, skip, count, merges)],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        if "does not have any commits" in proc.stderr or "unknown revision" in proc.stderr:
+            return []
+        raise subprocess.CalledProcessError(proc.returncode, proc.args, stderr=proc.stderr)
+    return parse_log(proc.stdout)
+
+
+class CommitPager:
+    """
+    The loaded part of one repo's history, extended a page at a time.
+
+    Pages are read with --skip below a tip commit pinned when the first page
+    was read, so they line up even if the branch moves in between, and each
+    page is fetched once. fetch_page(tip, skip, count) returns a page of
+    commits (see parse_log); it runs on a worker thread, everything else on
+    the caller's (Tk) thread:
+
+        skip = pager.claim()            # None: loading or complete
+        page = pager.fetch(skip)        # worker thread
+        pager.add_page(skip, page)
+    """
+
+    def __init__(self, fetch_page, commits=(), tip=None, page_size=HISTORY_PAGE):
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.commits = list(commits)
+        self.tip = tip
+        self.more = len(self.commits) >= page_size
+        self.loading = False
+        self.error = None
+        self._lock = threading.Lock()
+
+    def claim(self):
+        """Reserve the next page; returns its skip, or None if there is nothing to load"""
+        with self._lock:
+            if self.loading or not self.more:
+                return None
+            self.loading = True
+            return len(self.commits)
+
+    def fetch(self, skip):
+        return self.fetch_page(self.tip, skip, self.page_size)
+
+    def add_page(self, skip, page):
+        with self._lock:
+            self.loading = False
+            if skip != len(self.commits):
+                return  # already have it
+            self.commits.extend(page)
+            self.more = len(page) >= self.page_size
+
+    def failed(self, error):
+        """Stop paging after an error; the loaded commits stay"""
+        with self._lock:
+            self.loading = False
+            self.more = False
+            self.error = error
@@ -0,0 +1,125 @@
+"""
+Persistent SQLite index of local repos and their cached heatmap counts
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+LOCAL_INDEX_PATH = Path.home() / ".cache" / "githelper" / "index.sqlite3"
+
+
+class LocalRepoIndex:
+    """
+    SQLite index of discovered local repos: kind, fingerprint (see
+    local_fingerprint) and the collect_local_details() output it was taken
+    at, so rescans only re-query repos that changed and startup can show
+    the last known state without running git. Also keeps each repo's
+    heatmap day counts per author with the ref tips and window start they
+    cover.
+    """
+
+    # Bump when a table's contents change shape. Only the derived heatmap
+    # tables are dropped on upgrade; they refill on the next heatmap run.
+    SCHEMA_VERSION = 2
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS repos ("
+        " path TEXT PRIMARY KEY, base TEXT NOT NULL, kind TEXT NOT NULL,"
+        " fingerprint TEXT, details TEXT, updated REAL);"
+        "CREATE INDEX IF NOT EXISTS repos_base ON repos (base);"
+        "CREATE TABLE IF NOT EXISTS heatmap_days ("
+        " path TEXT NOT NULL, refs TEXT NOT NULL, since INTEGER NOT NULL,"
+        " tips TEXT NOT NULL, counts TEXT NOT NULL, PRIMARY KEY (path, refs));"
+    )
+
+    def __init__(self, path=LOCAL_INDEX_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;")
+            self._migrate()
+        except (OSError, sqlite3.Error):
+            # The index is an optimization; fall back to a throwaway one
+            self._db = sqlite3.connect(":memory:", check_same_thread=False)
+            self._migrate()
+
+    def _migrate(self):
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            self._db.executescript("DROP TABLE IF EXISTS heatmap; DROP TABLE IF EXISTS heatmap_days;")
+        self._db.executescript(self.SCHEMA)
+        self._db.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def repos(self, base):
+        """[(path, kind, details or None)] last recorded under base"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT path, kind, details FROM repos WHERE base = ?", (str(base),)
+            ).fetchall()
+        return [(path, kind, json.loads(details) if details else None) for path, kind, details in rows]
+
+    def get(self, path):
+        """Return (fingerprint, details) for path, or (None, None)"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fingerprint, details FROM repos WHERE path = ?", (str(path),)
+            ).fetchone()
+        if not row or not row[1]:
+            return None, None
+        return row[0], json.loads(row[1])
+
+    def store(self, base, path, kind, fingerprint, details):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?, ?, ?)",
+                (str(path), str(base), kind, fingerprint, json.dumps(details), time.time()),
+            )
+            self._db.commit()
+
+    def retain(self, base, paths):
+        """Forget repos under base that a scan no longer finds"""
+        keep = set(map(str, paths))
+        with self._lock:
+            gone = [
+                (path,) for (path,) in self._db.execute(
+                    "SELECT path FROM repos WHERE base = ?", (str(base),)
+                ) if path not in keep
+            ]
+            self._db.executemany("DELETE FROM repos WHERE path = ?", gone)
+            self._db.executemany("DELETE FROM heatmap_days WHERE path = ?", gone)
+            self._db.commit()
+        return len(gone)
+
+    def heatmap_counts(self, path, refs):
+        """
+        Return (since, tips, {email: {day ordinal: commits}}) for path and a
+        ref selection, or None
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT since, tips, counts FROM heatmap_days WHERE path = ? AND refs = ?",
+                (str(path), refs),
+            ).fetchone()
+        if not row:
+            return None
+        counts = {
+            email: {int(day): n for day, n in days.items()}
+            for email, days in json.loads(row[2]).items()
+        }
+        return row[0], json.loads(row[1]), counts
+
+    def store_heatmap_counts(self, path, refs, since, tips, counts):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO heatmap_days VALUES (?, ?, ?, ?, ?)",
+                (str(path), refs, since, json.dumps(tips), json.dumps(counts)),
+            )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
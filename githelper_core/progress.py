@@ -0,0 +1,101 @@
+"""
+Live git --progress parsing with phase timing and ETA
+"""
+
+import re
+import subprocess
+import time
+from collections import deque
+
+# Matches git's --progress lines, e.g.
+# "Receiving objects:  45% (450/1000), 1.20 MiB | 2.00 MiB/s"
+PROGRESS_RE = re.compile(
+    r"^(?:remote: )?(?P<phase>[A-Za-z ]+):\s+(?P<pct>\d+)% \((?P<done>\d+)/(?P<total>\d+)\)"
+    r"(?:, (?P<size>[\d.]+ \w+)(?: \| (?P<rate>[\d.]+ \w+/s))?)?")
+
+
+class GitProgress:
+    """
+    Turns git --progress lines into "phase pct (done/total), size @ rate, ETA"
+    summaries, timing each phase to estimate the time left.
+    """
+
+    def __init__(self):
+        self.phase = None
+        self.phase_start = 0.0
+
+    def summarize(self, line):
+        match = PROGRESS_RE.match(line.strip())
+        if not match:
+            return line.strip()
+        now = time.monotonic()
+        if match["phase"] != self.phase:
+            self.phase, self.phase_start = match["phase"], now
+        pct = int(match["pct"])
+        text = f"{match['phase']}: {pct}% ({match['done']}/{match['total']})"
+        if match["size"]:
+            text += f", {match['size']}"
+        if match["rate"]:
+            text += f" @ {match['rate']}"
+        elapsed = now - self.phase_start
+        if 0 < pct < 100 and elapsed > 1:
+            text += f", ETA {elapsed * (100 - pct) / pct:.0f}s"
+        return text
+
+
+class LineSplitter:
+    """
+    Splits a byte stream into (line, final) pairs: final is False for lines
+    ended by \\r, which git rewrites in place, and True for lines ended by \\n.
+    Blank lines are dropped.
+    """
+
+    def __init__(self):
+        self.pending = b""
+
+    def feed(self, chunk):
+        self.pending += chunk
+        parts = re.split(rb"([\r\n])", self.pending)
+        self.pending = parts.pop()
+        return [(text.decode(errors="replace"), sep == b"\n")
+                for text, sep in zip(parts[::2], parts[1::2]) if text.strip()]
+
+    def flush(self):
+        """The unterminated rest of the stream, as a final line"""
+        rest, self.pending = self.pending, b""
+        return [(rest.decode(errors="replace"), True)] if rest.strip() else []
+
+
+def run_with_progress(cmd, on_progress=None, env=None, cwd=None, supervisor=None):
+    """
+    Run a git command with --progress, calling on_progress(text, final) per
+    update: final is False for in-place (\\r) updates, True for finished lines.
+    The command runs under supervisor's limits (see Supervisor), where every
+    progress update counts as output. Raises CalledProcessError carrying
+    the tail of stderr, or OperationAborted.
+    """
+    from .supervisor import Supervisor
+    progress = GitProgress()
+    tail = deque(maxlen=20)
+    proc = (supervisor or Supervisor()).popen(cmd, stdout=subprocess.DEVNULL,
+                                              stderr=subprocess.PIPE, env=env, cwd=cwd)
+    with proc:
+        _read_progress(proc, progress, tail, on_progress)
+    proc.check()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr="\n".join(tail))
+    return proc.returncode
+
+
+def _read_progress(proc, progress, tail, on_progress):
+    splitter = LineSplitter()
+    while True:
+        chunk = proc.stderr.read1(4096)
+        proc.touch()
+        for line, final in splitter.feed(chunk) if chunk else splitter.flush():
+            if final:
+                tail.append(line)
+            if on_progress:
+                on_progress(progress.summarize(line), final)
+        if not chunk:
+            break
@@ -0,0 +1,201 @@
+"""
+Shared (multiplexed) ssh master connections
+"""
+
+import os
+import shlex
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+SSH_CONTROL_PERSIST = 600  # seconds an idle master connection stays open
+SSH_CONTROL_DIR = Path.home() / ".cache" / "githelper" / "ssh"
+SSH_CONNECT_TIMEOUT = 15  # seconds to wait for an unreachable host
+
+
+class SSHConnectionPool:
+    """
+    Keeps one multiplexed ssh master connection per (user, server, port).
+
+    Every command routed through the pool rides the master's control socket,
+    so only the first call to a host pays for the TCP + auth handshake.
+    Sockets live in a private temporary directory unless control_dir is
+    given; with a fixed control_dir a master left open by an earlier process
+    is picked up too, and keep_open leaves masters running on close_all()
+    so later processes can reuse them until `persist` runs out.
+    """
+
+    def __init__(self, persist=SSH_CONTROL_PERSIST, control_dir=None, keep_open=False):
+        self.persist = persist
+        self.keep_open = keep_open
+        # Windows OpenSSH has no ControlMaster support
+        self.enabled = os.name != "nt"
+        self._lock = threading.Lock()
+        self._fixed_dir = control_dir is not None
+        self._control_dir = Path(control_dir) if control_dir is not None else None
+        self._masters = {}  # {(user, server, port): info dict or None}
+        self._opening = {}  # {(user, server, port): lock held while its master opens}
+
+    def _control_path(self, key):
+        import hashlib
+        import tempfile
+        if self._control_dir is None:
+            self._control_dir = Path(tempfile.mkdtemp(prefix="githelper-ssh-"))
+        elif self._fixed_dir:
+            self._control_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        digest = hashlib.sha1("@".join(key).encode()).hexdigest()[:16]
+        return str(self._control_dir / digest)
+
+    def _adopt_master(self, user, server, port, path):
+        """Info for a master an earlier process left on path, or None"""
+        check = subprocess.run(
+            ["ssh", "-o", f"ControlPath={path}", "-O", "check", "-p", port, f"{user}@{server}"],
+            capture_output=True, text=True,
+        )
+        if check.returncode != 0:
+            return None
+        try:
+            handshake = float(Path(f"{path}.handshake").read_text())
+        except (OSError, ValueError):
+            handshake = 0.0
+        return {"path": path, "handshake": handshake, "ops": 1, "inherited": True}
+
+    def _ensure_master(self, user, server, port):
+        """Return (info, reused) for a live master, opening it if needed"""
+        import tempfile
+        key = (user, server, str(port))
+
+        def known():
+            info = self._masters.get(key)
+            if key in self._masters and info is None:
+                return None, False  # sharing failed before; use plain ssh
+            if info is not None and os.path.exists(info["path"]):
+                info["ops"] += 1
+                return info, True
+            return None
+
+        with self._lock:
+            found = known()
+            if found is not None:
+                return found
+            opening = self._opening.setdefault(key, threading.Lock())
+        # The handshake runs under this host's lock only, so a slow or
+        # unreachable host doesn't hold up commands for any other one
+        with opening:
+            with self._lock:
+                found = known()  # another thread may have opened it meanwhile
+                if found is not None:
+                    return found
+                path = self._control_path(key)
+            if self._fixed_dir:
+                info = self._adopt_master(user, server, key[2], path)
+                if info is not None:
+                    with self._lock:
+                        self._masters[key] = info
+                    return info, True
+            cmd = [
+                "ssh", "-p", str(port),
+                "-o", "ControlMaster=yes",
+                "-o", f"ControlPath={path}",
+                "-o", f"ControlPersist={self.persist}",
+                "-o", f"ConnectTimeout={SSH_CONNECT_TIMEOUT}",
+                "-N", "-f", f"{user}@{server}",
+            ]
+            start = time.perf_counter()
+            # The backgrounded master inherits stderr, so it cannot be a pipe
+            with tempfile.TemporaryFile() as err:
+                proc = subprocess.run(
+                    cmd, stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL, stderr=err,
+                )
+            if proc.returncode != 0:
+                with self._lock:
+                    self._masters[key] = None
+                return None, False
+            info = {
+                "path": path,
+                "handshake": time.perf_counter() - start,
+                "ops": 1,
+                "inherited": False,
+            }
+            if self._fixed_dir:
+                try:
+                    Path(f"{path}.handshake").write_text(f"{info['handshake']:.3f}")
+                except OSError:
+                    pass
+            with self._lock:
+                self._masters[key] = info
+            return info, False
+
+    def ssh_options(self, user, server, port):
+        """
+        Return (options, note): ssh options that route a command through the
+        shared master, and a short human-readable latency note for the log.
+        """
+        if not self.enabled:
+            return [], ""
+        info, reused = self._ensure_master(user, server, port)
+        if info is None:
+            return [], f"[ssh] {user}@{server}:{port}: connection sharing unavailable"
+        opts = ["-o", "ControlMaster=no", "-o", f"ControlPath={info['path']}"]
+        if reused:
+            note = (f"[ssh] {user}@{server}:{port}: reused connection "
+                    f"(~{info['handshake']:.2f}s handshake saved)")
+        else:
+            note = f"[ssh] {user}@{server}:{port}: connected in {info['handshake']:.2f}s"
+        return opts, note
+
+    def ssh_argv(self, user, server, port, command_text):
+        """Return (argv, note) running command_text on the remote host"""
+        opts, note = self.ssh_options(user, server, port)
+        return ["ssh", "-p", str(port), *opts, f"{user}@{server}", command_text], note
+
+    def run(self, user, server, port, command_text, **kwargs):
+        """Run command_text on the remote host; returns (CompletedProcess, note)"""
+        cmd, note = self.ssh_argv(user, server, port, command_text)
+        return subprocess.run(cmd, **kwargs), note
+
+    def popen(self, user, server, port, command_text, **kwargs):
+        """Start command_text on the remote host; returns (Popen, note)"""
+        cmd, note = self.ssh_argv(user, server, port, command_text)
+        return subprocess.Popen(cmd, **kwargs), note
+
+    def git_env(self, user, server, port):
+        """Return (env, note) so git's own ssh transport shares the master"""
+        opts, note = self.ssh_options(user, server, port)
+        env = dict(os.environ)
+        if opts:
+            env["GIT_SSH_COMMAND"] = "ssh " + " ".join(shlex.quote(o) for o in opts)
+        return env, note
+
+    def saved_seconds(self):
+        """Total handshake time avoided by reusing masters so far"""
+        with self._lock:
+            return sum(
+                info["handshake"] * (info["ops"] if info["inherited"] else info["ops"] - 1)
+                for info in self._masters.values() if info
+            )
+
+    def close_all(self):
+        """
+        Tear down the master connections this pool opened and remove the
+        temporary socket dir. Masters adopted from an earlier process, and
+        all of them with keep_open, are left for later processes.
+        """
+        with self._lock:
+            for (user, server, port), info in self._masters.items():
+                if info is None or info["inherited"] or self.keep_open:
+                    continue
+                subprocess.run(
+                    ["ssh", "-o", f"ControlPath={info['path']}", "-O", "exit",
+                     "-p", port, f"{user}@{server}"],
+                    capture_output=True, text=True, timeout=10,
+                )
+                if self._fixed_dir:
+                    Path(f"{info['path']}.handshake").unlink(missing_ok=True)
+            self._masters.clear()
+            if self._control_dir is not None and not self._fixed_dir:
+                import shutil
+                shutil.rmtree(self._control_dir, ignore_errors=True)
+                self._control_dir = None
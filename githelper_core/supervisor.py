@@ -0,0 +1,160 @@
+"""
+Supervised subprocesses: cancellation, time limits and stall detection
+"""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+
+# Seconds a whole operation may take (None: no limit)
+OPERATION_TIMEOUTS = {"clone": 3600, "fetch": 600, "pull": 600, "archive": 3600}
+# Seconds without any output before an operation counts as stalled
+STALL_TIMEOUT = 120
+# Seconds a process gets to exit after SIGTERM before it is killed
+KILL_GRACE = 5
+
+
+class OperationAborted(RuntimeError):
+    """A supervised process was stopped; reason is "cancelled", "timeout" or "stalled" """
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+class Supervisor:
+    """
+    Limits for the processes it starts: each one is stopped when `cancel`
+    (a threading.Event) is set, after `timeout` seconds, or when it has
+    produced no output for `stall` seconds. None or 0 disables a limit.
+
+    Processes run in their own process group, so stopping one also stops
+    the ssh or helper processes git started. A Supervisor can start any
+    number of processes, also from several threads.
+    """
+
+    def __init__(self, timeout=None, stall=None, cancel=None):
+        self.timeout = timeout or None
+        self.stall = stall or None
+        self.cancel = cancel
+
+    def popen(self, cmd, **kwargs):
+        """
+        Start cmd like subprocess.Popen. Call touch() on the result whenever
+        output arrives and check() once it has exited.
+        """
+        if self.cancel is not None and self.cancel.is_set():
+            raise OperationAborted("cancelled", "cancelled")
+        if os.name != "nt":
+            kwargs.setdefault("start_new_session", True)
+        return SupervisedProcess(self, cmd, **kwargs)
+
+    def run(self, cmd, check=False, on_output=None, **kwargs):
+        """
+        subprocess.run(cmd, capture_output=True, text=True) under these
+        limits; any output on stdout or stderr counts as progress. With
+        on_output, every output line is also passed to on_output(line, final)
+        as it arrives (see LineSplitter), from a reader thread.
+        """
+        with self.popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs) as proc:
+            out, err = [], []
+            readers = [
+                threading.Thread(target=proc.drain, args=(proc.stdout, out, on_output), daemon=True),
+                threading.Thread(target=proc.drain, args=(proc.stderr, err, on_output), daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
+            for reader in readers:
+                reader.join()
+            proc.wait()
+        proc.check()
+        stdout = b"".join(out).decode(errors="replace")
+        stderr = b"".join(err).decode(errors="replace")
+        if check and proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stdout, stderr)
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+class SupervisedProcess(subprocess.Popen):
+    """A Popen watched by a thread that enforces its Supervisor's limits"""
+
+    def __init__(self, supervisor, cmd, **kwargs):
+        super().__init__(cmd, **kwargs)
+        self.supervisor = supervisor
+        self.reason = None
+        self.started = self.last_output = time.monotonic()
+        self._watcher = threading.Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+
+    def touch(self):
+        """Record that output arrived"""
+        self.last_output = time.monotonic()
+
+    def drain(self, stream, chunks, on_output=None):
+        """
+        Read stream to EOF into chunks, touching as data arrives and passing
+        each line to on_output(line, final) if given
+        """
+        from .progress import LineSplitter
+        splitter = LineSplitter()
+        while True:
+            chunk = stream.read1(65536)
+            if on_output:
+                for line, final in splitter.feed(chunk) if chunk else splitter.flush():
+                    on_output(line, final)
+            if not chunk:
+                return
+            self.touch()
+            chunks.append(chunk)
+
+    def check(self):
+        """Raise OperationAborted if the process was stopped"""
+        limits = self.supervisor
+        if self.reason == "cancelled":
+            raise OperationAborted("cancelled", "cancelled")
+        if self.reason == "timeout":
+            raise OperationAborted("timeout", f"timed out after {limits.timeout:g}s")
+        if self.reason == "stalled":
+            raise OperationAborted("stalled", f"stalled: no progress for {limits.stall:g}s")
+
+    def stop(self, reason):
+        """Terminate the process group, and kill it if it outlives KILL_GRACE"""
+        if self.reason is None:
+            self.reason = reason
+        if self.poll() is not None:
+            return
+        self._signal(kill=False)
+        try:
+            self.wait(KILL_GRACE)
+        except subprocess.TimeoutExpired:
+            self._signal(kill=True)
+
+    def _signal(self, kill):
+        try:
+            if os.name == "nt":
+                self.kill() if kill else self.terminate()
+            else:
+                os.killpg(self.pid, signal.SIGKILL if kill else signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _watch(self):
+        limits = self.supervisor
+        while self.poll() is None:
+            now = time.monotonic()
+            if limits.cancel is not None and limits.cancel.is_set():
+                self.stop("cancelled")
+            elif limits.timeout and now - self.started > limits.timeout:
+                self.stop("timeout")
+            elif limits.stall and now - self.last_output > limits.stall:
+                self.stop("stalled")
+            else:
+                time.sleep(0.2)
+
+    def __exit__(self, exc_type, exc, tb):
+        # Don't leave the process running behind an exception (e.g. Ctrl-C)
+        if exc_type is not None:
+            self.stop("cancelled")
+        return super().__exit__(exc_type, exc, tb)
@@ -0,0 +1,206 @@
+"""
+Background task scheduler with per-resource limits, cancellation and
+latest-wins coalescing
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class Task:
+    """
+    One unit of background work. `resources` are (kind, name) keys the task
+    holds while it runs; the scheduler's per-kind limits decide how many
+    tasks may hold the same key at once. cancel() sets cancel_event and runs
+    the hooks registered with on_cancel(), so the work can stop early.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, label, fn, resources=(), key=None, on_done=None):
+        self.id = next(self._ids)
+        self.label = label
+        self.fn = fn
+        self.resources = tuple(resources)
+        self.key = key
+        self.on_done = on_done
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self.created = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.cancel_event = threading.Event()
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def on_cancel(self, hook):
+        """Call hook() when the task is cancelled (right away if it already is)"""
+        with self._lock:
+            if not self.cancel_event.is_set():
+                self._hooks.append(hook)
+                return
+        hook()
+
+    def cancel(self):
+        with self._lock:
+            if self.cancel_event.is_set():
+                return
+            self.cancel_event.set()
+            hooks, self._hooks = self._hooks, []
+        for hook in hooks:
+            hook()
+
+    def elapsed(self):
+        """Seconds spent running (or waiting, while still queued)"""
+        if self.started is None:
+            return time.monotonic() - self.created
+        return (self.finished or time.monotonic()) - self.started
+
+
+class TaskScheduler:
+    """
+    Runs submitted tasks on worker threads, at most `workers` at a time.
+
+    A queued task starts once every resource it names is below its kind's
+    limit (`limits`, e.g. {"ssh": 4, "repo": 1}; kinds without a limit are
+    unbounded). Tasks start in submission order per resource: a task that
+    is waiting for a key keeps later tasks naming the same key from
+    overtaking it, while unrelated tasks run in parallel. Submitting a task
+    with a `key` cancels the queued and running tasks with the same key
+    (latest wins), so stale refreshes are dropped instead of piling up.
+
+    on_change() is called from any thread whenever a task changes state;
+    each task's on_done(task) is called from its worker thread once it is
+    done, failed or cancelled.
+    """
+
+    def __init__(self, workers=8, limits=None, on_change=None, history=50):
+        self.workers = workers
+        self.limits = dict(limits or {})
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._queue = []
+        self._running = []
+        self._finished = deque(maxlen=history)
+        self._held = {}  # {resource: tasks holding it}
+
+    def submit(self, label, fn, resources=(), key=None, on_done=None):
+        """Queue fn(task) and return its Task"""
+        task = Task(label, fn, resources, key, on_done)
+        stale = []
+        with self._lock:
+            if key is not None:
+                stale = [t for t in self._queue + self._running if t.key == key]
+            self._queue.append(task)
+        for old in stale:
+            self.cancel(old)
+        self._dispatch()
+        return task
+
+    def cancel(self, task):
+        """Cancel a task: a queued one never starts, a running one is told to stop"""
+        with self._lock:
+            queued = task in self._queue
+            if queued:
+                self._queue.remove(task)
+                task.state = CANCELLED
+                task.finished = time.monotonic()
+                self._finished.append(task)
+        task.cancel()
+        if queued:
+            self._notify_done(task)
+        self._changed()
+        self._dispatch()
+
+    def cancel_all(self):
+        with self._lock:
+            tasks = self._queue + self._running
+        for task in tasks:
+            self.cancel(task)
+
+    def tasks(self):
+        """Running, queued and recently finished tasks, in that order"""
+        with self._lock:
+            return self._running + self._queue + list(reversed(self._finished))
+
+    def active(self):
+        with self._lock:
+            return len(self._running) + len(self._queue)
+
+    def clear_finished(self):
+        with self._lock:
+            self._finished.clear()
+        self._changed()
+
+    def waiting_on(self, task):
+        """The resources that keep a queued task from starting"""
+        with self._lock:
+            earlier = self._queue[:self._queue.index(task)] if task in self._queue else []
+            claimed = {r for t in earlier if not t.cancelled for r in t.resources}
+            return [r for r in task.resources if r in claimed or not self._available(r)]
+
+    def _available(self, resource):
+        limit = self.limits.get(resource[0])
+        return limit is None or len(self._held.get(resource, ())) < limit
+
+    def _dispatch(self):
+        start = []
+        with self._lock:
+            claimed = set()  # keys an earlier queued task is waiting for
+            for task in list(self._queue):
+                if len(self._running) >= self.workers:
+                    break
+                if task.cancelled:
+                    continue
+                if claimed.isdisjoint(task.resources) and all(map(self._available, task.resources)):
+                    self._queue.remove(task)
+                    self._running.append(task)
+                    for resource in task.resources:
+                        self._held.setdefault(resource, []).append(task)
+                    task.state = RUNNING
+                    task.started = time.monotonic()
+                    start.append(task)
+                else:
+                    claimed.update(task.resources)
+        for task in start:
+            threading.Thread(target=self._run, args=(task,), daemon=True).start()
+        if start:
+            self._changed()
+
+    def _run(self, task):
+        try:
+            task.result = task.fn(task)
+            state = DONE
+        except Exception as e:
+            task.error = e
+            state = FAILED
+        with self._lock:
+            self._running.remove(task)
+            for resource in task.resources:
+                holders = self._held[resource]
+                holders.remove(task)
+                if not holders:
+                    del self._held[resource]
+            task.state = CANCELLED if task.cancelled else state
+            task.finished = time.monotonic()
+            self._finished.append(task)
+        self._notify_done(task)
+        self._changed()
+        self._dispatch()
+
+    def _notify_done(self, task):
+        if task.on_done is not None:
+            task.on_done(task)
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
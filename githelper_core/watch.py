@@ -0,0 +1,260 @@
+"""
+Watch a collection of local repos for changes to their git metadata
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+from .gitdir import local_fingerprint, resolve_git_dirs
+
+# Seconds between polls of repos that inotify can't watch
+WATCH_POLL_INTERVAL = 2.0
+# Seconds of quiet before a burst of changes is reported
+WATCH_SETTLE = 0.5
+
+# Entries of the git dir whose changes matter; anything in the refs
+# directories does. Lock files are left alone, git renames them into place.
+GIT_DIR_NAMES = frozenset({"HEAD", "index", "FETCH_HEAD", "packed-refs", "config"})
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+METADATA_EVENTS = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+FOLDER_EVENTS = IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+
+def metadata_dirs(repo):
+    """
+    The directories whose entries change when a repo's HEAD, index, refs or
+    FETCH_HEAD do, as (path, is git dir) pairs; [] if repo is not a git repo.
+    Remote-tracking refs are included, so a push updates ahead/behind.
+    """
+    git_dir, common_dir = resolve_git_dirs(repo)
+    if git_dir is None:
+        return []
+    refs = common_dir / "refs"
+    dirs = [(git_dir, True), (common_dir, True), (refs / "heads", False), (refs / "tags", False)]
+    try:
+        dirs += [(p, False) for p in (refs / "remotes").iterdir() if p.is_dir()]
+    except OSError:
+        pass
+    seen, unique = set(), []
+    for path, is_git_dir in dirs:
+        if path not in seen and path.is_dir():
+            seen.add(path)
+            unique.append((path, is_git_dir))
+    return unique
+
+
+def poll_stamp(repo):
+    """local_fingerprint() plus the remote-tracking ref dirs, for polling"""
+    stamps = [local_fingerprint(repo) or "-"]
+    for path, is_git_dir in metadata_dirs(repo):
+        if not is_git_dir and path.parent.name == "remotes":
+            try:
+                stamps.append(str(path.stat().st_mtime_ns))
+            except OSError:
+                stamps.append("-")
+    return ":".join(stamps)
+
+
+def folder_stamp(path):
+    try:
+        return Path(path).stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+class _Inotify:
+    """The few inotify calls RepoWatcher needs, through ctypes"""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path, mask):
+        """Watch descriptor for path, or None if it can't be watched (e.g. out of watches)"""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask | IN_ONLYDIR)
+        return wd if wd >= 0 else None
+
+    def read(self, timeout):
+        """[(wd, mask, name)] of the events that arrive within timeout seconds"""
+        import select
+        import struct
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+        events, offset = [], 0
+        while offset + 16 <= len(data):
+            wd, mask, _cookie, length = struct.unpack_from("iIII", data, offset)
+            name = data[offset + 16:offset + 16 + length].rstrip(b"\0")
+            events.append((wd, mask, os.fsdecode(name)))
+            offset += 16 + length
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class RepoWatcher:
+    """
+    Reports which repos of a collection changed, without rescanning it.
+
+    watch(base, repos) watches each repo's metadata_dirs() and the folders
+    from base down to the repos. A change in a repo's metadata reports that
+    repo; a folder gaining or losing an entry, or a repo's git dir
+    disappearing, asks for a rescan. Edits in a working tree are not seen
+    until git updates the index (e.g. on `git add` or `git status`).
+
+    inotify is used where available. Repos it can't watch (another
+    platform, or the user's watch limit reached) are polled every
+    `interval` seconds with poll_stamp(), which only stats a few files.
+    Changes are collected until `settle` seconds pass without one, then
+    on_change(repos, rescan) is called from the watcher's thread.
+    """
+
+    def __init__(self, on_change, interval=WATCH_POLL_INTERVAL, settle=WATCH_SETTLE, use_inotify=True):
+        self.on_change = on_change
+        self.interval = interval
+        self.settle = settle
+        self.use_inotify = use_inotify
+        self.watched = 0  # repos watched with inotify
+        self.polled = 0  # repos polled
+        self._lock = threading.Lock()
+        self._wanted = None  # (base, repos) to switch to
+        self._stop = threading.Event()
+        self._thread = None
+
+    def watch(self, base, repos):
+        """Start watching, or switch to a new set of repos (e.g. after a rescan)"""
+        with self._lock:
+            self._wanted = (Path(base), [Path(r) for r in repos])
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def mode(self):
+        if self.polled and self.watched:
+            return "inotify + polling"
+        return "polling" if self.polled else "inotify"
+
+    def _setup(self, inotify, base, repos):
+        """Add the watches; returns ({wd: (repo or None, is git dir)}, {repo: stamp}, {folder: stamp})"""
+        wds, polled, folders = {}, {}, {}
+        for repo in repos:
+            dirs = metadata_dirs(repo)
+            added = []
+            for path, is_git_dir in dirs:
+                wd = inotify.add_watch(path, METADATA_EVENTS) if inotify is not None else None
+                if wd is None:
+                    break
+                added.append((wd, is_git_dir))
+            if dirs and len(added) == len(dirs):
+                for wd, is_git_dir in added:
+                    wds[wd] = (str(repo), is_git_dir)
+            else:
+                polled[str(repo)] = poll_stamp(repo)
+            # The folders between base and the repo, where new repos appear
+            parent = repo.parent
+            while parent not in folders and (parent == base or base in parent.parents):
+                folders[parent] = folder_stamp(parent)
+                parent = parent.parent
+        folders.setdefault(base, folder_stamp(base))
+        for folder in list(folders):
+            wd = inotify.add_watch(folder, FOLDER_EVENTS) if inotify is not None else None
+            if wd is not None:
+                wds[wd] = (None, False)
+                del folders[folder]
+        self.watched = len(repos) - len(polled)
+        self.polled = len(polled)
+        return wds, polled, folders
+
+    def _run(self):
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify()
+            except (OSError, AttributeError):
+                inotify = None  # not Linux, or no libc inotify
+        wds, polled, folders = {}, {}, {}
+        changed, rescan = set(), False
+        last_change = last_poll = 0.0
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    wanted, self._wanted = self._wanted, None
+                if wanted is not None:
+                    if inotify is not None:
+                        inotify.close()
+                        inotify = _Inotify()
+                    wds, polled, folders = self._setup(inotify, *wanted)
+                    changed, rescan = set(), False
+
+                timeout = self.settle if changed or rescan else self.interval
+                if inotify is not None:
+                    events = inotify.read(timeout)
+                else:
+                    self._stop.wait(timeout)
+                    events = []
+                now = time.monotonic()
+                for wd, mask, name in events:
+                    if mask & IN_Q_OVERFLOW:
+                        rescan = True  # lost events; only a rescan catches up
+                        continue
+                    repo, is_git_dir = wds.get(wd, (None, False))
+                    if repo is None:
+                        if wd in wds and (mask & (IN_ISDIR | IN_DELETE_SELF | IN_MOVE_SELF)):
+                            rescan = True
+                    elif mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                        rescan = True  # the repo (or one of its ref folders) went away
+                    elif is_git_dir and name not in GIT_DIR_NAMES:
+                        continue
+                    elif name.endswith(".lock"):
+                        continue
+                    else:
+                        changed.add(repo)
+                    last_change = now
+
+                if (polled or folders) and now - last_poll >= self.interval:
+                    last_poll = now
+                    for repo, stamp in polled.items():
+                        new = poll_stamp(repo)
+                        if new != stamp:
+                            polled[repo] = new
+                            changed.add(repo)
+                            last_change = now
+                    for folder, stamp in folders.items():
+                        new = folder_stamp(folder)
+                        if new != stamp:
+                            folders[folder] = new
+                            rescan = True
+                            last_change = now
+
+                if (changed or rescan) and now - last_change >= self.settle:
+                    self.on_change(sorted(changed), rescan)
+                    changed, rescan = set(), False
+        finally:
+            if inotify is not None:
+                inotify.close()
@@ -2,20 +2,356 @@ import subprocess
 import os
 import json
 import collections
+import queue
 import threading
 import shlex
 import sys
+import bisect
+import itertools
 import shutil
+import time
+import atexit
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import (
     ttk, messagebox, filedialog, simpledialog
 )
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from githelper_core.backend import SSHBackend
+from githelper_core.details import (
+    collect_local_details, format_local_overview, human_size, local_summary,
+)
+from githelper_core.discovery import DISCOVERY_DEPTH, DISCOVERY_IGNORE, discover_repos, distinct_repos
+from githelper_core.gitdir import local_fingerprint
+from githelper_core.history import CommitPager, format_commit, local_log_page
+from githelper_core.heatmap import (
+    HEATMAP_COLORS, HEATMAP_REFS, HeatmapData, HeatmapJob, author_matcher,
+    heatmap_level, heatmap_window,
+)
+from githelper_core.fetch import fetch_repos_parallel
+from githelper_core.index import LocalRepoIndex
+from githelper_core.ssh import SSHConnectionPool
+from githelper_core.supervisor import OPERATION_TIMEOUTS, STALL_TIMEOUT, Supervisor
+from githelper_core.tasks import CANCELLED, FAILED, QUEUED, RUNNING, TaskScheduler
+from githelper_core.watch import RepoWatcher
+
 
 CONFIG_PATH = Path.home() / ".githelperrc"
+REMOTE_CACHE_PATH = Path.home() / ".cache" / "githelper" / "remote.json"
+
+# Background tasks: how many run at once, and how many may hold the same
+# resource: commands per SSH host, and mutating operations per remote or
+# local repo (one, so they never race each other)
+TASK_WORKERS = 8
+TASK_LIMITS = {"ssh": 4, "remote": 1, "repo": 1}
+
+# The log pane keeps the last LOG_MAX_LINES lines (config "log_max_lines");
+# older ones are appended to the "log_spill" file if one is configured.
+# Output from worker threads is queued and drained every LOG_DRAIN_MS.
+LOG_MAX_LINES = 5000
+LOG_DRAIN_MS = 100
+
+# How many repo histories keep their loaded pages for when you come back
+HISTORY_PAGERS = 32
+
+# Local Repos details kept in memory for instant reselection. An entry is
+# dropped once the repo's fingerprint moves; working tree edits don't move
+# it, so entries older than LOCAL_DETAILS_MAX_AGE seconds are shown but
+# re-read as well. Selection changes start a re-read only once the
+# selection has rested for LOCAL_SELECT_DEBOUNCE_MS.
+LOCAL_DETAILS_CACHE = 64
+LOCAL_DETAILS_MAX_AGE = 30
+LOCAL_SELECT_DEBOUNCE_MS = 150
+
+# (column id, heading, width) for the Tasks tab
+TASK_COLUMNS = (
+    ("state", "Status", 80),
+    ("detail", "Waiting for / result", 320),
+    ("time", "Time", 60),
+)
+
+# (column id, heading, width, anchor) for the Remote Repos inventory view
+REMOTE_COLUMNS = (
+    ("name", "Name", 180, tk.W),
+    ("pack_kib", "Pack size", 80, tk.E),
+    ("loose", "Loose", 60, tk.E),
+    ("last_commit", "Last commit", 120, tk.W),
+    ("head", "HEAD", 90, tk.W),
+    ("branches", "Branches", 65, tk.E),
+    ("tags", "Tags", 50, tk.E),
+)
+
+# (column id, heading, width, anchor) for the Local Repos list; the repo
+# path relative to the base folder goes in the tree column
+LOCAL_COLUMNS = (
+    ("branch", "Branch", 110, tk.W),
+    ("status", "Status", 130, tk.W),
+    ("last", "Last commit", 85, tk.W),
+)
+
+
+HEATMAP_EVERYONE, HEATMAP_ONLY_ME, HEATMAP_CUSTOM = "Everyone", "Only me", "Custom…"
+HEATMAP_AUTHOR_CHOICES = (HEATMAP_EVERYONE, HEATMAP_ONLY_ME, HEATMAP_CUSTOM)
+# Heatmap grid geometry (canvas units)
+HEATMAP_CELL = 15
+HEATMAP_GAP = 2
+HEATMAP_LEFT = 50  # room for the weekday labels
+
+
+class CloneOptionsDialog(simpledialog.Dialog):
+    """Asks for shallow/partial/sparse clone options; result is a list of git args"""
+
+    FILTERS = ("", "blob:none", "tree:0")
+
+    def body(self, master):
+        self.depth_var = tk.StringVar()
+        self.filter_var = tk.StringVar()
+        self.branch_var = tk.StringVar()
+        self.single_var = tk.BooleanVar()
+        self.sparse_var = tk.BooleanVar()
+
+        ttk.Label(master, text="Depth (empty = full history):").grid(row=0, column=0, sticky="w")
+        depth = ttk.Entry(master, textvariable=self.depth_var, width=8)
+        depth.grid(row=0, column=1, sticky="w")
+        ttk.Label(master, text="Filter:").grid(row=1, column=0, sticky="w")
+        ttk.Combobox(master, textvariable=self.filter_var, values=self.FILTERS,
+                     width=12).grid(row=1, column=1, sticky="w")
+        ttk.Label(master, text="Branch (empty = default):").grid(row=2, column=0, sticky="w")
+        ttk.Entry(master, textvariable=self.branch_var, width=20).grid(row=2, column=1, sticky="w")
+        ttk.Checkbutton(master, text="Single branch", variable=self.single_var).grid(
+            row=3, column=0, columnspan=2, sticky="w")
+        ttk.Checkbutton(master, text="Sparse checkout (top-level files only)",
+                        variable=self.sparse_var).grid(row=4, column=0, columnspan=2, sticky="w")
+        return depth
+
+    def validate(self):
+        depth = self.depth_var.get().strip()
+        if depth and not depth.isdigit():
+            messagebox.showwarning("Invalid depth", "Depth must be a number.", parent=self)
+            return False
+        return True
+
+    def apply(self):
+        options = []
+        if self.depth_var.get().strip():
+            options += ["--depth", self.depth_var.get().strip()]
+        if self.filter_var.get().strip():
+            options.append(f"--filter={self.filter_var.get().strip()}")
+        if self.single_var.get():
+            options.append("--single-branch")
+        if self.branch_var.get().strip():
+            options += ["--branch", self.branch_var.get().strip()]
+        if self.sparse_var.get():
+            options.append("--sparse")
+        self.result = options
+
+
+class VirtualList(ttk.Frame):
+    """
+    A read-only list that only renders the rows in view, so a 100k-commit
+    history scrolls like a short one. `rows` may grow in place (call
+    refresh() afterwards); render(row) gives a row's text and `footer` is
+    an extra last line such as "Loading…". on_near_end() is called whenever
+    the view comes within a screenful of the last row.
+    """
+
+    def __init__(self, parent, render=str, on_near_end=None, height=10):
+        super().__init__(parent)
+        self.render = render
+        self.on_near_end = on_near_end
+        self.rows = []
+        self.footer = ""
+        self.top = 0
+        self.text = tk.Text(self, wrap=tk.NONE, state=tk.DISABLED, height=height)
+        self.vbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        hbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.text.xview)
+        self.text.configure(xscrollcommand=hbar.set)
+        self.vbar.pack(side=tk.RIGHT, fill=tk.Y)
+        hbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self._linespace = tkfont.Font(font=self.text.cget("font")).metrics("linespace")
+
+        self.text.bind("<Configure>", lambda _e: self.redraw())
+        self.text.bind("<MouseWheel>", lambda e: self._scroll(-3 if e.delta > 0 else 3))
+        self.text.bind("<Button-4>", lambda _e: self._scroll(-3))
+        self.text.bind("<Button-5>", lambda _e: self._scroll(3))
+        self.text.bind("<Up>", lambda _e: self._scroll(-1))
+        self.text.bind("<Down>", lambda _e: self._scroll(1))
+        self.text.bind("<Prior>", lambda _e: self._scroll(-self.visible()))
+        self.text.bind("<Next>", lambda _e: self._scroll(self.visible()))
+        self.text.bind("<Home>", lambda _e: self._scroll(-self._count()))
+        self.text.bind("<End>", lambda _e: self._scroll(self._count()))
+
+    def set_rows(self, rows, footer=""):
+        self.rows, self.footer, self.top = rows, footer, 0
+        self.redraw()
+
+    def set_message(self, text):
+        self.set_rows([], text)
+
+    def refresh(self, footer=None):
+        if footer is not None:
+            self.footer = footer
+        self.redraw()
+
+    def visible(self):
+        """How many rows fit in the widget"""
+        return max(1, (self.text.winfo_height() - 4) // self._linespace)
+
+    def _count(self):
+        return len(self.rows) + (1 if self.footer else 0)
+
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"/"pages")"""
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * self._count())
+        elif args[0] == "scroll":
+            self.top += int(args[1]) * (self.visible() if args[2] == "pages" else 1)
+        self.redraw()
+
+    def _scroll(self, lines):
+        self.top += lines
+        self.redraw()
+        return "break"
+
+    def redraw(self):
+        count, visible = self._count(), self.visible()
+        self.top = max(0, min(self.top, count - visible))
+        lines = [self.render(row) for row in self.rows[self.top:self.top + visible]]
+        if self.footer and self.top + visible > len(self.rows):
+            lines.append(self.footer)
+        x = self.text.xview()[0]
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.config(state=tk.DISABLED)
+        self.text.xview_moveto(x)
+        if count:
+            self.vbar.set(self.top / count, min(1.0, (self.top + visible) / count))
+        else:
+            self.vbar.set(0.0, 1.0)
+        if self.on_near_end is not None and self.top + 2 * visible >= len(self.rows):
+            self.on_near_end()
+
+
+class RemoteCache:
+    """
+    On-disk cache of remote inventory records and per-repo details, keyed by
+    host + directory. Entries carry the server-side fingerprint they were
+    computed for, so callers can tell whether a refetch is needed.
+    """
+
+    def __init__(self, path=REMOTE_CACHE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+        except Exception:
+            self._data = {}
+
+    @staticmethod
+    def key(user, server, port, ssh_dir):
+        return f"{user}@{server}:{port}:{ssh_dir.rstrip('/')}"
+
+    def _repos(self, key):
+        return self._data.setdefault(key, {})
+
+    def inventory(self, key):
+        """Cached inventory records for a host/dir, by repo name"""
+        with self._lock:
+            return {
+                name: entry["inventory"]
+                for name, entry in self._data.get(key, {}).items()
+                if entry.get("inventory")
+            }
+
+    def fingerprints(self, key):
+        with self._lock:
+            return {
+                name: entry["inventory"]["fingerprint"]
+                for name, entry in self._data.get(key, {}).items()
+                if entry.get("inventory")
+            }
+
+    def store_inventory(self, key, record):
+        with self._lock:
+            entry = self._repos(key).setdefault(record["name"], {})
+            entry["inventory"] = record
+
+    def retain(self, key, names):
+        """Drop cached repos that no longer exist on the server"""
+        with self._lock:
+            repos = self._repos(key)
+            for name in set(repos) - set(names):
+                del repos[name]
+
+    def details(self, key, name):
+        """Return (fingerprint, details) from the cache, or (None, None)"""
+        with self._lock:
+            cached = self._data.get(key, {}).get(name, {}).get("details")
+            if not cached:
+                return None, None
+            return cached["fingerprint"], cached["data"]
+
+    def store_details(self, key, name, fingerprint, details):
+        with self._lock:
+            entry = self._repos(key).setdefault(name, {})
+            entry["details"] = {"fingerprint": fingerprint, "data": details}
+
+    def save(self):
+        # Tasks save concurrently; holding the lock through the write keeps
+        # them from sharing the temp file, and the newest data lands last
+        with self._lock:
+            payload = json.dumps(self._data)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(".tmp")
+                tmp.write_text(payload, encoding="utf-8")
+                os.replace(tmp, self.path)
+            except OSError:
+                pass  # the cache is an optimization; never fail an action over it
+
+
+class DetailsCache:
+    """
+    In-memory LRU of local repo details by path, each stored with the
+    local_fingerprint() it was read at. A lookup with a different
+    fingerprint drops the entry, so only details that still match the
+    repo's HEAD, index and refs are ever returned.
+    """
+
+    def __init__(self, size=LOCAL_DETAILS_CACHE):
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()  # {path: (fingerprint, details, read at)}, oldest first
+
+    def get(self, path, fingerprint):
+        """(details, age in seconds) if cached for fingerprint, else None"""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            if fingerprint is None or entry[0] != fingerprint:
+                del self._entries[path]
+                return None
+            self._entries.move_to_end(path)
+            return entry[1], time.monotonic() - entry[2]
+
+    def store(self, path, fingerprint, details):
+        if fingerprint is None:
+            return
+        with self._lock:
+            self._entries[path] = (fingerprint, details, time.monotonic())
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
 
 
 class GithelperGUI:
@@ -25,7 +361,25 @@ class GithelperGUI:
         self.root.geometry("1080x450")
 
         self.config = self.load_config()
-        self._task_running = False
+        self.tasks = TaskScheduler(
+            workers=TASK_WORKERS, limits=TASK_LIMITS,
+            on_change=lambda: self.root.after(0, self._schedule_task_view),
+        )
+        self._task_view_pending = False
+        self._history_pagers = {}  # {(view key, tip): CommitPager}, oldest first
+        self._log_queue = queue.SimpleQueue()
+        self._log_live = {}  # {key: mark at the start of its in-place line}
+        self._log_marks = itertools.count()
+        self._log_spill = None
+        self.ssh_pool = SSHConnectionPool()
+        self.remote_cache = RemoteCache()
+        self.local_index = LocalRepoIndex()
+        self.local_details = DetailsCache()
+        self._local_details_after = None  # pending debounced re-read
+        self._local_details_task = None
+        self.local_watcher = None
+        atexit.register(self.ssh_pool.close_all)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Create notebook for tabs
         self.notebook = ttk.Notebook(root)
@@ -43,9 +397,15 @@ class GithelperGUI:
         self.heatmap_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.heatmap_frame, text="Local Commit Heatmap")
 
+        # Tasks tab
+        self.tasks_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.tasks_frame, text="Tasks")
+
         self.create_main_tab()
         self.create_local_tab()
         self.create_heatmap_tab()
+        self.create_tasks_tab()
+        self.root.after(LOG_DRAIN_MS, self._drain_log)
 
     # == Config Management ==
     def load_config(self):
@@ -63,21 +423,97 @@ class GithelperGUI:
         self.config["port"] = self.port_var.get().strip()
         self.config["dir"] = self.dir_var.get().strip()
         self.config["local_repo_base"] = self.repo_base or ""
+        if hasattr(self, "scan_depth_var"):
+            self.config["scan_depth"] = self._scan_depth()
+        if hasattr(self, "watch_local_var"):
+            self.config["watch_local"] = bool(self.watch_local_var.get())
         try:
             with open(CONFIG_PATH, "w", encoding="utf-8") as f:
                 json.dump(self.config, f, indent=2)
         except Exception as e:
             messagebox.showwarning("Warning", f"Failed to save config: {e}")
 
+    def on_close(self):
+        if self.local_watcher is not None:
+            self.local_watcher.stop()
+        self.tasks.cancel_all()
+        self.ssh_pool.close_all()
+        if self._log_spill is not None:
+            self._log_spill.close()
+        self.root.destroy()
+
     # == UI Helpers ==
     def _set_status(self, text):
         self.status_var.set(text)
 
-    def _append_log(self, text):
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, text.rstrip() + "\n")
-        self.log_text.see(tk.END)
-        self.log_text.config(state=tk.DISABLED)
+    def _append_log(self, text, key=None, final=True):
+        """
+        Queue a line for the log pane; safe to call from any thread. Lines
+        sent with the same `key` and final=False rewrite one line in place
+        (like git's \\r progress) until a final line for that key replaces it.
+        """
+        self._log_queue.put((key, text.rstrip(), final))
+
+    def _drain_log(self):
+        """Move queued log lines into the pane, then trim it to its line cap"""
+        events = []
+        while len(events) < 2000:
+            try:
+                events.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        # Only the newest in-place update per key is worth drawing
+        newest = {key: i for i, (key, _text, final) in enumerate(events) if key is not None}
+        events = [event for i, event in enumerate(events)
+                  if event[0] is None or event[2] or newest[event[0]] == i]
+        if events:
+            self.log_text.config(state=tk.NORMAL)
+            for key, text, final in events:
+                self._write_log_line(key, text, final)
+            self._trim_log()
+            self.log_text.see(tk.END)
+            self.log_text.config(state=tk.DISABLED)
+        self.root.after(LOG_DRAIN_MS, self._drain_log)
+
+    def _write_log_line(self, key, text, final):
+        mark = self._log_live.get(key) if key is not None else None
+        if mark is not None:
+            self.log_text.delete(mark, f"{mark} lineend")
+            self.log_text.insert(mark, text)
+            if final:
+                self.log_text.mark_unset(mark)
+                del self._log_live[key]
+            return
+        start = self.log_text.index("end-1c")
+        self.log_text.insert(tk.END, text + "\n")
+        if key is not None and not final:
+            mark = f"live{next(self._log_marks)}"
+            self.log_text.mark_set(mark, start)
+            self.log_text.mark_gravity(mark, tk.LEFT)
+            self._log_live[key] = mark
+
+    def _trim_log(self):
+        """Drop the oldest lines past the cap, spilling them to the log file if set"""
+        limit = max(1, int(self.config.get("log_max_lines", LOG_MAX_LINES)))
+        excess = int(self.log_text.index("end-1c").split(".")[0]) - 1 - limit
+        if excess <= 0:
+            return
+        cut = f"{excess + 1}.0"
+        for key, mark in list(self._log_live.items()):
+            if self.log_text.compare(mark, "<", cut):
+                self.log_text.mark_unset(mark)
+                del self._log_live[key]
+        if self.config.get("log_spill"):
+            try:
+                if self._log_spill is None:
+                    path = Path(os.path.expanduser(self.config["log_spill"]))
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    self._log_spill = open(path, "a", encoding="utf-8")
+                self._log_spill.write(self.log_text.get("1.0", cut))
+                self._log_spill.flush()
+            except OSError:
+                pass  # losing old log lines must not break the GUI
+        self.log_text.delete("1.0", cut)
 
     def _validate_ssh_inputs(self):
         server = self.server_var.get().strip()
@@ -91,45 +527,78 @@ class GithelperGUI:
             raise ValueError("Port must be a number.")
         return server, user, port, ssh_dir
 
-    def _run_in_background(self, label, work_fn, done_fn=None):
-        if self._task_running:
-            messagebox.showinfo("Busy", "Another operation is running. Please wait.")
-            return
+    def _ssh_resources(self, *repo_names):
+        """
+        Task resources for work on the SSH host, plus the named remote repos
+        when the work changes them (empty if the settings are invalid; the
+        task then reports that itself)
+        """
+        try:
+            server, user, port, ssh_dir = self._validate_ssh_inputs()
+        except ValueError:
+            return ()
+        host = f"{user}@{server}:{port}"
+        return (("ssh", host),
+                *(("remote", f"{host}:{ssh_dir.rstrip('/')}/{name}") for name in repo_names))
 
-        self._task_running = True
-        self._set_status(f"{label}…")
-        self._append_log(f"[{label}] started")
+    def _supervisor(self, operation):
+        """
+        A Supervisor with the configured time limits for a clone, fetch, pull
+        or archive, and its own cancel event to pass to _run_in_background
+        """
+        timeouts = {**OPERATION_TIMEOUTS, **self.config.get("timeouts", {})}
+        return Supervisor(timeouts.get(operation), self.config.get("stall_timeout", STALL_TIMEOUT),
+                          threading.Event())
 
-        def runner():
-            try:
-                result = work_fn()
-                error = None
-            except Exception as e:
-                result = None
-                error = e
-
-            def finish():
-                self._task_running = False
-                if error is not None:
-                    err_text = str(error)
-                    if isinstance(error, subprocess.CalledProcessError):
-                        stderr = (error.stderr or "").strip()
-                        if stderr:
-                            err_text = f"{err_text}\n\n--- stderr ---\n{stderr}"
-                    self._set_status(f"{label} failed")
-                    self._append_log(f"[{label}] ERROR: {err_text}")
-                    messagebox.showerror("Error", f"{label} failed:\n{err_text}")
-                    return
-
-                self._set_status(f"{label} done")
-                self._append_log(f"[{label}] done")
-                if done_fn is not None:
-                    done_fn(result)
-
-            self.root.after(0, finish)
-
-        t = threading.Thread(target=runner, daemon=True)
-        t.start()
+    def _run_in_background(self, label, work_fn, done_fn=None, resources=(), key=None, cancel=None,
+                           finish_fn=None):
+        """
+        Queue work_fn() on the task scheduler and call done_fn(result) on the
+        Tk thread when it succeeds. finish_fn(task), if given, is called on
+        the Tk thread first, however the task ended (done, failed or
+        cancelled, even before it started). `resources` and `key` are passed
+        to TaskScheduler.submit(); the `cancel` event, if given, is set when
+        the task is cancelled. Returns the Task.
+        """
+        def run(_task):
+            self._append_log(f"[{label}] started")
+            self.root.after(0, self._set_status, f"{label}…")
+            return work_fn()
+
+        def finish(task):
+            if finish_fn is not None:
+                finish_fn(task)
+            error = task.error
+            if task.state == CANCELLED:
+                self._set_status(f"{label} cancelled")
+                self._append_log(f"[{label}] cancelled")
+                return
+            if error is not None:
+                err_text = str(error)
+                if isinstance(error, subprocess.CalledProcessError):
+                    stderr = (error.stderr or "").strip()
+                    if stderr:
+                        err_text = f"{err_text}\n\n--- stderr ---\n{stderr}"
+                self._set_status(f"{label} failed")
+                self._append_log(f"[{label}] ERROR: {err_text}")
+                messagebox.showerror("Error", f"{label} failed:\n{err_text}")
+                return
+
+            self._set_status(f"{label} done")
+            self._append_log(f"[{label}] done")
+            if done_fn is not None:
+                done_fn(task.result)
+
+        task = self.tasks.submit(
+            label, run, resources=resources, key=key,
+            on_done=lambda task: self.root.after(0, finish, task),
+        )
+        if cancel is not None:
+            task.on_cancel(cancel.set)
+        if task.state == QUEUED:
+            self._set_status(f"{label} queued")
+            self._append_log(f"[{label}] queued")
+        return task
 
     # == Main Tab UI ==
     def create_main_tab(self):
@@ -192,6 +661,9 @@ class GithelperGUI:
         ttk.Button(
             button_row, text="Fork/Copy", command=self.fork_repo
         ).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(
+            button_row, text="Dissociate", command=self.dissociate_repo
+        ).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(
             button_row, text="Archive", command=self.archive_repo
         ).pack(side=tk.LEFT, padx=(0, 5))
@@ -213,9 +685,20 @@ class GithelperGUI:
         scrollbar = ttk.Scrollbar(list_container, orient=tk.VERTICAL)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        self.repo_listbox = tk.Listbox(list_container, yscrollcommand=scrollbar.set)
-        self.repo_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.repo_listbox.yview)
+        self.repo_tree = ttk.Treeview(
+            list_container,
+            columns=[c[0] for c in REMOTE_COLUMNS],
+            show="headings",
+            selectmode="browse",
+            yscrollcommand=scrollbar.set,
+        )
+        for col, heading, width, anchor in REMOTE_COLUMNS:
+            self.repo_tree.heading(col, text=heading, command=lambda c=col: self._sort_remote_repos(c))
+            self.repo_tree.column(col, width=width, anchor=anchor, stretch=(col == "name"))
+        self.repo_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.repo_tree.yview)
+        self._remote_inventory = {}  # {name: inventory record}
+        self._remote_sort = ("name", False)
 
         # Right: details
         details_container = ttk.Frame(paned)
@@ -242,24 +725,13 @@ class GithelperGUI:
         meta_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.meta_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        self.merges_text = tk.Text(merges_tab, wrap=tk.NONE, state=tk.DISABLED, height=10)
-        merges_v = ttk.Scrollbar(merges_tab, orient=tk.VERTICAL, command=self.merges_text.yview)
-        merges_h = ttk.Scrollbar(merges_tab, orient=tk.HORIZONTAL, command=self.merges_text.xview)
-        self.merges_text.configure(yscrollcommand=merges_v.set, xscrollcommand=merges_h.set)
-        merges_v.pack(side=tk.RIGHT, fill=tk.Y)
-        merges_h.pack(side=tk.BOTTOM, fill=tk.X)
-        self.merges_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-
-        self.commits_text = tk.Text(commits_tab, wrap=tk.NONE, state=tk.DISABLED, height=10)
-        commits_v = ttk.Scrollbar(commits_tab, orient=tk.VERTICAL, command=self.commits_text.yview)
-        commits_h = ttk.Scrollbar(commits_tab, orient=tk.HORIZONTAL, command=self.commits_text.xview)
-        self.commits_text.configure(yscrollcommand=commits_v.set, xscrollcommand=commits_h.set)
-        commits_v.pack(side=tk.RIGHT, fill=tk.Y)
-        commits_h.pack(side=tk.BOTTOM, fill=tk.X)
-        self.commits_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.merges_list = VirtualList(merges_tab, render=format_commit)
+        self.merges_list.pack(fill=tk.BOTH, expand=True)
+        self.commits_list = VirtualList(commits_tab, render=format_commit)
+        self.commits_list.pack(fill=tk.BOTH, expand=True)
 
         # Auto-load details when selection changes
-        self.repo_listbox.bind("<<ListboxSelect>>", lambda _e: self.refresh_repo_details())
+        self.repo_tree.bind("<<TreeviewSelect>>", lambda _e: self.refresh_repo_details())
 
         # Log + status
         bottom = ttk.Frame(self.main_frame)
@@ -285,90 +757,153 @@ class GithelperGUI:
         widget.insert(tk.END, text)
         widget.config(state=tk.DISABLED)
 
-    def _classify_remote(self, url):
-        u = (url or "").strip().lower()
-        if "github.com" in u:
-            return "GitHub"
-        if "gitlab.com" in u:
-            return "GitLab"
-        if "bitbucket.org" in u:
-            return "Bitbucket"
-        if u.startswith("file://") or u.startswith("/"):
-            return "Local"
-        return "Other"
-
-    def _run_git_local(self, repo, args, check=False):
-        return subprocess.run(
-            ["git", "-C", str(repo), *args],
-            check=check,
-            capture_output=True,
-            text=True,
+    def _history_pager(self, key, tip, commits, fetch_page):
+        """
+        The CommitPager for a history view. A repo shown again at the same
+        tip gets its old pager back, with every page it already loaded.
+        """
+        pager = self._history_pagers.pop((key, tip), None) if tip else None
+        if pager is None:
+            pager = CommitPager(fetch_page, commits, tip)
+        if tip:
+            self._history_pagers[(key, tip)] = pager
+            if len(self._history_pagers) > HISTORY_PAGERS:
+                del self._history_pagers[next(iter(self._history_pagers))]
+        return pager
+
+    def _show_history(self, view, pager, empty_text, resources=()):
+        """Show pager's commits in a VirtualList, loading more pages as it scrolls"""
+        def footer():
+            if pager.more:
+                return "Loading…"
+            if pager.error:
+                return f"(Could not load more commits: {pager.error})"
+            return "" if pager.commits else empty_text
+
+        def finish(task, skip):
+            if task.state == CANCELLED or task.error is not None:
+                pager.failed(" ".join(str(task.error or "cancelled").split()))
+            else:
+                pager.add_page(skip, task.result)
+            if view.rows is pager.commits:  # still showing this history
+                view.refresh(footer())
+
+        def load_more():
+            skip = pager.claim()
+            if skip is None:
+                return
+            self.tasks.submit(
+                f"Load history ({skip + 1}–{skip + pager.page_size})",
+                lambda _task: pager.fetch(skip), resources=resources,
+                on_done=lambda task: self.root.after(0, finish, task, skip),
+            )
+
+        view.on_near_end = load_more
+        view.set_rows(pager.commits, footer())
+
+    def _selected_remote_repo(self):
+        selection = self.repo_tree.selection()
+        if not selection:
+            return None
+        return selection[0].strip().removesuffix(".git")
+
+    def _remote_row_values(self, repo):
+        last = repo["last_commit"]
+        return (
+            repo["name"],
+            human_size(repo["pack_kib"]),
+            repo["loose"],
+            datetime.fromtimestamp(last).strftime("%Y-%m-%d %H:%M") if last else "-",
+            repo["head"] or "-",
+            repo["branches"],
+            repo["tags"],
         )
 
+    def _add_remote_repos(self, repos):
+        for repo in repos:
+            self._remote_inventory[repo["name"]] = repo
+            values = self._remote_row_values(repo)
+            if self.repo_tree.exists(repo["name"]):
+                self.repo_tree.item(repo["name"], values=values)
+            else:
+                self.repo_tree.insert("", tk.END, iid=repo["name"], values=values)
+
+    def _sort_remote_repos(self, column=None):
+        col, descending = self._remote_sort
+        if column is not None:
+            descending = not descending if column == col else False
+            col = column
+        self._remote_sort = (col, descending)
+
+        def key(name):
+            value = self._remote_inventory[name][col]
+            return value.lower() if isinstance(value, str) else value
+
+        names = sorted(self._remote_inventory, key=key, reverse=descending)
+        for index, name in enumerate(names):
+            self.repo_tree.move(name, "", index)
+
+    def _remote_cache_key(self):
+        server, user, port, ssh_dir = self._validate_ssh_inputs()
+        return RemoteCache.key(user, server, port, ssh_dir)
+
+    def _show_remote_details(self, repo_name, details):
+        meta = "\n".join(f"{k}: {v}" for k, v in details["meta"].items())
+        self._set_text(self.meta_text, meta.strip() + "\n")
+        try:
+            cache_key = self._remote_cache_key()
+        except ValueError:
+            cache_key = None
+        resources = self._ssh_resources()
+        for view, merges, empty in ((self.merges_list, True, "(No merge commits found)"),
+                                    (self.commits_list, False, "(No commits found)")):
+            pager = self._history_pager(
+                ("remote", cache_key, repo_name, merges), details["tip"],
+                details["merges" if merges else "commits"],
+                lambda tip, skip, count, merges=merges:
+                    self._backend().log_page(repo_name, tip, skip, count, merges),
+            )
+            self._show_history(view, pager, empty, resources)
+
     def refresh_repo_details(self):
-        selection = self.repo_listbox.curselection()
-        if not selection:
+        repo_name = self._selected_remote_repo()
+        if not repo_name:
             self._set_text(self.meta_text, "Select a repository to view metadata.")
-            self._set_text(self.merges_text, "Select a repository to view merge history.")
-            self._set_text(self.commits_text, "Select a repository to view commit history.")
+            self.merges_list.set_message("Select a repository to view merge history.")
+            self.commits_list.set_message("Select a repository to view commit history.")
             return
 
-        repo_name = self.repo_listbox.get(selection[0]).strip().removesuffix(".git")
         self.save_config()
 
-        def work():
-            _server, _user, _port, ssh_dir = self._validate_ssh_inputs()
-            cd_cmd = self._remote_cd_cmd(ssh_dir)
-            repo_git = shlex.quote(self._repo_git_dirname(repo_name))
-
-            meta_cmd = (
-                "set -e; "
-                f"{cd_cmd}; "
-                f"REPO={repo_git}; "
-                "printf 'Repo: %s\\n' \"$REPO\"; "
-                "printf 'HEAD: '; "
-                "git --git-dir \"$REPO\" symbolic-ref -q --short HEAD || echo '(detached/unknown)'; "
-                "printf 'Last commit: '; "
-                "git --git-dir \"$REPO\" log -1 --format='%h %ci %an %s' 2>/dev/null || echo '(no commits)'; "
-                "printf 'Branches: '; "
-                "git --git-dir \"$REPO\" for-each-ref refs/heads --format='%(refname:short)' | wc -l | tr -d ' '; "
-                "printf '\\nTags: '; "
-                "git --git-dir \"$REPO\" tag -l | wc -l | tr -d ' '; "
-                "printf '\\nObject size: '; "
-                "git --git-dir \"$REPO\" count-objects -vH | sed -n 's/^size-pack: //p'; "
-                "printf '\\nLoose objects: '; "
-                "git --git-dir \"$REPO\" count-objects -vH | sed -n 's/^count: //p'; "
-                "printf '\\nPacked objects: '; "
-                "git --git-dir \"$REPO\" count-objects -vH | sed -n 's/^in-pack: //p'; "
-                "printf '\\n'"
-            )
-
-            merges_cmd = (
-                "set -e; "
-                f"{cd_cmd}; "
-                f"REPO={repo_git}; "
-                "git --git-dir \"$REPO\" log --merges --oneline --decorate -n 50 2>/dev/null || true"
-            )
-
-            commits_cmd = (
-                "set -e; "
-                f"{cd_cmd}; "
-                f"REPO={repo_git}; "
-                "git --git-dir \"$REPO\" log --oneline --decorate -n 100 2>/dev/null || true"
-            )
+        # Render whatever the cache has right away; the background round trip
+        # only re-sends the details if the server-side fingerprint moved.
+        try:
+            cache_key = self._remote_cache_key()
+        except ValueError:
+            cache_key = None
+        known_fp = None
+        if cache_key is not None:
+            known_fp, cached = self.remote_cache.details(cache_key, repo_name)
+            if cached is not None and "tip" not in cached:
+                known_fp, cached = None, None  # cached before history paging
+            if cached is not None:
+                self._show_remote_details(repo_name, cached)
 
-            meta = self._run_ssh_command(meta_cmd).stdout
-            merges = self._run_ssh_command(merges_cmd).stdout
-            commits = self._run_ssh_command(commits_cmd).stdout
-            return meta, merges, commits
+        def work():
+            fingerprint, details = self._backend().details(repo_name, known_fp)
+            if details is not None and cache_key is not None:
+                self.remote_cache.store_details(cache_key, repo_name, fingerprint, details)
+                self.remote_cache.save()
+            return details
 
-        def done(result):
-            meta, merges, commits = result
-            self._set_text(self.meta_text, meta.strip() + "\n")
-            self._set_text(self.merges_text, (merges.strip() + "\n") if merges.strip() else "(No merge commits found)\n")
-            self._set_text(self.commits_text, (commits.strip() + "\n") if commits.strip() else "(No commits found)\n")
+        def done(details):
+            if details is None:
+                self._set_status(f"{repo_name}: unchanged (cached)")
+                return
+            self._show_remote_details(repo_name, details)
 
-        self._run_in_background(f"Load details for {repo_name}", work, done)
+        self._run_in_background(f"Load details for {repo_name}", work, done,
+                                resources=self._ssh_resources(), key="remote details")
 
     # == Heatmap Tab UI ==
     def create_local_tab(self):
@@ -382,6 +917,12 @@ class GithelperGUI:
         self.local_base_var = tk.StringVar(value=self.config.get("local_repo_base", ""))
         ttk.Entry(row, textvariable=self.local_base_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(6, 6))
         ttk.Button(row, text="Choose…", command=self.choose_local_base).pack(side=tk.LEFT)
+        ttk.Label(row, text="Depth:").pack(side=tk.LEFT, padx=(10, 0))
+        self.scan_depth_var = tk.StringVar(value=str(self.config.get("scan_depth", DISCOVERY_DEPTH)))
+        ttk.Spinbox(row, from_=0, to=10, width=3, textvariable=self.scan_depth_var).pack(side=tk.LEFT, padx=(4, 0))
+        self.watch_local_var = tk.BooleanVar(value=bool(self.config.get("watch_local", False)))
+        ttk.Checkbutton(row, text="Watch", variable=self.watch_local_var,
+                        command=self.toggle_local_watch).pack(side=tk.LEFT, padx=(10, 0))
 
         btns = ttk.Frame(top)
         btns.pack(fill=tk.X, padx=5, pady=(0, 5))
@@ -390,7 +931,9 @@ class GithelperGUI:
         ttk.Button(btns, text="lazygit", command=self.lazygit_selected_local_repo).pack(side=tk.LEFT, padx=(6, 0))
         ttk.Button(btns, text="Fetch", command=self.fetch_selected_local_repo).pack(side=tk.LEFT, padx=(6, 0))
         ttk.Button(btns, text="Pull", command=self.pull_selected_local_repo).pack(side=tk.LEFT, padx=(6, 0))
-        ttk.Button(btns, text="Refresh Details", command=self.refresh_local_repo_details).pack(side=tk.RIGHT)
+        ttk.Button(btns, text="Fetch All", command=self.fetch_all_local_repos).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Button(btns, text="Refresh Details",
+                   command=lambda: self.refresh_local_repo_details(reread=True)).pack(side=tk.RIGHT)
 
         body = ttk.Frame(self.local_frame)
         body.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
@@ -404,9 +947,22 @@ class GithelperGUI:
 
         lscroll = ttk.Scrollbar(left, orient=tk.VERTICAL)
         lscroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.local_listbox = tk.Listbox(left, yscrollcommand=lscroll.set)
-        self.local_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        lscroll.config(command=self.local_listbox.yview)
+        self.local_tree = ttk.Treeview(
+            left,
+            columns=[c[0] for c in LOCAL_COLUMNS],
+            selectmode="browse",
+            yscrollcommand=lscroll.set,
+        )
+        self.local_tree.heading("#0", text="Repository")
+        self.local_tree.column("#0", width=200, stretch=True)
+        for col, heading, width, anchor in LOCAL_COLUMNS:
+            self.local_tree.heading(col, text=heading)
+            self.local_tree.column(col, width=width, anchor=anchor, stretch=False)
+        self.local_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        lscroll.config(command=self.local_tree.yview)
+        self._local_listing_base = None  # base folder the rows belong to
+        self._local_repo_paths = []  # lowercased, parallel to the rows
+        self._local_repo_kinds = {}  # path -> "repo" | "worktree" | "bare"
 
         # Right: details
         right = ttk.LabelFrame(paned, text="Details")
@@ -426,18 +982,18 @@ class GithelperGUI:
         ov_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.local_overview_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        self.local_commits_text = tk.Text(commits_tab, wrap=tk.NONE, state=tk.DISABLED, height=12)
-        c_v = ttk.Scrollbar(commits_tab, orient=tk.VERTICAL, command=self.local_commits_text.yview)
-        c_h = ttk.Scrollbar(commits_tab, orient=tk.HORIZONTAL, command=self.local_commits_text.xview)
-        self.local_commits_text.configure(yscrollcommand=c_v.set, xscrollcommand=c_h.set)
-        c_v.pack(side=tk.RIGHT, fill=tk.Y)
-        c_h.pack(side=tk.BOTTOM, fill=tk.X)
-        self.local_commits_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.local_commits_list = VirtualList(commits_tab, render=format_commit, height=12)
+        self.local_commits_list.pack(fill=tk.BOTH, expand=True)
 
-        self.local_listbox.bind("<<ListboxSelect>>", lambda _e: self.refresh_local_repo_details())
+        self.local_tree.bind(
+            "<<TreeviewSelect>>",
+            lambda _e: self.refresh_local_repo_details(delay=LOCAL_SELECT_DEBOUNCE_MS),
+        )
 
         self._set_text(self.local_overview_text, "Choose a base folder, scan repos, then select one.")
-        self._set_text(self.local_commits_text, "Choose a repo to see commit history.")
+        self.local_commits_list.set_message("Choose a repo to see commit history.")
+        self._load_local_index()
+        self._update_local_watch()
 
     def choose_local_base(self):
         directory = filedialog.askdirectory(title="Select Base Folder Containing Repos")
@@ -447,10 +1003,8 @@ class GithelperGUI:
             self.save_config()
 
     def _selected_local_repo_path(self):
-        sel = self.local_listbox.curselection()
-        if not sel:
-            return None
-        return self.local_listbox.get(sel[0])
+        sel = self.local_tree.selection()
+        return sel[0] if sel else None
 
     def scan_local_repos(self):
         base = (self.local_base_var.get() or "").strip()
@@ -465,153 +1019,247 @@ class GithelperGUI:
         self.repo_base = str(base_path)  # keep heatmap in sync
         self.save_config()
 
+        depth = self._scan_depth()
+        ignore = self.config.get("scan_ignore", DISCOVERY_IGNORE)
+        cancel = threading.Event()
+
         def work():
-            repos = []
-            # One-level deep scan by default (fast, matches common layouts).
-            # Includes base itself if it is a repo.
-            candidates = [base_path] + [p for p in base_path.iterdir() if p.is_dir()]
-            for p in candidates:
-                if (p / ".git").exists() and (p / ".git").is_dir():
-                    repos.append(str(p))
-            repos.sort(key=lambda s: s.lower())
-            return repos
-
-        def done(repos):
-            self.local_listbox.delete(0, tk.END)
-            for r in repos:
-                self.local_listbox.insert(tk.END, r)
-            self._set_status(f"Found {len(repos)} local repos")
-
-        self._run_in_background("Scan local repos", work, done)
-
-    def refresh_local_repo_details(self):
+            self.root.after(0, self._start_local_listing, str(base_path))
+            # Hand repos to the UI in small batches so the list fills in
+            # while the walk is still running; known repos show their last
+            # indexed state straight away.
+            batch, last_flush = [], [time.monotonic()]
+            lock = threading.Lock()
+
+            def found(path, kind):
+                _fp, details = self.local_index.get(path)
+                with lock:
+                    batch.append((path, kind, details))
+                    if time.monotonic() - last_flush[0] > 0.1:
+                        self.root.after(0, self._add_local_repos, batch[:])
+                        batch.clear()
+                        last_flush[0] = time.monotonic()
+
+            repos = discover_repos(base_path, found, depth=depth, ignore=ignore, cancel=cancel)
+            with lock:
+                self.root.after(0, self._add_local_repos, batch[:])
+
+            # Re-query only the repos whose fingerprint moved since last time
+            def check(item):
+                path, kind = item
+                if cancel.is_set():
+                    return False
+                fingerprint = local_fingerprint(path)
+                cached_fp, _details = self.local_index.get(path)
+                if fingerprint is not None and fingerprint == cached_fp:
+                    return False
+                details = collect_local_details(path)
+                self.local_index.store(base_path, path, kind, fingerprint, details)
+                self.root.after(0, self._add_local_repos, [(path, kind, details)])
+                return True
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                changed = sum(pool.map(check, repos))
+            if not cancel.is_set():
+                self.local_index.retain(base_path, [path for path, _kind in repos])
+            return repos, changed
+
+        def done(result):
+            repos, changed = result
+            self._retain_local_repos({path for path, _kind in repos})
+            self._update_local_watch()
+            bare = sum(1 for _p, kind in repos if kind == "bare")
+            worktrees = sum(1 for _p, kind in repos if kind == "worktree")
+            self._set_status(
+                f"Found {len(repos)} local repos ({worktrees} worktrees, {bare} bare, depth {depth}); "
+                f"re-read {changed} changed"
+            )
+
+        self._run_in_background("Scan local repos", work, done, key="local scan", cancel=cancel)
+
+    def toggle_local_watch(self):
+        self.save_config()
+        self._update_local_watch()
+        if self.local_watcher is not None:
+            self._set_status(f"Watching {len(self._local_repo_kinds)} local repos for changes")
+        elif self.watch_local_var.get():
+            self._set_status("Scan Repos to start watching")
+
+    def _update_local_watch(self):
+        """Watch the listed repos while Watch is on, else stop watching"""
+        if not self.watch_local_var.get() or not self._local_listing_base:
+            if self.local_watcher is not None:
+                self.local_watcher.stop()
+                self.local_watcher = None
+            return
+        if self.local_watcher is None:
+            self.local_watcher = RepoWatcher(
+                lambda repos, rescan: self.root.after(0, self._on_local_repos_changed, repos, rescan)
+            )
+        self.local_watcher.watch(self._local_listing_base, list(self._local_repo_kinds))
+
+    def _on_local_repos_changed(self, repos, rescan):
+        """Re-read the repos the watcher reported, or rescan if folders changed"""
+        if self.local_watcher is None:
+            return
+        if rescan:
+            self.scan_local_repos()
+            return
+        items = [(path, self._local_repo_kinds[path]) for path in repos if path in self._local_repo_kinds]
+        if not items:
+            return
+        base = self._local_listing_base
+
+        def work():
+            def read(item):
+                path, kind = item
+                fingerprint = local_fingerprint(path)
+                details = collect_local_details(path)
+                self.local_index.store(base, path, kind, fingerprint, details)
+                self.local_details.store(path, fingerprint, details)
+                return path, kind, details
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                return list(pool.map(read, items))
+
+        def done(rows):
+            self._add_local_repos(rows)
+            selected = self._selected_local_repo_path()
+            for path, _kind, details in rows:
+                if path == selected:
+                    self._show_local_details(details)
+
+        self._run_in_background("Update changed local repos", work, done)
+
+    def _scan_depth(self):
+        try:
+            return max(0, int(self.scan_depth_var.get()))
+        except (tk.TclError, ValueError):
+            return DISCOVERY_DEPTH
+
+    def _start_local_listing(self, base):
+        """Clear the repo list unless it already shows repos under base"""
+        if base == self._local_listing_base:
+            return
+        self.local_tree.delete(*self.local_tree.get_children())
+        self._local_listing_base = base
+        self._local_repo_paths = []
+        self._local_repo_kinds = {}
+
+    def _add_local_repos(self, repos):
+        """Insert or update (path, kind, details) rows, keeping the list sorted"""
+        for path, kind, details in repos:
+            values = local_summary(details)
+            if path in self._local_repo_kinds:
+                if details is not None:
+                    self.local_tree.item(path, values=values)
+                continue
+            self._local_repo_kinds[path] = kind
+            try:
+                label = Path(path).relative_to(self._local_listing_base).as_posix()
+            except ValueError:
+                label = path
+            if label == ".":
+                label = Path(path).name
+            if kind == "worktree":
+                label += " [worktree]"
+            idx = bisect.bisect(self._local_repo_paths, path.lower())
+            self._local_repo_paths.insert(idx, path.lower())
+            self.local_tree.insert("", idx, iid=path, text=label, values=values)
+
+    def _retain_local_repos(self, paths):
+        """Drop rows for repos the last scan did not find"""
+        for path in list(self._local_repo_kinds):
+            if path not in paths:
+                self.local_tree.delete(path)
+                del self._local_repo_kinds[path]
+        self._local_repo_paths = sorted(p.lower() for p in self._local_repo_kinds)
+
+    def _load_local_index(self):
+        """Show the last indexed state of the configured base folder"""
+        base = (self.local_base_var.get() or "").strip()
+        if not base:
+            return
+        base = str(Path(os.path.expanduser(base)))
+        rows = self.local_index.repos(base)
+        if rows:
+            self._start_local_listing(base)
+            self._add_local_repos(rows)
+            self._set_status(f"{len(rows)} local repos from the last scan; Scan Repos to update")
+
+    def _show_local_details(self, details):
+        overview, _commits = format_local_overview(details)
+        self._set_text(self.local_overview_text, overview.strip() + "\n")
+        path, commits = details["path"], details["commits"]
+        # Indexed details from before history paging have no full hashes
+        tip = commits[0].get("oid") if commits else None
+        pager = self._history_pager(
+            ("local", path), tip, commits,
+            lambda tip, skip, count: local_log_page(path, tip, skip, count),
+        )
+        self._show_history(self.local_commits_list, pager, "(No commits found)")
+
+    def refresh_local_repo_details(self, reread=False, delay=0):
+        """
+        Show the selected repo's details: from memory if they are cached for
+        its current fingerprint, otherwise the indexed copy, then re-read
+        them after `delay` ms unless the cached copy is recent. Each call
+        replaces the pending or running re-read of the previous one, so a
+        quick run of selection changes only reads the last repo. reread
+        re-reads even recent details.
+        """
+        self._cancel_local_details_read()
         repo_path = self._selected_local_repo_path()
         if not repo_path:
             self._set_text(self.local_overview_text, "Select a repository to view details.")
-            self._set_text(self.local_commits_text, "Select a repository to view commit history.")
+            self.local_commits_list.set_message("Select a repository to view commit history.")
             return
 
-        repo = Path(repo_path)
+        hit = self.local_details.get(repo_path, local_fingerprint(repo_path))
+        if hit is not None:
+            details, age = hit
+            self._show_local_details(details)
+            if not reread and age < LOCAL_DETAILS_MAX_AGE:
+                return
+        else:
+            _fp, cached = self.local_index.get(repo_path)
+            if cached is not None:
+                self._show_local_details(cached)
+
+        if delay:
+            self._local_details_after = self.root.after(delay, self._read_local_details, repo_path)
+        else:
+            self._read_local_details(repo_path)
+
+    def _cancel_local_details_read(self):
+        if self._local_details_after is not None:
+            self.root.after_cancel(self._local_details_after)
+            self._local_details_after = None
+        if self._local_details_task is not None and self._local_details_task.state in (QUEUED, RUNNING):
+            self.tasks.cancel(self._local_details_task)
+            self._local_details_task = None
+
+    def _read_local_details(self, repo_path):
+        self._local_details_after = None
+        kind = self._local_repo_kinds.get(repo_path, "repo")
+        base = self._local_listing_base or str(Path(repo_path).parent)
+        cancel = threading.Event()
 
         def work():
-            # Resolve git dir for worktrees/submodules
-            git_dir_p = self._run_git_local(repo, ["rev-parse", "--git-dir"], check=False)
-            git_dir = git_dir_p.stdout.strip()
-            git_dir_abs = str((repo / git_dir).resolve()) if git_dir and not os.path.isabs(git_dir) else git_dir
-
-            status_p = self._run_git_local(repo, ["status", "-sb"], check=False)
-            porcelain_p = self._run_git_local(repo, ["status", "--porcelain=v1"], check=False)
-
-            # Branch name: unborn repos don't have HEAD yet.
-            branch_p = self._run_git_local(repo, ["symbolic-ref", "-q", "--short", "HEAD"], check=False)
-            branch = branch_p.stdout.strip() if branch_p.returncode == 0 and branch_p.stdout.strip() else "(unborn/detached)"
-
-            # Upstream and ahead/behind
-            upstream_p = self._run_git_local(repo, ["rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}"], check=False)
-            upstream = upstream_p.stdout.strip() if upstream_p.returncode == 0 else ""
-            ahead_behind = ""
-            if upstream:
-                ab_p = self._run_git_local(repo, ["rev-list", "--left-right", "--count", f"HEAD...{upstream}"], check=False)
-                if ab_p.returncode == 0 and ab_p.stdout.strip():
-                    left, right = (ab_p.stdout.strip().split() + ["0", "0"])[:2]
-                    ahead_behind = f"ahead {right}, behind {left}"
-
-            last_p = self._run_git_local(repo, ["log", "-1", "--format=%h %ci %an %s"], check=False)
-
-            remotes_p = self._run_git_local(repo, ["remote", "-v"], check=False)
-            origin_url_p = self._run_git_local(repo, ["remote", "get-url", "origin"], check=False)
-            origin_url = origin_url_p.stdout.strip() if origin_url_p.returncode == 0 else ""
-            origin_kind = self._classify_remote(origin_url) if origin_url else ""
-
-            branches_count_p = self._run_git_local(repo, ["for-each-ref", "refs/heads", "--format=%(refname:short)"], check=False)
-            branches_count = len([ln for ln in branches_count_p.stdout.splitlines() if ln.strip()]) if branches_count_p.stdout else 0
-
-            tags_count_p = self._run_git_local(repo, ["tag", "-l"], check=False)
-            tags_count = len([ln for ln in tags_count_p.stdout.splitlines() if ln.strip()]) if tags_count_p.stdout else 0
-
-            stash_p = self._run_git_local(repo, ["stash", "list"], check=False)
-            stash_count = len([ln for ln in stash_p.stdout.splitlines() if ln.strip()]) if stash_p.stdout else 0
-
-            obj_p = self._run_git_local(repo, ["count-objects", "-vH"], check=False)
-            obj_stats = obj_p.stdout.strip()
-
-            # Dirty counts
-            modified = untracked = added = deleted = renamed = conflicted = 0
-            for line in porcelain_p.stdout.splitlines():
-                if not line:
-                    continue
-                code = line[:2]
-                if code == "??":
-                    untracked += 1
-                    continue
-                x, y = code[0], code[1]
-                if "U" in code:
-                    conflicted += 1
-                if x == "A" or y == "A":
-                    added += 1
-                if x == "D" or y == "D":
-                    deleted += 1
-                if x == "R" or y == "R":
-                    renamed += 1
-                if x == "M" or y == "M":
-                    modified += 1
-
-            # Timestamps: best-effort
-            fetch_head = ""
-            if git_dir_abs:
-                try:
-                    fh = Path(git_dir_abs) / "FETCH_HEAD"
-                    if fh.exists():
-                        ts = datetime.fromtimestamp(fh.stat().st_mtime)
-                        fetch_head = ts.strftime("%Y-%m-%d %H:%M:%S")
-                except Exception:
-                    fetch_head = ""
-
-            commits_p = self._run_git_local(repo, ["log", "--oneline", "--decorate", "-n", "100"], check=False)
-            commits = commits_p.stdout
-
-            status = status_p.stdout.strip() if status_p.stdout else (status_p.stderr or "").strip()
-            remotes = remotes_p.stdout.strip()
-            last = last_p.stdout.strip()
-
-            overview_lines = [
-                f"Path: {repo}",
-                f"Git dir: {git_dir_abs or '(unknown)'}",
-                f"Branch: {branch}",
-            ]
-            if upstream:
-                overview_lines.append(f"Upstream: {upstream}" + (f" ({ahead_behind})" if ahead_behind else ""))
-            else:
-                overview_lines.append("Upstream: (none)")
-            overview_lines.append(f"Last commit: {last or '(no commits)'}")
-            if fetch_head:
-                overview_lines.append(f"Last fetch: {fetch_head}")
-            overview_lines.append("")
-            overview_lines.append("Working tree:")
-            overview_lines.append(f"- modified: {modified}, added: {added}, deleted: {deleted}, renamed: {renamed}, untracked: {untracked}, conflicts: {conflicted}")
-            overview_lines.append(f"- stashes: {stash_count}")
-            overview_lines.append("")
-            overview_lines.append(f"Branches: {branches_count} | Tags: {tags_count}")
-            if origin_url:
-                overview_lines.append(f"Origin: {origin_kind} ({origin_url})")
-            overview_lines.append("")
-            overview_lines.append(status)
-            overview_lines.append("")
-            overview_lines.append("Remotes:")
-            overview_lines.append(remotes if remotes else "(none)")
-            overview_lines.append("")
-            overview_lines.append("Object stats:")
-            overview_lines.append(obj_stats if obj_stats else "(unavailable)")
-            overview = "\n".join(overview_lines).strip() + "\n"
-
-            return overview, commits
-
-        def done(result):
-            overview, commits = result
-            self._set_text(self.local_overview_text, overview.strip() + "\n")
-            self._set_text(self.local_commits_text, (commits.strip() + "\n") if commits.strip() else "(No commits found)\n")
-
-        self._run_in_background(f"Load local details", work, done)
+            fingerprint = local_fingerprint(repo_path)
+            details = collect_local_details(repo_path, Supervisor(cancel=cancel))
+            self.local_index.store(base, repo_path, kind, fingerprint, details)
+            self.local_details.store(repo_path, fingerprint, details)
+            return details
+
+        def done(details):
+            self._add_local_repos([(repo_path, kind, details)])
+            if self._selected_local_repo_path() == repo_path:
+                self._show_local_details(details)
+
+        self._local_details_task = self._run_in_background(
+            "Load local details", work, done, key="local details", cancel=cancel,
+        )
 
     def _open_path_in_file_manager(self, path):
         # Cross-platform-ish without extra deps
@@ -686,17 +1334,95 @@ end tell
             messagebox.showwarning("No Selection", "Please select a local repo first.")
             return
         repo = Path(repo_path)
+        supervisor = self._supervisor("fetch")
 
         def work():
-            return subprocess.run(
-                ["git", "-C", str(repo), "fetch", "--all", "--prune"],
-                check=True, capture_output=True, text=True
+            log_key = object()
+            return supervisor.run(
+                ["git", "-C", str(repo), "fetch", "--progress", "--all", "--prune"], check=True,
+                on_output=lambda line, final: self._append_log(f"[Fetch] {line}", log_key, final),
             )
 
         def done(_):
             self.refresh_local_repo_details()
 
-        self._run_in_background("Fetch", work, done)
+        self._run_in_background("Fetch", work, done, resources=[("repo", repo_path)],
+                                cancel=supervisor.cancel)
+
+    def fetch_all_local_repos(self):
+        # Worktrees share their repo's refs: fetch each git dir once
+        repos = [
+            path for path, _kind in distinct_repos(
+                (path, self._local_repo_kinds.get(path, "repo")) for path in self.local_tree.get_children()
+            )
+        ]
+        if not repos:
+            messagebox.showwarning("No Repos", "Scan a base folder for repos first.")
+            return
+
+        win = tk.Toplevel(self.root)
+        win.title(f"Fetch All ({len(repos)} repos)")
+        win.geometry("760x360")
+        summary_var = tk.StringVar(value=f"Fetching {len(repos)} repos…")
+        ttk.Label(win, textvariable=summary_var).pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        frame = ttk.Frame(win)
+        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        columns = (("repo", "Repository", 260), ("host", "Host", 140),
+                   ("state", "Status", 90), ("detail", "Detail", 240))
+        table = ttk.Treeview(frame, columns=[c[0] for c in columns], show="headings")
+        for col, heading, width in columns:
+            table.heading(col, text=heading)
+            table.column(col, width=width, stretch=(col == "detail"))
+        scroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=table.yview)
+        table.configure(yscrollcommand=scroll.set)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        for repo in repos:
+            table.insert("", tk.END, iid=repo, values=(Path(repo).name, "", "queued", ""))
+
+        def update_row(repo, state, info):
+            if not table.winfo_exists():
+                return
+            values = list(table.item(repo, "values"))
+            if state == "fetching":
+                values[1], values[2] = info, state
+            else:
+                values[2], values[3] = state, info
+            table.item(repo, values=values)
+            if state != "fetching":
+                table.see(repo)
+
+        supervisor = self._supervisor("fetch")
+
+        def work():
+            results = fetch_repos_parallel(
+                repos,
+                on_update=lambda repo, state, info: self.root.after(0, update_row, repo, state, info),
+                supervisor=supervisor,
+            )
+            if supervisor.cancel.is_set():
+                # A cancelled task skips done(); still summarize what finished
+                self.root.after(0, done, results)
+            return results
+
+        def done(results):
+            counts = collections.Counter(state for state, _secs, _msg in results.values())
+            summary = (f"{counts['updated']} updated, {counts['up to date']} up to date, "
+                       f"{counts['failed']} failed")
+            if counts["cancelled"]:
+                summary += f", {counts['cancelled']} cancelled"
+            failed = sorted(Path(r).name for r, (state, _s, _m) in results.items() if state == "failed")
+            if failed:
+                summary += ": " + ", ".join(failed)
+            if win.winfo_exists():
+                summary_var.set(summary)
+            self._append_log(f"[Fetch all] {summary}")
+            self.refresh_local_repo_details()
+
+        self._run_in_background("Fetch all", work, done,
+                                resources=[("repo", repo) for repo in repos],
+                                cancel=supervisor.cancel)
 
     def pull_selected_local_repo(self):
         repo_path = self._selected_local_repo_path()
@@ -704,17 +1430,20 @@ end tell
             messagebox.showwarning("No Selection", "Please select a local repo first.")
             return
         repo = Path(repo_path)
+        supervisor = self._supervisor("pull")
 
         def work():
-            return subprocess.run(
-                ["git", "-C", str(repo), "pull"],
-                check=True, capture_output=True, text=True
+            log_key = object()
+            return supervisor.run(
+                ["git", "-C", str(repo), "pull", "--progress"], check=True,
+                on_output=lambda line, final: self._append_log(f"[Pull] {line}", log_key, final),
             )
 
         def done(_):
             self.refresh_local_repo_details()
 
-        self._run_in_background("Pull", work, done)
+        self._run_in_background("Pull", work, done, resources=[("repo", repo_path)],
+                                cancel=supervisor.cancel)
 
     def create_heatmap_tab(self):
         # Controls
@@ -729,10 +1458,45 @@ end tell
         ttk.Button(
             control_frame, text="Choose Folder", command=self.choose_path
         ).pack(side=tk.LEFT, padx=5)
+        ttk.Label(control_frame, text="History:").pack(side=tk.LEFT, padx=(5, 0))
+        refs_labels = dict(HEATMAP_REFS)
+        self.heatmap_refs_var = tk.StringVar(
+            value=refs_labels.get(self.config.get("heatmap_refs"), "HEAD")
+        )
+        ttk.Combobox(
+            control_frame, textvariable=self.heatmap_refs_var, width=14,
+            values=list(refs_labels.values()), state="readonly"
+        ).pack(side=tk.LEFT, padx=5)
         ttk.Button(
             control_frame, text="Generate Heatmap",
             command=self.generate_heatmap
         ).pack(side=tk.LEFT, padx=5)
+        self.heatmap_cancel_button = ttk.Button(
+            control_frame, text="Cancel", command=self.cancel_heatmap,
+            state=tk.DISABLED
+        )
+        self.heatmap_cancel_button.pack(side=tk.LEFT, padx=5)
+        self.heatmap_progress = ttk.Progressbar(
+            control_frame, mode="determinate", length=160
+        )
+        self.heatmap_progress.pack(side=tk.LEFT, padx=5)
+        self.heatmap_progress_var = tk.StringVar(value="")
+        ttk.Label(
+            control_frame, textvariable=self.heatmap_progress_var
+        ).pack(side=tk.LEFT, padx=5)
+
+        filter_frame = ttk.Frame(self.heatmap_frame)
+        filter_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Label(filter_frame, text="Authors:").pack(side=tk.LEFT)
+        self.heatmap_author_var = tk.StringVar(
+            value=self.config.get("heatmap_author_filter", HEATMAP_EVERYONE)
+        )
+        self.heatmap_author_box = ttk.Combobox(
+            filter_frame, textvariable=self.heatmap_author_var, width=40,
+            values=list(HEATMAP_AUTHOR_CHOICES), state="readonly"
+        )
+        self.heatmap_author_box.pack(side=tk.LEFT, padx=5)
+        self.heatmap_author_box.bind("<<ComboboxSelected>>", self.on_heatmap_author_filter)
 
         # Heatmap display
         heatmap_container = ttk.Frame(self.heatmap_frame)
@@ -751,19 +1515,14 @@ end tell
         v_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         h_scroll.pack(side=tk.BOTTOM, fill=tk.X)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Button-1>", self._on_heatmap_click)
 
         # Legend
         legend_frame = ttk.Frame(self.heatmap_frame)
         legend_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
 
         ttk.Label(legend_frame, text="Fewer commits:").pack(side=tk.LEFT)
-        self.colors = [
-            "#ebedf0",  # Level 0
-            "#c6e48b",  # Level 1
-            "#7bc96f",  # Level 2
-            "#239a3b",  # Level 3
-            "#196127",  # Level 4
-        ]
+        self.colors = list(HEATMAP_COLORS)
         labels = ["0", "1-5", "6-10", "11-15", "16+"]
 
         for i, (color, label) in enumerate(zip(self.colors, labels)):
@@ -779,107 +1538,119 @@ end tell
         self.repo_base = self.config.get("local_repo_base", "")
         label = self.repo_base if self.repo_base else "(None selected)"
         self.path_label.config(text=f"Repo path: {label}")
-        self.day_details = {}  # {date_str: {repo: count}}
-        self.rectangles = []   # For cleanup
+        self.rectangles = []   # One canvas item per day of the window
+        self._heatmap_cell_colors = []
+        self._heatmap_grid_key = None  # (start, days) the grid was built for
+        self._heatmap_author_labels = {}  # combobox label -> email
+        self._heatmap_me = None
+        self._heatmap_author_choice = self.heatmap_author_var.get()
+        # Counts of the last (or current) run; see HeatmapData
+        self.heatmap = HeatmapData([], heatmap_window(), self._author_filter_predicate(
+            self._heatmap_author_choice, ask=False
+        ))
+        self._heatmap_job = None  # HeatmapJob while a run is in progress
+        self._heatmap_done = 0
+        self._heatmap_last_draw = 0.0
 
     # == Core SSH Actions ==
-    def _run_ssh_command(self, command_text):
-        """Run a command on remote host through SSH"""
-        server, user, port, _ssh_dir = self._validate_ssh_inputs()
-        cmd = ["ssh", "-p", port, f"{user}@{server}", command_text]
-        return subprocess.run(cmd, check=True, capture_output=True, text=True)
-
-    def _remote_cd_cmd(self, ssh_dir):
-        ssh_dir = (ssh_dir or "").strip()
-        if ssh_dir == "~":
-            return 'cd -- "$HOME"'
-        if ssh_dir.startswith("~/"):
-            rest = ssh_dir[2:].rstrip("/")
-            return 'cd -- "$HOME"/' + shlex.quote(rest)
-        return f"cd -- {shlex.quote(ssh_dir.rstrip('/'))}"
-
-    def _repo_git_dirname(self, repo_name_no_suffix):
-        repo = (repo_name_no_suffix or "").strip().removesuffix(".git")
-        return repo + ".git"
-
-    def _remote_path_for_git_url(self, ssh_dir):
-        """
-        Build an ssh:// URL path segment that works with home-relative dirs.
-        Git's ssh URL supports /~/ to mean "home directory".
-        """
-        ssh_dir = (ssh_dir or "").strip().rstrip("/")
-        if ssh_dir == "~":
-            return "/~"
-        if ssh_dir.startswith("~/"):
-            return "/~/" + ssh_dir[2:]
-        if ssh_dir.startswith("/"):
-            return ssh_dir
-        # Treat other relative paths as relative to home
-        return "/~/" + ssh_dir
+    def _backend(self):
+        """The remote repo directory from the SSH settings, on the shared pool"""
+        server, user, port, ssh_dir = self._validate_ssh_inputs()
+        return SSHBackend(
+            self.ssh_pool, user, server, port, ssh_dir,
+            on_note=self._append_log,
+        )
 
     def list_repos(self):
         self.save_config()
+        self._remote_inventory.clear()
+        self.repo_tree.delete(*self.repo_tree.get_children())
+
+        # Show the last known inventory immediately; the server then only
+        # sends full records for repos whose fingerprint changed.
+        try:
+            cache_key = self._remote_cache_key()
+        except ValueError:
+            cache_key = None
+        known = {}
+        if cache_key is not None:
+            self._add_remote_repos(self.remote_cache.inventory(cache_key).values())
+            self._sort_remote_repos()
+            known = self.remote_cache.fingerprints(cache_key)
 
         def work():
-            _server, _user, _port, ssh_dir = self._validate_ssh_inputs()
-            ssh_dir = ssh_dir.strip()
-            # Build a safe 'cd' that still expands "~" on the remote host.
-            # Quoting "~" (e.g. 'cd "~/repos"') prevents expansion, so we
-            # translate it to $HOME explicitly.
-            if ssh_dir == "~":
-                cd_cmd = 'cd -- "$HOME"'
-            elif ssh_dir.startswith("~/"):
-                rest = ssh_dir[2:].rstrip("/")
-                # $HOME + "/" + rest, where rest is safely single-quoted.
-                cd_cmd = 'cd -- "$HOME"/' + shlex.quote(rest)
-            else:
-                cd_cmd = f"cd -- {shlex.quote(ssh_dir.rstrip('/'))}"
-            cmd = (
-                "set -e; "
-                f"{cd_cmd}; "
-                "for d in *.git; do "
-                "  [ -d \"$d\" ] || continue; "
-                "  printf '%s\n' \"${d%.git}\"; "
-                "done"
-            )
-            return self._run_ssh_command(cmd).stdout
+            # Hand changed rows to the UI in small batches so the list fills
+            # in progressively without flooding the Tk event queue.
+            seen, changed = [], 0
+            batch, last_flush = [], time.monotonic()
+            for repo in self._backend().inventory(known):
+                seen.append(repo["name"])
+                if repo.get("unchanged"):
+                    continue
+                changed += 1
+                if cache_key is not None:
+                    self.remote_cache.store_inventory(cache_key, repo)
+                batch.append(repo)
+                if time.monotonic() - last_flush > 0.1:
+                    self.root.after(0, self._add_remote_repos, batch)
+                    batch, last_flush = [], time.monotonic()
+            if cache_key is not None:
+                self.remote_cache.retain(cache_key, seen)
+                self.remote_cache.save()
+            return batch, seen, changed
 
-        def done(stdout):
-            self.repo_listbox.delete(0, tk.END)
-            for repo in stdout.strip().splitlines():
-                repo = repo.strip()
-                if repo:
-                    self.repo_listbox.insert(tk.END, repo)
+        def done(result):
+            batch, seen, changed = result
+            self._add_remote_repos(batch)
+            for name in set(self._remote_inventory) - set(seen):
+                del self._remote_inventory[name]
+                self.repo_tree.delete(name)
+            self._sort_remote_repos()
+            self._set_status(f"Found {len(seen)} remote repos ({changed} changed)")
 
-        self._run_in_background("List repos", work, done)
+        self._run_in_background("List repos", work, done,
+                                resources=self._ssh_resources(), key="remote list")
 
     def clone_repo(self):
-        selection = self.repo_listbox.curselection()
-        if not selection:
+        repo_name = self._selected_remote_repo()
+        if not repo_name:
             messagebox.showwarning("No Selection",
                                    "Please select a repo to clone")
             return
 
-        repo_name = self.repo_listbox.get(selection[0])
         clone_path = filedialog.askdirectory(
             title="Select folder to clone into"
         )
         if not clone_path:
             return
+        options = CloneOptionsDialog(self.root, title=f"Clone {repo_name}").result
+        if options is None:
+            return
         self.save_config()
+        supervisor = self._supervisor("clone")
 
         def work():
-            server, user, port, ssh_dir = self._validate_ssh_inputs()
-            dest = str(Path(clone_path) / repo_name)
-            url_path = self._remote_path_for_git_url(ssh_dir)
-            url = f"ssh://{user}@{server}:{port}{url_path}/{repo_name}.git"
-            cmd = ["git", "clone", url, dest]
-            return subprocess.run(cmd, check=True, capture_output=True, text=True)
+            # Progress rewrites one log line until each phase finishes; the
+            # status bar shows it too (throttled)
+            last_status, log_key = [0.0], object()
+
+            def progress(text, final):
+                self._append_log(f"[Clone {repo_name}] {text}", log_key, final)
+                if not final and time.monotonic() - last_status[0] > 0.2:
+                    last_status[0] = time.monotonic()
+                    self.root.after(0, self._set_status, f"Clone {repo_name}: {text}")
+
+            return self._backend().clone(repo_name, Path(clone_path) / repo_name,
+                                         options, progress, supervisor)
 
         def done(_result):
             messagebox.showinfo("Success", f"Cloned {repo_name} to {clone_path}")
 
-        self._run_in_background(f"Clone {repo_name}", work, done)
+        self._run_in_background(
+            f"Clone {repo_name}", work, done,
+            resources=[*self._ssh_resources(repo_name), ("repo", str(Path(clone_path) / repo_name))],
+            cancel=supervisor.cancel,
+        )
 
     def create_repo(self):
         """Create a new bare remote repo"""
@@ -892,27 +1663,23 @@ end tell
         self.save_config()
 
         def work():
-            _server, _user, _port, ssh_dir = self._validate_ssh_inputs()
-            cd_cmd = self._remote_cd_cmd(ssh_dir)
-            repo_git = shlex.quote(self._repo_git_dirname(repo_name))
-            cmd = f"set -e; {cd_cmd}; git init --bare {repo_git}"
-            return self._run_ssh_command(cmd)
+            return self._backend().create(repo_name)
 
         def done(_):
             messagebox.showinfo("Success", f"Created {repo_name}.git")
             self.list_repos()
 
-        self._run_in_background(f"Create {repo_name}", work, done)
+        self._run_in_background(f"Create {repo_name}", work, done,
+                                resources=self._ssh_resources(repo_name))
 
     def delete_repo(self):
         """Delete a remote repository"""
-        selection = self.repo_listbox.curselection()
-        if not selection:
+        repo_name = self._selected_remote_repo()
+        if not repo_name:
             messagebox.showwarning("No Selection",
                                    "Please select a repo to delete")
             return
 
-        repo_name = self.repo_listbox.get(selection[0])
         confirm = messagebox.askyesno(
             "Confirm Deletion",
             f"Delete remote repo '{repo_name}' permanently?"
@@ -923,25 +1690,21 @@ end tell
         self.save_config()
 
         def work():
-            _server, _user, _port, ssh_dir = self._validate_ssh_inputs()
-            cd_cmd = self._remote_cd_cmd(ssh_dir)
-            repo_git = shlex.quote(self._repo_git_dirname(repo_name))
-            cmd = f"set -e; {cd_cmd}; rm -rf {repo_git}"
-            return self._run_ssh_command(cmd)
+            return self._backend().remove(repo_name)
 
         def done(_):
             messagebox.showinfo("Deleted", f"Removed {repo_name}.git")
             self.list_repos()
 
-        self._run_in_background(f"Delete {repo_name}", work, done)
+        self._run_in_background(f"Delete {repo_name}", work, done,
+                                resources=self._ssh_resources(repo_name))
 
     def rename_repo(self):
-        selection = self.repo_listbox.curselection()
-        if not selection:
+        old_name = self._selected_remote_repo()
+        if not old_name:
             messagebox.showwarning("No Selection", "Please select a repo to rename")
             return
 
-        old_name = self.repo_listbox.get(selection[0]).strip().removesuffix(".git")
         new_name = simpledialog.askstring("Rename Repo", f"Rename '{old_name}' to:")
         if not new_name:
             return
@@ -952,26 +1715,21 @@ end tell
         self.save_config()
 
         def work():
-            _server, _user, _port, ssh_dir = self._validate_ssh_inputs()
-            cd_cmd = self._remote_cd_cmd(ssh_dir)
-            old_git = shlex.quote(self._repo_git_dirname(old_name))
-            new_git = shlex.quote(self._repo_git_dirname(new_name))
-            cmd = f"set -e; {cd_cmd}; mv -v {old_git} {new_git}"
-            return self._run_ssh_command(cmd)
+            return self._backend().rename(old_name, new_name)
 
         def done(_):
             messagebox.showinfo("Success", f"Renamed {old_name} -> {new_name}")
             self.list_repos()
 
-        self._run_in_background(f"Rename {old_name}", work, done)
+        self._run_in_background(f"Rename {old_name}", work, done,
+                                resources=self._ssh_resources(old_name, new_name))
 
     def fork_repo(self):
-        selection = self.repo_listbox.curselection()
-        if not selection:
+        old_name = self._selected_remote_repo()
+        if not old_name:
             messagebox.showwarning("No Selection", "Please select a repo to copy")
             return
 
-        old_name = self.repo_listbox.get(selection[0]).strip().removesuffix(".git")
         new_name = simpledialog.askstring("Fork/Copy Repo", f"Copy '{old_name}' to:")
         if not new_name:
             return
@@ -979,44 +1737,107 @@ end tell
         if new_name == old_name:
             return
 
+        fast = messagebox.askyesnocancel(
+            "Fork/Copy Repo",
+            f"Fast fork '{old_name}'?\n\n"
+            "Yes: hardlink the object files (near-instant, almost no extra disk)\n"
+            "No: full independent copy",
+        )
+        if fast is None:
+            return
+
         self.save_config()
 
         def work():
-            _server, _user, _port, ssh_dir = self._validate_ssh_inputs()
-            cd_cmd = self._remote_cd_cmd(ssh_dir)
-            old_git = shlex.quote(self._repo_git_dirname(old_name))
-            new_git = shlex.quote(self._repo_git_dirname(new_name))
-            cmd = f"set -e; {cd_cmd}; cp -R {old_git} {new_git}"
-            return self._run_ssh_command(cmd)
+            return self._backend().fork(old_name, new_name, "link" if fast else "copy")
 
         def done(_):
             messagebox.showinfo("Success", f"Copied {old_name} -> {new_name}")
             self.list_repos()
 
-        self._run_in_background(f"Copy {old_name}", work, done)
+        self._run_in_background(f"Copy {old_name}", work, done,
+                                resources=self._ssh_resources(old_name, new_name))
+
+    def dissociate_repo(self):
+        """Give a fast fork its own packs so it no longer shares objects"""
+        repo_name = self._selected_remote_repo()
+        if not repo_name:
+            messagebox.showwarning("No Selection", "Please select a repo to dissociate")
+            return
+        self.save_config()
+
+        def work():
+            return self._backend().dissociate(repo_name)
+
+        def done(_):
+            messagebox.showinfo("Success", f"{repo_name} no longer shares objects")
+            self.list_repos()
+
+        self._run_in_background(f"Dissociate {repo_name}", work, done,
+                                resources=self._ssh_resources(repo_name))
 
     def archive_repo(self):
-        selection = self.repo_listbox.curselection()
-        if not selection:
+        repo_name = self._selected_remote_repo()
+        if not repo_name:
             messagebox.showwarning("No Selection", "Please select a repo to archive")
             return
 
-        repo_name = self.repo_listbox.get(selection[0]).strip().removesuffix(".git")
+        download = messagebox.askyesnocancel(
+            "Archive",
+            f"Download a compressed archive of '{repo_name}' to this computer?\n\n"
+            "Yes: stream it over SSH and compress locally\n"
+            "No: create a .tgz next to the repo on the server",
+        )
+        if download is None:
+            return
+        if download:
+            self._download_archive(repo_name)
+            return
+
         self.save_config()
 
         def work():
-            _server, _user, _port, ssh_dir = self._validate_ssh_inputs()
-            cd_cmd = self._remote_cd_cmd(ssh_dir)
-            repo_git = shlex.quote(self._repo_git_dirname(repo_name))
-            out_name = shlex.quote(repo_name + ".tgz")
-            cmd = f"set -e; {cd_cmd}; tar -czf {out_name} {repo_git}"
-            return self._run_ssh_command(cmd)
+            return self._backend().archive(repo_name)
 
         def done(_):
             _server, _user, _port, ssh_dir = self._validate_ssh_inputs()
             messagebox.showinfo("Archived", f"Created {ssh_dir.rstrip('/')}/{repo_name}.tgz on remote host")
 
-        self._run_in_background(f"Archive {repo_name}", work, done)
+        self._run_in_background(f"Archive {repo_name}", work, done,
+                                resources=self._ssh_resources(repo_name))
+
+    def _download_archive(self, repo_name):
+        dest = filedialog.asksaveasfilename(
+            title="Save archive as",
+            initialfile=f"{repo_name}.tgz",
+            defaultextension=".tgz",
+            filetypes=[("gzip tarball", "*.tgz"), ("zstd tarball", "*.tar.zst"), ("tar", "*.tar")],
+        )
+        if not dest:
+            return
+        self.save_config()
+        supervisor = self._supervisor("archive")
+
+        def work():
+            def progress(done, elapsed):
+                rate = human_size(done / 1024 / max(elapsed, 1e-6))
+                self.root.after(0, self._set_status,
+                                f"Archive {repo_name}: {human_size(done / 1024)} read, {rate}/s")
+
+            return self._backend().download_archive(repo_name, dest, progress, supervisor)
+
+        def done(result):
+            raw, written, elapsed, label = result
+            rate = human_size(raw / 1024 / max(elapsed, 1e-6))
+            self._append_log(
+                f"[Archive {repo_name}] {human_size(raw / 1024)} -> {human_size(written / 1024)} "
+                f"in {elapsed:.1f}s ({rate}/s, {label})"
+            )
+            messagebox.showinfo("Archived", f"Saved {dest}")
+
+        self._run_in_background(f"Archive {repo_name}", work, done,
+                                resources=self._ssh_resources(repo_name),
+                                cancel=supervisor.cancel)
 
     # == Heatmap Functions ==
 
@@ -1036,123 +1857,212 @@ end tell
                 "Please choose a valid repository folder first.",
             )
             return
-
-        # Clear previous heatmap
-        for rect in self.rectangles:
-            self.canvas.delete(rect)
-        self.rectangles = []
-        self.day_details.clear()
+        if self._heatmap_job is not None:
+            messagebox.showinfo("Busy", "The heatmap is already being generated.")
+            return
 
         base = Path(os.path.expanduser(self.repo_base))
-        repos = [p for p in base.iterdir() if (p / ".git").exists()]
+        depth = int(self.config.get("scan_depth", DISCOVERY_DEPTH))
+        ignore = self.config.get("scan_ignore", DISCOVERY_IGNORE)
+        refs = {label: mode for mode, label in HEATMAP_REFS}.get(self.heatmap_refs_var.get(), "HEAD")
+        self.config["heatmap_refs"] = refs
+        self.save_config()
+        window = heatmap_window()
+        # Set on the Tk thread, so a second click is refused even while this
+        # run is still queued
+        job = self._heatmap_job = HeatmapJob(window, refs=refs, cache=self.local_index)
+        self._heatmap_started()
 
-        if not repos:
-            messagebox.showwarning("No Repos Found",
-                                   "No repositories found in this directory.")
-            return
+        def work():
+            return collect(job)
+
+        def finished(task):
+            self._heatmap_job = None
+            self.heatmap_cancel_button.config(state=tk.DISABLED)
+            if task.state != CANCELLED:
+                return  # done() reports the result
+            # Cancelled from the Tasks tab: done() is skipped, so settle the
+            # progress display here
+            if task.started is None:
+                self.heatmap_progress_var.set("Cancelled")
+            else:
+                total = int(self.heatmap_progress["maximum"])
+                self.heatmap_progress_var.set(f"Cancelled after {self._heatmap_done}/{total} repos")
+                self._update_heatmap_author_choices()
+                self.draw_heatmap()
+            self.heatmap_progress.config(value=0)
+
+        def collect(job):
+            found = discover_repos(base, depth=depth, ignore=ignore, cancel=job.cancel_event)
+            # Worktrees share their repo's history: count it once
+            repos = [Path(path) for path, _kind in distinct_repos(found)]
+            names = [repo.relative_to(base).as_posix() if repo != base else repo.name for repo in repos]
+            self.root.after(0, self._heatmap_begin, HeatmapData(names, window, self.heatmap.match))
+            repo_ids = {repo: i for i, repo in enumerate(repos)}
+            finished = job.run(
+                repos,
+                lambda repo, counts: self.root.after(
+                    0, self._merge_heatmap_counts, repo_ids[repo], counts
+                ),
+            )
+            return len(repos), finished
 
-        commit_counter = collections.Counter()
-        for repo in repos:
-            repo_name = repo.name
-            cmd = [
-                "git", "-C", str(repo),
-                "log", "--date=short", "--format=%ad"
-            ]
-            try:
+        def done(result):
+            total, finished = result
+            self._update_heatmap_author_choices()
+            self.draw_heatmap()
+            stats = ", ".join(f"{n} {kind}" for kind, n in sorted(job.stats.items()))
+            if job.cancelled:
+                self.heatmap_progress_var.set(f"Cancelled after {finished}/{total} repos")
+            elif not total:
+                self.heatmap_progress_var.set("")
+                messagebox.showwarning("No Repos Found",
+                                       "No repositories found in this directory.")
+            else:
+                self.heatmap_progress_var.set(f"{total} repos ({stats})")
+            if total and not job.cancelled and not any(self.heatmap.totals):
+                messagebox.showwarning("No Data",
+                                       "No commits found in the repositories.")
+
+        task = self._run_in_background("Generate heatmap", work, done, finish_fn=finished)
+        task.on_cancel(job.cancel)
+
+    def cancel_heatmap(self):
+        job = self._heatmap_job
+        if job is not None:
+            job.cancel()
+            self.heatmap_progress_var.set("Cancelling…")
+
+    def _heatmap_started(self):
+        self._heatmap_done = 0
+        self.heatmap_progress.config(value=0, maximum=1)
+        self.heatmap_progress_var.set("Looking for repos…")
+        self.heatmap_cancel_button.config(state=tk.NORMAL)
+
+    def _heatmap_begin(self, data):
+        """Start drawing into a fresh HeatmapData for this run"""
+        self.heatmap = data
+        self.heatmap_progress.config(value=0, maximum=max(len(data.repos), 1))
+        self.heatmap_progress_var.set(f"0/{len(data.repos)} repos")
+
+    def _merge_heatmap_counts(self, repo_id, counts):
+        """Fold one repo's {email: {day ordinal: commits}} into the heatmap as it arrives"""
+        self.heatmap.merge(repo_id, counts)
+        self._heatmap_done += 1
+        self.heatmap_progress.config(value=self._heatmap_done)
+        job = self._heatmap_job
+        if job is None or not job.cancelled:
+            total = int(self.heatmap_progress["maximum"])
+            self.heatmap_progress_var.set(f"{self._heatmap_done}/{total} repos")
+        # Recoloring is cheap, but there is no point doing it per repo
+        if counts and time.monotonic() - self._heatmap_last_draw > 0.1:
+            self.draw_heatmap()
+            self._heatmap_last_draw = time.monotonic()
+
+    def _my_emails(self):
+        """Emails that count as "me": heatmap_me in the config, else git's user.email"""
+        if self._heatmap_me is None:
+            emails = self.config.get("heatmap_me") or []
+            if not emails:
                 result = subprocess.run(
-                    cmd, capture_output=True, text=True, check=True
+                    ["git", "config", "--global", "--get-all", "user.email"],
+                    capture_output=True, text=True
                 )
-                for line in result.stdout.splitlines():
-                    date_str = line.strip()
-                    if date_str:
-                        if date_str not in self.day_details:
-                            self.day_details[date_str] = \
-                                collections.Counter()
-                        self.day_details[date_str][repo_name] += 1
-                        commit_counter[date_str] += 1
-            except subprocess.CalledProcessError:
-                continue
-            except Exception as e:
-                print(f"Error reading {repo}: {e}")
+                emails = result.stdout.split()
+            self._heatmap_me = {e.strip().lower() for e in emails if e.strip()}
+        return self._heatmap_me
 
-        if not commit_counter:
-            messagebox.showwarning("No Data",
-                                   "No commits found in the repositories.")
+    def _author_filter_predicate(self, choice, ask=True):
+        """
+        email -> bool for an Authors choice, or None if the user backed out
+        of the Custom… prompt
+        """
+        if choice == HEATMAP_ONLY_ME:
+            me = self._my_emails()
+            return lambda email: email in me
+        if choice == HEATMAP_CUSTOM:
+            patterns = self.config.get("heatmap_author_patterns", "")
+            if ask:
+                patterns = simpledialog.askstring(
+                    "Author filter",
+                    "Emails or patterns, comma-separated (e.g. me@example.com, *@work.example):",
+                    initialvalue=patterns, parent=self.root,
+                )
+                if patterns is None:
+                    return None
+                self.config["heatmap_author_patterns"] = patterns
+            return author_matcher(patterns)
+        if choice in self._heatmap_author_labels:
+            wanted = self._heatmap_author_labels[choice]
+            return lambda email: email == wanted
+        return lambda _email: True
+
+    def on_heatmap_author_filter(self, _event=None):
+        choice = self.heatmap_author_var.get()
+        match = self._author_filter_predicate(choice)
+        if match is None:
+            self.heatmap_author_var.set(self._heatmap_author_choice)
             return
+        self._heatmap_author_choice = choice
+        if choice in HEATMAP_AUTHOR_CHOICES:
+            self.config["heatmap_author_filter"] = choice
+            self.save_config()
+        self.heatmap.select(match)  # from memory; no git involved
+        self.draw_heatmap()
+
+    def _update_heatmap_author_choices(self):
+        """Offer the most active authors of the last run in the Authors box"""
+        self._heatmap_author_labels = {
+            f"{email} ({count})": email for email, count in self.heatmap.top_authors()
+        }
+        self.heatmap_author_box.config(
+            values=list(HEATMAP_AUTHOR_CHOICES) + list(self._heatmap_author_labels)
+        )
 
-        # Create heatmap visualization
-        self.draw_heatmap(commit_counter)
-
-    def draw_heatmap(self, commit_counter):
-        # Clear previous drawings
-        for rect in self.rectangles:
-            self.canvas.delete(rect)
+    def draw_heatmap(self):
+        """
+        Recolor the grid from heatmap.totals. The rectangles are only
+        (re)built when the window changes, e.g. on the first run of a day;
+        otherwise only cells whose color changed are touched.
+        """
+        data = self.heatmap
+        if self._heatmap_grid_key != (data.start, data.days):
+            self._build_heatmap_grid()
+
+        for idx, rect in enumerate(self.rectangles):
+            color = self.colors[heatmap_level(data.totals[idx])]
+            if self._heatmap_cell_colors[idx] != color:
+                self.canvas.itemconfigure(rect, fill=color)
+                self._heatmap_cell_colors[idx] = color
+
+    def _build_heatmap_grid(self):
+        """Create the day cells, axis labels and lines for the current window"""
+        self.canvas.delete("all")
         self.rectangles = []
 
-        # Calculate date range (last 365 days)
-        today = datetime.now().date()
-        start_date = today - timedelta(days=364)
-        days_back = (start_date.weekday() + 1) % 7
-        week_start_date = start_date - timedelta(days=days_back)
-
-        # Generate all dates in range
-        all_dates = []
-        current = week_start_date
-        while current <= today:
-            all_dates.append(current)
-            current += timedelta(days=1)
+        week_start_date = self.heatmap.start
+        all_dates = [week_start_date + timedelta(days=i) for i in range(self.heatmap.days)]
+        today = all_dates[-1]
 
         # Dimensions
-        cell_size = 15
-        padding = 2
-        label_padding_x = 50
+        cell_size = HEATMAP_CELL
+        padding = HEATMAP_GAP
+        label_padding_x = HEATMAP_LEFT
         label_padding_y = 30
 
-        self.canvas.delete("all")
-
-        # Create rectangles for each day
+        # One rectangle per day, column = week, row = weekday (Sun first)
         num_weeks = (len(all_dates) + 6) // 7
-        for col in range(num_weeks):
-            for day_in_week in range(7):
-                current_idx = col * 7 + day_in_week
-                if current_idx >= len(all_dates):
-                    break
-
-                date = all_dates[current_idx]
-                date_str = str(date)
-                count = commit_counter.get(date_str, 0)
-
-                # Determine color based on commit count
-                if count == 0:
-                    color = self.colors[0]
-                elif count <= 5:
-                    color = self.colors[1]
-                elif count <= 10:
-                    color = self.colors[2]
-                elif count <= 15:
-                    color = self.colors[3]
-                else:
-                    color = self.colors[4]
-
-                # Position with padding for labels
-                x1 = label_padding_x + col * (cell_size + padding)
-                y1 = day_in_week * (cell_size + padding)
-                x2 = x1 + cell_size
-                y2 = y1 + cell_size
-
-                rect = self.canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    fill=color,
-                    outline="",
-                    tags=date_str
-                )
-
-                # Bind click event
-                self.canvas.tag_bind(rect, "<Button-1>",
-                                    lambda e, d=date_str:
-                                    self.show_day_details(d))
-
-                self.rectangles.append(rect)
+        for current_idx in range(len(all_dates)):
+            col, day_in_week = divmod(current_idx, 7)
+            x1 = label_padding_x + col * (cell_size + padding)
+            y1 = day_in_week * (cell_size + padding)
+            self.rectangles.append(self.canvas.create_rectangle(
+                x1, y1, x1 + cell_size, y1 + cell_size,
+                fill=self.colors[0],
+                outline=""
+            ))
+        self._heatmap_cell_colors = [self.colors[0]] * len(self.rectangles)
+        self._heatmap_grid_key = (self.heatmap.start, self.heatmap.days)
 
         # === Y-AXIS: Weekday labels ===
         day_labels = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
@@ -1223,10 +2133,27 @@ end tell
         total_height = heatmap_height + label_padding_y + 40
         self.canvas.config(scrollregion=(0, 0, total_width, total_height))
 
-    def show_day_details(self, date_str):
-        """Show popup with repos that committed on this day"""
-        details = self.day_details.get(date_str, {})
-        total = sum(details.values())
+    def _on_heatmap_click(self, event):
+        """Map a click on the canvas to a day cell and show its details"""
+        step = HEATMAP_CELL + HEATMAP_GAP
+        x = self.canvas.canvasx(event.x) - HEATMAP_LEFT
+        y = self.canvas.canvasy(event.y)
+        if x < 0 or y < 0:
+            return
+        col, x_in = divmod(int(x), step)
+        row, y_in = divmod(int(y), step)
+        if row >= 7 or x_in >= HEATMAP_CELL or y_in >= HEATMAP_CELL:
+            return  # weekday labels, month labels or the gap between cells
+        day = col * 7 + row
+        if day < len(self.rectangles):
+            self.show_day_details(day)
+
+    def show_day_details(self, day):
+        """Show popup with repos that committed on this day (offset into the grid)"""
+        date_str = str(self.heatmap.date(day))
+        details = self.heatmap.day_repos(day)
+        total = self.heatmap.totals[day]
+        by_author = self.heatmap.day_authors(day)
 
         if not details:
             messagebox.showinfo(date_str, "No commits on this day.")
@@ -1238,6 +2165,10 @@ end tell
             details.items(), key=lambda x: x[1], reverse=True
         ):
             msg += f"- {repo}: {count} commits\n"
+        if by_author:
+            msg += "\nBy author:\n"
+            for email, count in by_author.most_common():
+                msg += f"- {email}: {count} commits\n"
 
         # Show in a scrollable text window
         top = tk.Toplevel(self.root)
@@ -1254,6 +2185,72 @@ end tell
         text.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
+    # == Tasks Tab ==
+    def create_tasks_tab(self):
+        controls = ttk.Frame(self.tasks_frame)
+        controls.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(controls, text="Cancel", command=self.cancel_selected_tasks).pack(side=tk.LEFT)
+        ttk.Button(controls, text="Clear Finished", command=self.tasks.clear_finished).pack(
+            side=tk.LEFT, padx=5)
+        self.tasks_summary_var = tk.StringVar(value="No tasks")
+        ttk.Label(controls, textvariable=self.tasks_summary_var).pack(side=tk.LEFT, padx=10)
+
+        frame = ttk.Frame(self.tasks_frame)
+        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        scroll = ttk.Scrollbar(frame, orient=tk.VERTICAL)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.task_tree = ttk.Treeview(frame, columns=[c[0] for c in TASK_COLUMNS],
+                                      yscrollcommand=scroll.set)
+        self.task_tree.heading("#0", text="Task")
+        self.task_tree.column("#0", width=260)
+        for col, heading, width in TASK_COLUMNS:
+            self.task_tree.heading(col, text=heading)
+            self.task_tree.column(col, width=width, stretch=(col == "detail"))
+        self.task_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scroll.config(command=self.task_tree.yview)
+
+    def _schedule_task_view(self):
+        """Coalesce bursts of scheduler changes into one redraw"""
+        if not self._task_view_pending:
+            self._task_view_pending = True
+            self.root.after(100, self._refresh_task_view)
+
+    def _refresh_task_view(self):
+        self._task_view_pending = False
+        tasks = self.tasks.tasks()
+        selected = set(self.task_tree.selection())
+        self.task_tree.delete(*self.task_tree.get_children())
+        for task in tasks:
+            if task.state == QUEUED:
+                waiting = self.tasks.waiting_on(task)
+                detail = ", ".join(name for _kind, name in waiting) or "a free worker"
+            elif task.state == FAILED:
+                detail = " ".join(str(task.error).split())
+            else:
+                detail = ""
+            iid = str(task.id)
+            self.task_tree.insert("", tk.END, iid=iid, text=task.label,
+                                  values=(task.state, detail, f"{task.elapsed():.1f}s"))
+            if iid in selected:
+                self.task_tree.selection_add(iid)
+
+        active = self.tasks.active()
+        self.notebook.tab(self.tasks_frame, text=f"Tasks ({active})" if active else "Tasks")
+        running = sum(1 for task in tasks if task.state == RUNNING)
+        self.tasks_summary_var.set(
+            f"{running} running, {active - running} queued" if active else "No tasks running"
+        )
+        # Keep the running times ticking
+        if running and not self._task_view_pending:
+            self._task_view_pending = True
+            self.root.after(1000, self._refresh_task_view)
+
+    def cancel_selected_tasks(self):
+        selected = {int(iid) for iid in self.task_tree.selection()}
+        for task in self.tasks.tasks():
+            if task.id in selected:
+                self.tasks.cancel(task)
+
 
 if __name__ == "__main__":
     root = tk.Tk()